@@ -55,8 +55,9 @@ def run_solana_agent(user_input: str, **kwargs) -> dict:
     agent = create_solana_agent()
     
     # Initialize state
+    messages = [create_system_message(), HumanMessage(content=user_input)]
     initial_state = SolanaAgentState(
-        messages=[create_system_message(), HumanMessage(content=user_input)],
+        messages=messages,
         context={},
         tools_used=[],
         iteration_count=0,
@@ -65,6 +66,8 @@ def run_solana_agent(user_input: str, **kwargs) -> dict:
         intent=None,
         session_id=session_id,
         user_id=user_id,
+        last_human_idx=len(messages) - 1,
+        last_ai_idx=None,
         solana_context={},
         network=network,
         rpc_url=rpc_url,
@@ -0,0 +1,78 @@
+"""
+Monte Carlo 집계 커널
+
+연간 손실 배열에서 EL, VaR, TVaR, CoV를 한 번에 계산하는 JIT 컴파일 커널입니다.
+numba가 없으면 동일한 계산을 NumPy로 수행합니다.
+"""
+
+from typing import Tuple
+import numpy as np
+
+# JIT-compiled loss aggregation (optional)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _loss_statistics_numpy(annual_losses: np.ndarray, confidence_level: float) -> Tuple[float, float, float, float]:
+    """NumPy 기반 (EL, VaR, TVaR, CoV) 계산"""
+    n = annual_losses.shape[0]
+    mean = annual_losses.mean()
+    std = annual_losses.std(ddof=1) if n > 1 else np.nan
+    cv = std / mean if mean != 0 else 0.0
+
+    losses_sorted = np.sort(annual_losses)
+    var_index = int(np.ceil(confidence_level * n)) - 1
+    return mean, losses_sorted[var_index], losses_sorted[var_index:].mean(), cv
+
+
+if NUMBA_AVAILABLE:
+    # fast-math는 재결합·FMA만 허용: n == 1이면 std/CoV가 NaN이며, nnan 플래그를 켜면 이 결과가 정의되지 않음
+    @njit(parallel=True, fastmath={'reassoc', 'contract'}, cache=True)
+    def _loss_statistics_kernel(annual_losses, confidence_level):
+        """연간 손실의 (EL, VaR, TVaR, CoV), 합계·제곱합은 시뮬레이션 연도에 걸쳐 병렬 reduction"""
+        n = annual_losses.shape[0]
+        total = 0.0
+        for i in prange(n):
+            total += annual_losses[i]
+        mean = total / n
+
+        sq_dev = 0.0
+        for i in prange(n):
+            d = annual_losses[i] - mean
+            sq_dev += d * d
+        std = np.sqrt(sq_dev / (n - 1)) if n > 1 else np.nan
+        cv = std / mean if mean != 0 else 0.0
+
+        losses_sorted = np.sort(annual_losses)
+        var_index = int(np.ceil(confidence_level * n)) - 1
+        tail = 0.0
+        for i in prange(var_index, n):
+            tail += losses_sorted[i]
+        return mean, losses_sorted[var_index], tail / (n - var_index), cv
+
+
+def loss_statistics(annual_losses: np.ndarray, confidence_level: float = 0.99) -> Tuple[float, float, float, float]:
+    """
+    연간 손실 배열의 (Expected Loss, VaR, TVaR, CoV) 계산
+
+    Args:
+        annual_losses: 시뮬레이션 연도별 연간 손실
+        confidence_level: VaR/TVaR 신뢰수준
+
+    Returns:
+        Tuple of (expected_loss, var, tvar, cv)
+    """
+    losses = np.ascontiguousarray(annual_losses, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        stats = _loss_statistics_kernel(losses, confidence_level)
+    else:
+        stats = _loss_statistics_numpy(losses, confidence_level)
+    return tuple(float(value) for value in stats)
+
+
+def warm_up() -> None:
+    """첫 요청이 JIT 컴파일 비용을 치르지 않도록 커널을 미리 컴파일"""
+    loss_statistics(np.zeros(2), 0.99)
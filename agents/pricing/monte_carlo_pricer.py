@@ -11,6 +11,7 @@ import pandas as pd
 from scipy import stats
 
 from .models.base import PricingResult, RiskLevel
+from .kernels import loss_statistics
 
 
 class MonteCarloPricer:
@@ -41,9 +42,10 @@ class MonteCarloPricer:
             PricingResult 객체
         """
         
-        # 1단계: 기본 통계량 계산
-        expected_loss = self.calculate_expected_loss(scenarios)
-        coefficient_of_variation = self.calculate_coefficient_of_variation(scenarios)
+        # 1단계: 기본 통계량 계산 (EL, CoV, VaR, TVaR를 연간 손실 배열에서 한 번에)
+        expected_loss, var_99, tvar_99, coefficient_of_variation = loss_statistics(
+            scenarios["annual_loss"].to_numpy(), confidence_level
+        )
         
         # 2단계: Risk Load 계산
         risk_load = self.calculate_risk_load(
@@ -54,13 +56,10 @@ class MonteCarloPricer:
         net_premium = expected_loss
         gross_premium = self.calculate_gross_premium(expected_loss, risk_load)
         
-        # 4단계: 리스크 지표 계산
-        var_99, tvar_99 = self.calculate_var_tvar(scenarios, confidence_level)
-        
-        # 5단계: 리스크 레벨 분류
+        # 4단계: 리스크 레벨 분류
         risk_level = self.classify_risk_level(coefficient_of_variation, expected_loss, var_99)
         
-        # 6단계: 추천사항 생성
+        # 5단계: 추천사항 생성
         recommendation = self.generate_recommendation(risk_level, coefficient_of_variation, expected_loss)
         
         return PricingResult(
@@ -7,7 +7,7 @@ Prior 분포를 기반으로 Monte Carlo 시뮬레이션을 통해
 
 import json
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import numpy as np
 import pandas as pd
@@ -32,6 +32,9 @@ class SyntheticScenarioGenerator:
         # 재현가능한 결과를 위한 시드 설정
         if random_seed is not None:
             np.random.seed(random_seed)
+        
+        # 기본 시나리오 샘플링용 난수 생성기 (연도·이벤트 전체를 한 번에 배치 샘플링)
+        self._rng = np.random.default_rng(random_seed)
     
     @property
     def llm(self) -> ChatOpenAI:
@@ -67,24 +70,38 @@ class SyntheticScenarioGenerator:
             시나리오 데이터프레임
         """
         
-        # 1단계: 기본 Monte Carlo 시뮬레이션
-        base_scenarios = self._generate_base_scenarios(
-            frequency_prior, severity_prior, years
+        # 1-2단계: 기본 Monte Carlo 시뮬레이션 및 Peril Canvas 지급 공식 적용 (CPU 작업은 스레드에서 실행)
+        base_task = asyncio.to_thread(
+            self._generate_base_payouts, canvas, frequency_prior, severity_prior, years
         )
         
-        # 2단계: Peril Canvas 지급 공식 적용
-        scenarios_with_payouts = self._apply_payout_formula(base_scenarios, canvas)
+        if not include_tail_scenarios:
+            return await base_task
         
-        # 3단계: Tail Risk 시나리오 추가 (옵션)
-        if include_tail_scenarios:
-            tail_scenarios = await self._generate_tail_scenarios(
+        # 3단계: Tail Risk 시나리오 추가 - LLM 호출은 Prior와 무관하므로 기본 시뮬레이션과 동시에 진행
+        scenarios_with_payouts, tail_scenarios = await asyncio.gather(
+            base_task,
+            self._generate_tail_scenarios(
                 canvas.peril, canvas.region, count=max(10, years // 100)
             )
-            scenarios_with_payouts = self._merge_tail_scenarios(
-                scenarios_with_payouts, tail_scenarios, canvas
-            )
+        )
         
-        return scenarios_with_payouts
+        return self._merge_tail_scenarios(
+            scenarios_with_payouts, tail_scenarios, canvas
+        )
+    
+    def _generate_base_payouts(
+        self,
+        canvas: PerilCanvas,
+        frequency_prior: FrequencyPrior,
+        severity_prior: SeverityPrior,
+        years: int
+    ) -> pd.DataFrame:
+        """기본 Monte Carlo 시나리오 생성 후 지급 공식 적용"""
+        base_scenarios = self._generate_base_scenarios(
+            frequency_prior, severity_prior, years
+        )
+        return self._apply_payout_formula(base_scenarios, canvas)
     
     def _generate_base_scenarios(
         self,
@@ -94,21 +111,23 @@ class SyntheticScenarioGenerator:
     ) -> pd.DataFrame:
         """기본 Monte Carlo 시뮬레이션 실행"""
         
+        # 전체 연도의 이벤트 발생 횟수와 전체 이벤트의 심도를 각각 한 번에 생성
+        event_counts = np.asarray(self._sample_frequency(frequency_prior, years), dtype=np.int64).tolist()
+        severities = np.asarray(self._sample_severity(severity_prior, sum(event_counts)), dtype=np.float64).tolist()
+        
         scenarios = []
+        offset = 0
         
-        for year in range(years):
-            # 연간 이벤트 발생 횟수 생성
-            event_count = self._sample_frequency(frequency_prior)
-            
-            # 각 이벤트의 심도 생성
-            events = []
-            for event_idx in range(event_count):
-                severity = self._sample_severity(severity_prior)
-                events.append({
+        for year, event_count in enumerate(event_counts):
+            events = [
+                {
                     "event_id": f"{year}_{event_idx}",
-                    "severity": severity,
+                    "severity": severities[offset + event_idx],
                     "event_index": event_idx
-                })
+                }
+                for event_idx in range(event_count)
+            ]
+            offset += event_count
             
             scenarios.append({
                 "year": year,
@@ -118,31 +137,31 @@ class SyntheticScenarioGenerator:
         
         return pd.DataFrame(scenarios)
     
-    def _sample_frequency(self, frequency_prior: FrequencyPrior) -> int:
+    def _sample_frequency(self, frequency_prior: FrequencyPrior, count: Optional[int] = None) -> Union[int, np.ndarray]:
         """빈도 분포에서 샘플링 (강화된 엣지 케이스 처리)"""
         
         # None 값 방어 처리
         if frequency_prior is None or frequency_prior.parameters is None:
             print("⚠️ [SCENARIO] FrequencyPrior 또는 parameters가 None - 기본값 사용")
-            return np.random.poisson(1)
+            return self._rng.poisson(1, count)
         
         dist_type = frequency_prior.distribution
         params = frequency_prior.parameters
         
         try:
             if dist_type == DistributionType.NEGATIVE_BINOMIAL:
-                return self._sample_negative_binomial(params)
+                return self._sample_negative_binomial(params, count)
             elif dist_type == DistributionType.POISSON:
-                return self._sample_poisson(params)
+                return self._sample_poisson(params, count)
             else:
                 print(f"⚠️ [SCENARIO] 알 수 없는 빈도 분포: {dist_type} - 기본값 사용")
-                return np.random.poisson(1)
+                return self._rng.poisson(1, count)
                 
         except Exception as e:
             print(f"⚠️ [SCENARIO] 빈도 샘플링 중 오류: {e} - 기본값 사용")
-            return np.random.poisson(1)
+            return self._rng.poisson(1, count)
     
-    def _sample_negative_binomial(self, params: dict) -> int:
+    def _sample_negative_binomial(self, params: dict, count: Optional[int] = None) -> Union[int, np.ndarray]:
         """Negative Binomial 분포 샘플링 (다양한 파라미터 형태 지원)"""
         
         # r, p 형태
@@ -158,7 +177,7 @@ class SyntheticScenarioGenerator:
                 print(f"⚠️ [SCENARIO] 유효하지 않은 p 값: {p} - 기본값 0.5 사용")
                 p = 0.5
                 
-            return np.random.negative_binomial(r, p)
+            return self._rng.negative_binomial(r, p, count)
         
         # n, p 형태 (alternative parameterization)
         elif "n" in params and "p" in params:
@@ -168,7 +187,7 @@ class SyntheticScenarioGenerator:
             if n <= 0: n = 1.0
             if p <= 0 or p >= 1: p = 0.5
                 
-            return np.random.negative_binomial(n, p)
+            return self._rng.negative_binomial(n, p, count)
         
         # size, prob 형태
         elif "size" in params and "prob" in params:
@@ -178,7 +197,7 @@ class SyntheticScenarioGenerator:
             if size <= 0: size = 1.0
             if prob <= 0 or prob >= 1: prob = 0.5
                 
-            return np.random.negative_binomial(size, prob)
+            return self._rng.negative_binomial(size, prob, count)
         
         # mu, phi 형태 (mean, overdispersion)
         elif "mu" in params and "phi" in params:
@@ -196,13 +215,13 @@ class SyntheticScenarioGenerator:
             if p <= 0 or p >= 1: p = 0.5
             if r <= 0: r = 1.0
                 
-            return np.random.negative_binomial(r, p)
+            return self._rng.negative_binomial(r, p, count)
         
         else:
             print(f"⚠️ [SCENARIO] 알 수 없는 Negative Binomial 파라미터: {params} - 기본값 사용")
-            return np.random.negative_binomial(1, 0.5)
+            return self._rng.negative_binomial(1, 0.5, count)
     
-    def _sample_poisson(self, params: dict) -> int:
+    def _sample_poisson(self, params: dict, count: Optional[int] = None) -> Union[int, np.ndarray]:
         """Poisson 분포 샘플링 (다양한 파라미터 형태 지원)"""
         
         # lambda 형태
@@ -223,7 +242,7 @@ class SyntheticScenarioGenerator:
             print(f"⚠️ [SCENARIO] 유효하지 않은 lambda 값: {lam} - 기본값 1.0 사용")
             lam = 1.0
         
-        return np.random.poisson(lam)
+        return self._rng.poisson(lam, count)
     
     def _safe_float_conversion(self, value, param_name: str, default_value: float) -> float:
         """안전한 float 변환 (None, string 등 처리)"""
@@ -238,35 +257,35 @@ class SyntheticScenarioGenerator:
             print(f"⚠️ [SCENARIO] {param_name} 값 변환 실패 ({value}) - 기본값 {default_value} 사용")
             return default_value
     
-    def _sample_severity(self, severity_prior: SeverityPrior) -> float:
+    def _sample_severity(self, severity_prior: SeverityPrior, count: Optional[int] = None) -> Union[float, np.ndarray]:
         """심도 분포에서 샘플링 (강화된 엣지 케이스 처리)"""
         
         # None 값 방어 처리
         if severity_prior is None or severity_prior.parameters is None:
             print("⚠️ [SCENARIO] SeverityPrior 또는 parameters가 None - 기본값 사용")
-            return np.random.lognormal(1, 0.5)
+            return self._rng.lognormal(1, 0.5, count)
         
         dist_type = severity_prior.distribution
         params = severity_prior.parameters
         
         try:
             if dist_type == DistributionType.LOGNORMAL:
-                return self._sample_lognormal(params)
+                return self._sample_lognormal(params, count)
             elif dist_type == DistributionType.GAMMA:
-                return self._sample_gamma(params)
+                return self._sample_gamma(params, count)
             elif dist_type == DistributionType.EXPONENTIAL:
-                return self._sample_exponential(params)
+                return self._sample_exponential(params, count)
             elif dist_type == DistributionType.NORMAL:
-                return self._sample_normal(params)
+                return self._sample_normal(params, count)
             else:
                 print(f"⚠️ [SCENARIO] 알 수 없는 심도 분포: {dist_type} - 기본값 사용")
-                return np.random.lognormal(1, 0.5)
+                return self._rng.lognormal(1, 0.5, count)
                 
         except Exception as e:
             print(f"⚠️ [SCENARIO] 심도 샘플링 중 오류: {e} - 기본값 사용")
-            return np.random.lognormal(1, 0.5)
+            return self._rng.lognormal(1, 0.5, count)
     
-    def _sample_lognormal(self, params: dict) -> float:
+    def _sample_lognormal(self, params: dict, count: Optional[int] = None) -> Union[float, np.ndarray]:
         """LogNormal 분포 샘플링 (다양한 파라미터 형태 지원)"""
         
         # mu, sigma 형태 (표준)
@@ -294,9 +313,9 @@ class SyntheticScenarioGenerator:
             print(f"⚠️ [SCENARIO] 유효하지 않은 sigma 값: {sigma} - 기본값 0.5 사용")
             sigma = 0.5
         
-        return np.random.lognormal(mu, sigma)
+        return self._rng.lognormal(mu, sigma, count)
     
-    def _sample_gamma(self, params: dict) -> float:
+    def _sample_gamma(self, params: dict, count: Optional[int] = None) -> Union[float, np.ndarray]:
         """Gamma 분포 샘플링 (다양한 파라미터 형태 지원)"""
         
         # alpha, beta 형태 (shape, rate)
@@ -307,7 +326,7 @@ class SyntheticScenarioGenerator:
             if alpha <= 0: alpha = 2.0
             if beta <= 0: beta = 1.0
             
-            return np.random.gamma(alpha, 1/beta)
+            return self._rng.gamma(alpha, 1/beta, count)
         
         # shape, scale 형태
         elif "shape" in params and "scale" in params:
@@ -317,7 +336,7 @@ class SyntheticScenarioGenerator:
             if shape <= 0: shape = 2.0
             if scale <= 0: scale = 1.0
             
-            return np.random.gamma(shape, scale)
+            return self._rng.gamma(shape, scale, count)
         
         # shape, rate 형태
         elif "shape" in params and "rate" in params:
@@ -327,7 +346,7 @@ class SyntheticScenarioGenerator:
             if shape <= 0: shape = 2.0
             if rate <= 0: rate = 1.0
             
-            return np.random.gamma(shape, 1/rate)
+            return self._rng.gamma(shape, 1/rate, count)
         
         # k, theta 형태 (alternative naming)
         elif "k" in params and "theta" in params:
@@ -337,7 +356,7 @@ class SyntheticScenarioGenerator:
             if k <= 0: k = 2.0
             if theta <= 0: theta = 1.0
             
-            return np.random.gamma(k, theta)
+            return self._rng.gamma(k, theta, count)
         
         # mu, sigma 형태 (LLM이 잘못 응답한 경우)
         elif "mu" in params and "sigma" in params:
@@ -355,7 +374,7 @@ class SyntheticScenarioGenerator:
             if alpha <= 0: alpha = 2.0
             if beta <= 0: beta = 1.0
             
-            return np.random.gamma(alpha, beta)
+            return self._rng.gamma(alpha, beta, count)
         
         # mean, var 형태
         elif "mean" in params and ("var" in params or "variance" in params):
@@ -372,50 +391,50 @@ class SyntheticScenarioGenerator:
             if alpha <= 0: alpha = 2.0
             if beta <= 0: beta = 1.0
             
-            return np.random.gamma(alpha, beta)
+            return self._rng.gamma(alpha, beta, count)
         
         else:
             print(f"⚠️ [SCENARIO] 알 수 없는 Gamma 파라미터: {params} - 기본값 사용")
-            return np.random.gamma(2.0, 1.0)
+            return self._rng.gamma(2.0, 1.0, count)
     
-    def _sample_exponential(self, params: dict) -> float:
+    def _sample_exponential(self, params: dict, count: Optional[int] = None) -> Union[float, np.ndarray]:
         """Exponential 분포 샘플링 (다양한 파라미터 형태 지원)"""
         
         # lambda 형태 (rate parameter)
         if "lambda" in params:
             lam = self._safe_float_conversion(params["lambda"], "lambda", 1.0)
             if lam <= 0: lam = 1.0
-            return np.random.exponential(1/lam)
+            return self._rng.exponential(1/lam, count)
         
         # rate 형태
         elif "rate" in params:
             rate = self._safe_float_conversion(params["rate"], "rate", 1.0)
             if rate <= 0: rate = 1.0
-            return np.random.exponential(1/rate)
+            return self._rng.exponential(1/rate, count)
         
         # scale 형태
         elif "scale" in params:
             scale = self._safe_float_conversion(params["scale"], "scale", 1.0)
             if scale <= 0: scale = 1.0
-            return np.random.exponential(scale)
+            return self._rng.exponential(scale, count)
         
         # beta 형태 (alternative naming)
         elif "beta" in params:
             beta = self._safe_float_conversion(params["beta"], "beta", 1.0)
             if beta <= 0: beta = 1.0
-            return np.random.exponential(1/beta)
+            return self._rng.exponential(1/beta, count)
         
         # mean 형태
         elif "mean" in params:
             mean = self._safe_float_conversion(params["mean"], "mean", 1.0)
             if mean <= 0: mean = 1.0
-            return np.random.exponential(mean)
+            return self._rng.exponential(mean, count)
         
         else:
             print(f"⚠️ [SCENARIO] 알 수 없는 Exponential 파라미터: {params} - 기본값 사용")
-            return np.random.exponential(1.0)
+            return self._rng.exponential(1.0, count)
     
-    def _sample_normal(self, params: dict) -> float:
+    def _sample_normal(self, params: dict, count: Optional[int] = None) -> Union[float, np.ndarray]:
         """Normal 분포 샘플링 (음수 방지, 다양한 파라미터 형태 지원)"""
         
         # mu, sigma 형태
@@ -440,8 +459,8 @@ class SyntheticScenarioGenerator:
             sigma = 1.0
         
         # 음수 방지를 위한 Truncated Normal 근사
-        sample = np.random.normal(mu, sigma)
-        return max(0.001, sample)  # 매우 작은 양수로 제한
+        sample = self._rng.normal(mu, sigma, count)
+        return np.maximum(0.001, sample)  # 매우 작은 양수로 제한
     
     def _apply_payout_formula(self, scenarios: pd.DataFrame, canvas: PerilCanvas) -> pd.DataFrame:
         """Peril Canvas의 지급 공식을 시나리오에 적용"""
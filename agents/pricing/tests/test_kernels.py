@@ -0,0 +1,32 @@
+"""
+Monte Carlo 집계 커널 테스트
+
+JIT 커널(loss_statistics)이 NumPy 구현과 같은 (EL, VaR, TVaR, CoV)를 내는지 검증합니다.
+"""
+
+import numpy as np
+import pytest
+
+from agents.pricing.kernels import loss_statistics, _loss_statistics_numpy
+
+
+class TestLossStatistics:
+    """loss_statistics vs _loss_statistics_numpy"""
+
+    def test_matches_numpy_for_simulated_losses(self):
+        """일반적인 연간 손실 배열"""
+        rng = np.random.default_rng(42)
+        losses = rng.lognormal(mean=10.0, sigma=1.5, size=10_000)
+
+        expected = _loss_statistics_numpy(losses, 0.99)
+        assert loss_statistics(losses, 0.99) == pytest.approx(expected, rel=1e-9)
+
+    def test_single_year_cv_is_nan(self):
+        """시뮬레이션 1년: 표본 표준편차가 없으므로 CoV는 NumPy 구현처럼 NaN"""
+        losses = np.array([1234.5])
+
+        expected_loss, var, tvar, cv = loss_statistics(losses, 0.99)
+        np_loss, np_var, np_tvar, np_cv = _loss_statistics_numpy(losses, 0.99)
+
+        assert (expected_loss, var, tvar) == (np_loss, np_var, np_tvar)
+        assert np.isnan(cv) and np.isnan(np_cv)
@@ -196,6 +196,8 @@ class SafePromptBuilder:
 class PriorExtractionPrompts:
     """Prior 추출용 표준화된 프롬프트 모음"""
     
+    # 시스템 템플릿은 요청과 무관한 고정 텍스트로 유지 (LLM prefix 캐시 적중), 요청별 값은 휴먼 메시지에만 주입
+    
     # 공통 JSON 응답 형식 안내
     JSON_RESPONSE_INSTRUCTION = """
 CRITICAL: Respond with pure JSON format only. No code blocks, no markdown, no additional explanations. 
@@ -248,7 +250,7 @@ Provide the Negative-Binomial parameters for annual event count, considering:
 
 Response format:
 {{{{
-    "distribution": "{distribution}",
+    "distribution": "<recommended distribution>",
     "parameters": {{{{
         "mu": 2.1,
         "sigma": 0.6
@@ -258,7 +260,7 @@ Response format:
         "50th": 8.1,
         "95th": 25.4
     }}}},
-    "metric_unit": "{unit}",
+    "metric_unit": "<unit>",
     "sources": ["Source1", "Source2"],
     "confidence": 0.82,
     "rationale": "Brief explanation of distribution choice and parameters"
@@ -276,6 +278,7 @@ Unit: {unit}
 Recommended distribution: {distribution}
 
 Provide the {distribution} distribution parameters for the severity of {metric} when {peril} events occur.
+Respond with "distribution": "{distribution}" and "metric_unit": "{unit}".
 
 Consider:
 - Physical constraints and realistic ranges for {metric}
@@ -293,6 +296,7 @@ CRITICAL: For ticket-based metrics, ensure realistic venue capacity constraints.
 {ticket_guidance}
 
 Provide the {distribution} distribution parameters for {metric} severity in {peril} scenarios.
+Respond with "distribution": "{distribution}" and "metric_unit": "{unit}".
 
 Requirements:
 {requirements}"""
@@ -314,9 +318,7 @@ Requirements:
         """심도 Prior 추출용 안전한 프롬프트 템플릿"""
         return SafePromptBuilder.create_safe_chat_template(
             system_template=cls.SEVERITY_SYSTEM_TEMPLATE.format(
-                json_instruction=cls.JSON_RESPONSE_INSTRUCTION,
-                distribution=distribution,
-                unit=unit
+                json_instruction=cls.JSON_RESPONSE_INSTRUCTION
             ),
             human_template=cls.SEVERITY_HUMAN_TEMPLATE,
             variables=["peril", "metric", "unit", "distribution"],
@@ -347,9 +349,7 @@ Concert cancellations are insured when significant ticket sales occur (1000+ tic
         
         return SafePromptBuilder.create_safe_chat_template(
             system_template=cls.SEVERITY_SYSTEM_TEMPLATE.format(
-                json_instruction=cls.JSON_RESPONSE_INSTRUCTION,
-                distribution=distribution,
-                unit=unit
+                json_instruction=cls.JSON_RESPONSE_INSTRUCTION
             ),
             human_template=cls.SEVERITY_TICKETS_HUMAN_TEMPLATE.format(
                 peril="{peril}",
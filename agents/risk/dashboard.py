@@ -6,11 +6,10 @@ for monitoring and visualizing risk metrics in real-time.
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 import statistics
 from collections import defaultdict, deque
@@ -19,6 +18,7 @@ from .models import RiskLevel, RiskPrediction
 from .calculator import RiskCalculationResult, RealTimeRiskCalculator
 from .portfolio import PortfolioManager, PortfolioMetrics, InsurancePolicy
 from .metrics import RiskMetrics, PerformanceAnalyzer, MetricResult
+from .json_export import dumps_export
 
 logger = logging.getLogger(__name__)
 
@@ -582,7 +582,7 @@ class RiskDashboard:
         data = await self.get_dashboard_data()
         
         if format == 'json':
-            return json.dumps(data, indent=2, default=str)
+            return dumps_export(data)
         else:
             raise ValueError(f"Unsupported export format: {format}")
 
@@ -694,7 +694,7 @@ class AlertSystem:
                 'rule_id': rule['rule_id'],
                 'threshold': rule['threshold'],
                 'current_value': await self._get_current_value(rule, metrics),
-                'portfolio_metrics': metrics.__dict__
+                'portfolio_metrics': {f.name: getattr(metrics, f.name) for f in fields(metrics) if f.init}
             },
             threshold_value=rule['threshold'],
             current_value=await self._get_current_value(rule, metrics),
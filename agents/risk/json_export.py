@@ -0,0 +1,66 @@
+"""
+JSON Export Helpers
+
+Serializes dashboard payloads with orjson when it is installed and json.dumps
+otherwise. Payloads are normalized to plain JSON types first so that both
+serializers emit the same document.
+"""
+
+import json
+import math
+from enum import Enum
+from typing import Any
+
+import numpy as np
+
+# Fast JSON export (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_key(key: Any) -> str:
+    """Convert a mapping key the way json.dumps does, falling back to str()"""
+    key = to_json_safe(key)
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
+def to_json_safe(obj: Any) -> Any:
+    """Normalize a payload to plain JSON types.
+
+    Enums render as json.dumps(default=str) renders them, non-finite floats
+    become null, NumPy values become lists/scalars and anything else is str().
+    """
+    if isinstance(obj, Enum):
+        # Mixed-in enums (str/int/float) serialize as their value, plain enums via str()
+        return to_json_safe(obj.value) if isinstance(obj, (str, int, float)) else str(obj)
+    if obj is None or isinstance(obj, (str, bool, int)):
+        return obj
+    if isinstance(obj, float):
+        return float(obj) if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {_json_key(k): to_json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_json_safe(v) for v in obj]
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return to_json_safe(obj.tolist())
+    return str(obj)
+
+
+def dumps_export(data: Any, use_orjson: bool = ORJSON_AVAILABLE) -> str:
+    """Serialize an export payload as indented JSON.
+
+    Both serializers receive the normalized payload, so installing orjson does
+    not change the exported document. inf/NaN are exported as null because
+    orjson cannot emit the non-standard Infinity/NaN tokens.
+    """
+    payload = to_json_safe(data)
+    if use_orjson:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(payload, indent=2)
@@ -10,17 +10,24 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import json
 import logging
 import statistics
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
+from itertools import islice
 
 from .models import RiskLevel, RiskPrediction
 from .calculator import RiskCalculationResult
 from .portfolio import InsurancePolicy, PortfolioMetrics, PolicyStatus
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,7 +50,7 @@ class TimeFrame(Enum):
     YEARLY = "yearly"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MetricResult:
     """Risk metric calculation result"""
     metric_name: str
@@ -58,7 +65,7 @@ class MetricResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PerformanceReport:
     """Performance analysis report"""
     period_start: datetime
@@ -77,7 +84,7 @@ class PerformanceReport:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskDecomposition:
     """Risk decomposition analysis"""
     total_risk: float
@@ -90,7 +97,7 @@ class RiskDecomposition:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StressTestResult:
     """Stress test result"""
     scenario_name: str
@@ -103,6 +110,108 @@ class StressTestResult:
     timestamp: datetime
 
 
+# Shared fallback for summary fields whose metric could not be calculated
+_ZERO_METRIC = MetricResult(
+    metric_name="", metric_type=MetricType.RISK,
+    value=0.0, benchmark_value=None, percentile_rank=None,
+    historical_average=None, trend="stable",
+    confidence_interval=(0.0, 0.0), calculation_date=datetime.min
+)
+
+# Error-path templates; callers replace the period/timestamp and pass fresh containers
+_ZERO_REPORT = PerformanceReport(
+    period_start=datetime.min, period_end=datetime.min,
+    total_return=0.0, annualized_return=0.0, volatility=0.0,
+    sharpe_ratio=0.0, sortino_ratio=0.0, max_drawdown=0.0,
+    win_rate=0.0, profit_factor=0.0, var_95=0.0, cvar_95=0.0,
+    metrics=[], timestamp=datetime.min
+)
+
+_ZERO_DECOMPOSITION = RiskDecomposition(
+    total_risk=0.0, systematic_risk=0.0, idiosyncratic_risk=0.0,
+    asset_class_contributions={}, geographic_contributions={},
+    temporal_contributions={}, correlation_contributions={},
+    timestamp=datetime.min
+)
+
+
+def _premium_array(portfolio_data: List[PortfolioMetrics]) -> np.ndarray:
+    """Extract total premiums as a contiguous float64 array"""
+    return np.fromiter((p.total_premium for p in portfolio_data), dtype=np.float64, count=len(portfolio_data))
+
+
+def _allocation_matrix(portfolio_data: List[PortfolioMetrics]) -> np.ndarray:
+    """Stack asset allocations into a (snapshots x asset classes) weight matrix"""
+    columns: Dict[str, int] = {}
+    for snapshot in portfolio_data:
+        for asset_class in snapshot.asset_allocation:
+            columns.setdefault(asset_class, len(columns))
+    
+    allocations = np.zeros((len(portfolio_data), len(columns)), dtype=np.float64)
+    for i, snapshot in enumerate(portfolio_data):
+        for asset_class, weight in snapshot.asset_allocation.items():
+            allocations[i, columns[asset_class]] = weight
+    
+    return allocations
+
+
+# Stress impact (%) thresholds and the recovery time (days) for each resulting bucket
+_RECOVERY_BUCKETS = np.array([5.0, 15.0, 30.0])
+_RECOVERY_DAYS = (30, 90, 180, 365)  # 1 month, 3 months, 6 months, 1 year
+
+# Below this many asset classes the JIT kernel's thread start-up outweighs the NumPy temporaries
+_NUMBA_MIN_ASSETS = 64
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _corr_contrib_kernel(weights, correlations, total_risk, out_flat):
+        """Fill out_flat with 2 * total_risk * w_i * w_j * rho_ij for i < j, row-major"""
+        n = weights.shape[0]
+        for i in prange(n):
+            offset = i * (2 * n - i - 1) // 2 - i - 1
+            scale = 2.0 * total_risk * weights[i]
+            for j in range(i + 1, n):
+                out_flat[offset + j] = scale * weights[j] * correlations[i, j]
+
+
+def _correlation_contributions(weights: np.ndarray, correlations: np.ndarray, total_risk: float) -> np.ndarray:
+    """Upper-triangle correlation risk contributions, in np.triu_indices(k=1) order"""
+    n = len(weights)
+    if NUMBA_AVAILABLE and n >= _NUMBA_MIN_ASSETS:
+        out_flat = np.empty(n * (n - 1) // 2, dtype=np.float64)
+        _corr_contrib_kernel(weights, np.ascontiguousarray(correlations), total_risk, out_flat)
+        return out_flat
+    
+    rows, cols = np.triu_indices(n, k=1)
+    return (2.0 * total_risk) * weights[rows] * weights[cols] * correlations[rows, cols]
+
+
+def _same_snapshots(snapshots: Tuple[PortfolioMetrics, ...], portfolio_data: List[PortfolioMetrics]) -> bool:
+    """Whether a history still holds exactly the given snapshot objects, in order.
+
+    Compares contents rather than container identity, so rolling windows
+    (deque(maxlen=N)) and in-place replacements are detected.
+    """
+    return len(snapshots) == len(portfolio_data) and all(a is b for a, b in zip(snapshots, portfolio_data))
+
+
+@dataclass
+class _PortfolioColumns:
+    """Column-wise (structure-of-arrays) view of a PortfolioMetrics history"""
+    total_premium: np.ndarray
+    var_95: np.ndarray
+    allocations: np.ndarray
+    
+    @classmethod
+    def from_list(cls, portfolio_data: List[PortfolioMetrics]) -> '_PortfolioColumns':
+        """Build contiguous columns from a list of snapshots"""
+        return cls(
+            total_premium=_premium_array(portfolio_data),
+            var_95=np.fromiter((p.var_95 for p in portfolio_data), dtype=np.float64, count=len(portfolio_data)),
+            allocations=_allocation_matrix(portfolio_data)
+        )
+
+
 class RiskMetrics:
     """Risk metrics calculator"""
     
@@ -113,20 +222,25 @@ class RiskMetrics:
         
     async def calculate_return_metrics(self, 
                                      portfolio_data: List[PortfolioMetrics],
-                                     time_frame: TimeFrame = TimeFrame.DAILY) -> Dict[str, MetricResult]:
+                                     time_frame: TimeFrame = TimeFrame.DAILY,
+                                     premiums: Optional[np.ndarray] = None) -> Dict[str, MetricResult]:
         """Calculate return-based metrics"""
         try:
             if len(portfolio_data) < 2:
                 logger.warning("Insufficient data for return calculations")
                 return {}
             
+            if premiums is None:
+                premiums = _premium_array(portfolio_data)
+            
             # Calculate returns
-            returns = await self._calculate_returns(portfolio_data, time_frame)
+            returns = await self._calculate_returns(premiums, time_frame)
             
             metrics = {}
+            now = datetime.now()
             
             # Total return
-            total_return = (portfolio_data[-1].total_premium - portfolio_data[0].total_premium) / portfolio_data[0].total_premium
+            total_return = float((premiums[-1] - premiums[0]) / premiums[0])
             metrics['total_return'] = MetricResult(
                 metric_name="Total Return",
                 metric_type=MetricType.RETURN,
@@ -136,12 +250,12 @@ class RiskMetrics:
                 historical_average=await self._calculate_historical_average('total_return'),
                 trend=await self._calculate_trend('total_return', total_return),
                 confidence_interval=await self._calculate_confidence_interval(returns),
-                calculation_date=datetime.now()
+                calculation_date=now
             )
             
             # Annualized return
-            if returns:
-                annualized_return = (1 + statistics.mean(returns)) ** (252 if time_frame == TimeFrame.DAILY else 52) - 1
+            if returns.size:
+                annualized_return = float((1 + returns.mean()) ** (252 if time_frame == TimeFrame.DAILY else 52) - 1)
                 metrics['annualized_return'] = MetricResult(
                     metric_name="Annualized Return",
                     metric_type=MetricType.RETURN,
@@ -151,11 +265,12 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('annualized_return'),
                     trend=await self._calculate_trend('annualized_return', annualized_return),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             # Cumulative return
-            cumulative_return = np.prod([1 + r for r in returns]) - 1 if returns else 0.0
+            # log1p/expm1 keeps long horizons of small returns numerically stable
+            cumulative_return = float(np.expm1(np.log1p(returns).sum())) if returns.size else 0.0
             metrics['cumulative_return'] = MetricResult(
                 metric_name="Cumulative Return",
                 metric_type=MetricType.RETURN,
@@ -165,7 +280,7 @@ class RiskMetrics:
                 historical_average=await self._calculate_historical_average('cumulative_return'),
                 trend=await self._calculate_trend('cumulative_return', cumulative_return),
                 confidence_interval=await self._calculate_confidence_interval(returns),
-                calculation_date=datetime.now()
+                calculation_date=now
             )
             
             logger.info(f"Calculated {len(metrics)} return metrics")
@@ -177,21 +292,26 @@ class RiskMetrics:
     
     async def calculate_risk_metrics(self, 
                                    portfolio_data: List[PortfolioMetrics],
-                                   time_frame: TimeFrame = TimeFrame.DAILY) -> Dict[str, MetricResult]:
+                                   time_frame: TimeFrame = TimeFrame.DAILY,
+                                   premiums: Optional[np.ndarray] = None) -> Dict[str, MetricResult]:
         """Calculate risk-based metrics"""
         try:
             if len(portfolio_data) < 2:
                 logger.warning("Insufficient data for risk calculations")
                 return {}
             
-            returns = await self._calculate_returns(portfolio_data, time_frame)
+            if premiums is None:
+                premiums = _premium_array(portfolio_data)
+            
+            returns = await self._calculate_returns(premiums, time_frame)
             
             metrics = {}
+            now = datetime.now()
             
             # Volatility
-            if returns and len(returns) > 1:
-                volatility = statistics.stdev(returns)
-                annualized_volatility = volatility * np.sqrt(252 if time_frame == TimeFrame.DAILY else 52)
+            if returns.size > 1:
+                volatility = returns.std(ddof=1)
+                annualized_volatility = float(volatility * np.sqrt(252 if time_frame == TimeFrame.DAILY else 52))
                 
                 metrics['volatility'] = MetricResult(
                     metric_name="Volatility",
@@ -202,12 +322,12 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('volatility'),
                     trend=await self._calculate_trend('volatility', annualized_volatility),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             # Value at Risk (VaR)
-            if returns:
-                var_95 = np.percentile(returns, 5) if len(returns) > 1 else 0.0
+            if returns.size:
+                var_95 = float(np.percentile(returns, 5)) if returns.size > 1 else 0.0
                 metrics['var_95'] = MetricResult(
                     metric_name="Value at Risk (95%)",
                     metric_type=MetricType.RISK,
@@ -217,12 +337,12 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('var_95'),
                     trend=await self._calculate_trend('var_95', var_95),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             # Conditional Value at Risk (CVaR)
-            if returns:
-                cvar_95 = np.mean([r for r in returns if r <= np.percentile(returns, 5)]) if len(returns) > 1 else 0.0
+            if returns.size:
+                cvar_95 = float(returns[returns <= np.percentile(returns, 5)].mean()) if returns.size > 1 else 0.0
                 metrics['cvar_95'] = MetricResult(
                     metric_name="Conditional VaR (95%)",
                     metric_type=MetricType.RISK,
@@ -232,11 +352,11 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('cvar_95'),
                     trend=await self._calculate_trend('cvar_95', cvar_95),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             # Maximum Drawdown
-            if returns:
+            if returns.size:
                 max_drawdown = await self._calculate_max_drawdown(returns)
                 metrics['max_drawdown'] = MetricResult(
                     metric_name="Maximum Drawdown",
@@ -247,13 +367,13 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('max_drawdown'),
                     trend=await self._calculate_trend('max_drawdown', max_drawdown),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             # Skewness
-            if returns and len(returns) > 2:
+            if returns.size > 2:
                 from scipy import stats
-                skewness = stats.skew(returns)
+                skewness = float(stats.skew(returns))
                 metrics['skewness'] = MetricResult(
                     metric_name="Skewness",
                     metric_type=MetricType.RISK,
@@ -263,13 +383,13 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('skewness'),
                     trend=await self._calculate_trend('skewness', skewness),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             # Kurtosis
-            if returns and len(returns) > 3:
+            if returns.size > 3:
                 from scipy import stats
-                kurtosis = stats.kurtosis(returns)
+                kurtosis = float(stats.kurtosis(returns))
                 metrics['kurtosis'] = MetricResult(
                     metric_name="Kurtosis",
                     metric_type=MetricType.RISK,
@@ -279,7 +399,7 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('kurtosis'),
                     trend=await self._calculate_trend('kurtosis', kurtosis),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             logger.info(f"Calculated {len(metrics)} risk metrics")
@@ -291,22 +411,28 @@ class RiskMetrics:
     
     async def calculate_performance_metrics(self, 
                                           portfolio_data: List[PortfolioMetrics],
-                                          time_frame: TimeFrame = TimeFrame.DAILY) -> Dict[str, MetricResult]:
+                                          time_frame: TimeFrame = TimeFrame.DAILY,
+                                          premiums: Optional[np.ndarray] = None) -> Dict[str, MetricResult]:
         """Calculate performance-based metrics"""
         try:
             if len(portfolio_data) < 2:
                 logger.warning("Insufficient data for performance calculations")
                 return {}
             
-            returns = await self._calculate_returns(portfolio_data, time_frame)
+            if premiums is None:
+                premiums = _premium_array(portfolio_data)
+            
+            returns = await self._calculate_returns(premiums, time_frame)
             
             metrics = {}
+            now = datetime.now()
             
             # Sharpe Ratio
-            if returns and len(returns) > 1:
-                excess_returns = [r - self.risk_free_rate/252 for r in returns]
-                sharpe_ratio = statistics.mean(excess_returns) / statistics.stdev(excess_returns) if statistics.stdev(excess_returns) > 0 else 0
-                annualized_sharpe = sharpe_ratio * np.sqrt(252 if time_frame == TimeFrame.DAILY else 52)
+            if returns.size > 1:
+                excess_returns = returns - self.risk_free_rate/252
+                excess_std = excess_returns.std(ddof=1)
+                sharpe_ratio = excess_returns.mean() / excess_std if excess_std > 0 else 0
+                annualized_sharpe = float(sharpe_ratio * np.sqrt(252 if time_frame == TimeFrame.DAILY else 52))
                 
                 metrics['sharpe_ratio'] = MetricResult(
                     metric_name="Sharpe Ratio",
@@ -317,16 +443,16 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('sharpe_ratio'),
                     trend=await self._calculate_trend('sharpe_ratio', annualized_sharpe),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             # Sortino Ratio
-            if returns:
-                downside_returns = [r for r in returns if r < 0]
-                if downside_returns:
-                    downside_deviation = statistics.stdev(downside_returns)
-                    sortino_ratio = statistics.mean(returns) / downside_deviation if downside_deviation > 0 else 0
-                    annualized_sortino = sortino_ratio * np.sqrt(252 if time_frame == TimeFrame.DAILY else 52)
+            if returns.size:
+                downside_returns = returns[returns < 0]
+                if downside_returns.size > 1:
+                    downside_deviation = downside_returns.std(ddof=1)
+                    sortino_ratio = returns.mean() / downside_deviation if downside_deviation > 0 else 0
+                    annualized_sortino = float(sortino_ratio * np.sqrt(252 if time_frame == TimeFrame.DAILY else 52))
                     
                     metrics['sortino_ratio'] = MetricResult(
                         metric_name="Sortino Ratio",
@@ -337,17 +463,18 @@ class RiskMetrics:
                         historical_average=await self._calculate_historical_average('sortino_ratio'),
                         trend=await self._calculate_trend('sortino_ratio', annualized_sortino),
                         confidence_interval=await self._calculate_confidence_interval(returns),
-                        calculation_date=datetime.now()
+                        calculation_date=now
                     )
             
             # Information Ratio
-            if returns:
+            if returns.size:
                 # Assuming benchmark returns are available
-                benchmark_returns = [0.02/252] * len(returns)  # 2% annual risk-free rate
-                active_returns = [r - b for r, b in zip(returns, benchmark_returns)]
+                benchmark_return = 0.02/252  # 2% annual risk-free rate
+                active_returns = returns - benchmark_return
                 
-                if len(active_returns) > 1:
-                    info_ratio = statistics.mean(active_returns) / statistics.stdev(active_returns) if statistics.stdev(active_returns) > 0 else 0
+                if active_returns.size > 1:
+                    active_std = active_returns.std(ddof=1)
+                    info_ratio = float(active_returns.mean() / active_std) if active_std > 0 else 0
                     
                     metrics['information_ratio'] = MetricResult(
                         metric_name="Information Ratio",
@@ -358,14 +485,14 @@ class RiskMetrics:
                         historical_average=await self._calculate_historical_average('information_ratio'),
                         trend=await self._calculate_trend('information_ratio', info_ratio),
                         confidence_interval=await self._calculate_confidence_interval(returns),
-                        calculation_date=datetime.now()
+                        calculation_date=now
                     )
             
             # Calmar Ratio
-            if returns:
-                annualized_return = (1 + statistics.mean(returns)) ** (252 if time_frame == TimeFrame.DAILY else 52) - 1
+            if returns.size:
+                annualized_return = (1 + returns.mean()) ** (252 if time_frame == TimeFrame.DAILY else 52) - 1
                 max_drawdown = await self._calculate_max_drawdown(returns)
-                calmar_ratio = annualized_return / abs(max_drawdown) if max_drawdown != 0 else 0
+                calmar_ratio = float(annualized_return / abs(max_drawdown)) if max_drawdown != 0 else 0
                 
                 metrics['calmar_ratio'] = MetricResult(
                     metric_name="Calmar Ratio",
@@ -376,7 +503,7 @@ class RiskMetrics:
                     historical_average=await self._calculate_historical_average('calmar_ratio'),
                     trend=await self._calculate_trend('calmar_ratio', calmar_ratio),
                     confidence_interval=await self._calculate_confidence_interval(returns),
-                    calculation_date=datetime.now()
+                    calculation_date=now
                 )
             
             logger.info(f"Calculated {len(metrics)} performance metrics")
@@ -387,17 +514,22 @@ class RiskMetrics:
             return {}
     
     async def calculate_efficiency_metrics(self, 
-                                         portfolio_data: List[PortfolioMetrics]) -> Dict[str, MetricResult]:
+                                         portfolio_data: List[PortfolioMetrics],
+                                         allocations: Optional[np.ndarray] = None) -> Dict[str, MetricResult]:
         """Calculate efficiency metrics"""
         try:
             if len(portfolio_data) < 2:
                 logger.warning("Insufficient data for efficiency calculations")
                 return {}
             
+            if allocations is None:
+                allocations = _allocation_matrix(portfolio_data)
+            
             metrics = {}
+            now = datetime.now()
             
             # Portfolio Turnover
-            turnover = await self._calculate_portfolio_turnover(portfolio_data)
+            turnover = await self._calculate_portfolio_turnover(allocations)
             metrics['portfolio_turnover'] = MetricResult(
                 metric_name="Portfolio Turnover",
                 metric_type=MetricType.EFFICIENCY,
@@ -407,7 +539,7 @@ class RiskMetrics:
                 historical_average=await self._calculate_historical_average('portfolio_turnover'),
                 trend=await self._calculate_trend('portfolio_turnover', turnover),
                 confidence_interval=(turnover * 0.9, turnover * 1.1),
-                calculation_date=datetime.now()
+                calculation_date=now
             )
             
             # Expense Ratio
@@ -421,7 +553,7 @@ class RiskMetrics:
                 historical_average=await self._calculate_historical_average('expense_ratio'),
                 trend=await self._calculate_trend('expense_ratio', expense_ratio),
                 confidence_interval=(expense_ratio * 0.9, expense_ratio * 1.1),
-                calculation_date=datetime.now()
+                calculation_date=now
             )
             
             # Active Share
@@ -435,7 +567,7 @@ class RiskMetrics:
                 historical_average=await self._calculate_historical_average('active_share'),
                 trend=await self._calculate_trend('active_share', active_share),
                 confidence_interval=(active_share * 0.9, active_share * 1.1),
-                calculation_date=datetime.now()
+                calculation_date=now
             )
             
             logger.info(f"Calculated {len(metrics)} efficiency metrics")
@@ -446,64 +578,36 @@ class RiskMetrics:
             return {}
     
     async def _calculate_returns(self, 
-                               portfolio_data: List[PortfolioMetrics],
-                               time_frame: TimeFrame) -> List[float]:
-        """Calculate returns from portfolio data"""
-        returns = []
-        
-        for i in range(1, len(portfolio_data)):
-            prev_value = portfolio_data[i-1].total_premium
-            curr_value = portfolio_data[i].total_premium
-            
-            if prev_value > 0:
-                return_value = (curr_value - prev_value) / prev_value
-                returns.append(return_value)
+                               premiums: np.ndarray,
+                               time_frame: TimeFrame) -> np.ndarray:
+        """Calculate period returns from the premium series"""
+        prev_values = premiums[:-1]
+        curr_values = premiums[1:]
+        valid = prev_values > 0
         
-        return returns
+        return (curr_values[valid] - prev_values[valid]) / prev_values[valid]
     
-    async def _calculate_max_drawdown(self, returns: List[float]) -> float:
+    async def _calculate_max_drawdown(self, returns: np.ndarray) -> float:
         """Calculate maximum drawdown"""
-        if not returns:
+        if not returns.size:
             return 0.0
         
-        cumulative_returns = []
-        cumulative = 1.0
+        cumulative_returns = np.cumprod(1 + returns)
+        peaks = np.maximum.accumulate(cumulative_returns)
         
-        for r in returns:
-            cumulative *= (1 + r)
-            cumulative_returns.append(cumulative)
+        drawdowns = np.divide(cumulative_returns - peaks, peaks,
+                              out=np.zeros_like(cumulative_returns), where=peaks > 0)
         
-        peak = cumulative_returns[0]
-        max_drawdown = 0.0
-        
-        for value in cumulative_returns:
-            if value > peak:
-                peak = value
-            else:
-                drawdown = (value - peak) / peak
-                max_drawdown = min(max_drawdown, drawdown)
-        
-        return max_drawdown
+        return float(drawdowns.min())
     
-    async def _calculate_portfolio_turnover(self, portfolio_data: List[PortfolioMetrics]) -> float:
+    async def _calculate_portfolio_turnover(self, allocations: np.ndarray) -> float:
         """Calculate portfolio turnover"""
         # Simplified turnover calculation
-        if len(portfolio_data) < 2:
+        if len(allocations) < 2:
             return 0.0
         
-        # Calculate average change in asset allocation
-        turnover = 0.0
-        for i in range(1, len(portfolio_data)):
-            prev_allocation = portfolio_data[i-1].asset_allocation
-            curr_allocation = portfolio_data[i].asset_allocation
-            
-            # Calculate changes in allocation
-            for asset_class in set(list(prev_allocation.keys()) + list(curr_allocation.keys())):
-                prev_weight = prev_allocation.get(asset_class, 0.0)
-                curr_weight = curr_allocation.get(asset_class, 0.0)
-                turnover += abs(curr_weight - prev_weight)
-        
-        return turnover / (len(portfolio_data) - 1)
+        # Average absolute change in asset allocation between snapshots
+        return float(np.abs(np.diff(allocations, axis=0)).sum() / (len(allocations) - 1))
     
     async def _calculate_expense_ratio(self, portfolio_data: List[PortfolioMetrics]) -> float:
         """Calculate expense ratio"""
@@ -561,13 +665,13 @@ class RiskMetrics:
         
         return "stable"
     
-    async def _calculate_confidence_interval(self, returns: List[float]) -> Tuple[float, float]:
+    async def _calculate_confidence_interval(self, returns: np.ndarray) -> Tuple[float, float]:
         """Calculate confidence interval for returns"""
         if len(returns) < 2:
             return (0.0, 0.0)
         
-        mean_return = statistics.mean(returns)
-        std_return = statistics.stdev(returns)
+        mean_return = float(returns.mean())
+        std_return = float(returns.std(ddof=1))
         
         # 95% confidence interval
         margin = 1.96 * std_return / np.sqrt(len(returns))
@@ -602,19 +706,47 @@ class PerformanceAnalyzer:
     def __init__(self, risk_metrics: RiskMetrics):
         self.risk_metrics = risk_metrics
         self.benchmark_data = {}
-        self.performance_history = []
+        self.performance_history: deque = deque(maxlen=1024)  # Rolling window of recent reports
+        self.portfolio_columns: Optional[_PortfolioColumns] = None
+        self._columns_snapshots: Tuple[PortfolioMetrics, ...] = ()
+        self._report_cache: OrderedDict = OrderedDict()
+        self.report_cache_size = 32
+    
+    def _sync_columns(self, portfolio_data: List[PortfolioMetrics]) -> _PortfolioColumns:
+        """Rebuild the column cache only when the history holds different snapshots"""
+        if self.portfolio_columns is None or not _same_snapshots(self._columns_snapshots, portfolio_data):
+            self.portfolio_columns = _PortfolioColumns.from_list(portfolio_data)
+            self._columns_snapshots = tuple(portfolio_data)
+        
+        return self.portfolio_columns
         
     async def generate_performance_report(self, 
                                         portfolio_data: List[PortfolioMetrics],
                                         start_date: datetime,
                                         end_date: datetime) -> PerformanceReport:
         """Generate comprehensive performance report"""
+        now = datetime.now()
         try:
-            # Calculate all metrics
-            return_metrics = await self.risk_metrics.calculate_return_metrics(portfolio_data)
-            risk_metrics = await self.risk_metrics.calculate_risk_metrics(portfolio_data)
-            performance_metrics = await self.risk_metrics.calculate_performance_metrics(portfolio_data)
-            efficiency_metrics = await self.risk_metrics.calculate_efficiency_metrics(portfolio_data)
+            # Reports are memoized per history object and reused only while it holds the same snapshots
+            cache_key = (id(portfolio_data), start_date, end_date)
+            cached = self._report_cache.get(cache_key)
+            if cached is not None and cached[0] is portfolio_data and _same_snapshots(cached[1], portfolio_data):
+                self._report_cache.move_to_end(cache_key)
+                self.performance_history.append(cached[2])
+                return cached[2]
+            
+            # Extract the columns every suite reads once, up front
+            columns = self._sync_columns(portfolio_data)
+            premiums = columns.total_premium
+            allocations = columns.allocations
+            
+            # Calculate all metrics (suites only read shared state, so run them concurrently)
+            return_metrics, risk_metrics, performance_metrics, efficiency_metrics = await asyncio.gather(
+                self.risk_metrics.calculate_return_metrics(portfolio_data, premiums=premiums),
+                self.risk_metrics.calculate_risk_metrics(portfolio_data, premiums=premiums),
+                self.risk_metrics.calculate_performance_metrics(portfolio_data, premiums=premiums),
+                self.risk_metrics.calculate_efficiency_metrics(portfolio_data, allocations=allocations)
+            )
             
             # Combine all metrics
             all_metrics = []
@@ -624,65 +756,17 @@ class PerformanceAnalyzer:
             all_metrics.extend(efficiency_metrics.values())
             
             # Calculate summary statistics
-            total_return = return_metrics.get('total_return', MetricResult(
-                metric_name="Total Return", metric_type=MetricType.RETURN,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
-            
-            annualized_return = return_metrics.get('annualized_return', MetricResult(
-                metric_name="Annualized Return", metric_type=MetricType.RETURN,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
-            
-            volatility = risk_metrics.get('volatility', MetricResult(
-                metric_name="Volatility", metric_type=MetricType.RISK,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
-            
-            sharpe_ratio = performance_metrics.get('sharpe_ratio', MetricResult(
-                metric_name="Sharpe Ratio", metric_type=MetricType.PERFORMANCE,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
-            
-            sortino_ratio = performance_metrics.get('sortino_ratio', MetricResult(
-                metric_name="Sortino Ratio", metric_type=MetricType.PERFORMANCE,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
-            
-            max_drawdown = risk_metrics.get('max_drawdown', MetricResult(
-                metric_name="Max Drawdown", metric_type=MetricType.RISK,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
-            
-            var_95 = risk_metrics.get('var_95', MetricResult(
-                metric_name="VaR 95%", metric_type=MetricType.RISK,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
-            
-            cvar_95 = risk_metrics.get('cvar_95', MetricResult(
-                metric_name="CVaR 95%", metric_type=MetricType.RISK,
-                value=0.0, benchmark_value=None, percentile_rank=None,
-                historical_average=None, trend="stable",
-                confidence_interval=(0.0, 0.0), calculation_date=datetime.now()
-            )).value
+            total_return = return_metrics.get('total_return', _ZERO_METRIC).value
+            annualized_return = return_metrics.get('annualized_return', _ZERO_METRIC).value
+            volatility = risk_metrics.get('volatility', _ZERO_METRIC).value
+            sharpe_ratio = performance_metrics.get('sharpe_ratio', _ZERO_METRIC).value
+            sortino_ratio = performance_metrics.get('sortino_ratio', _ZERO_METRIC).value
+            max_drawdown = risk_metrics.get('max_drawdown', _ZERO_METRIC).value
+            var_95 = risk_metrics.get('var_95', _ZERO_METRIC).value
+            cvar_95 = risk_metrics.get('cvar_95', _ZERO_METRIC).value
             
             # Calculate additional metrics
-            win_rate = await self._calculate_win_rate(portfolio_data)
-            profit_factor = await self._calculate_profit_factor(portfolio_data)
+            win_rate, profit_factor = self._calculate_win_rate_and_profit_factor(premiums)
             
             report = PerformanceReport(
                 period_start=start_date,
@@ -698,52 +782,54 @@ class PerformanceAnalyzer:
                 var_95=var_95,
                 cvar_95=cvar_95,
                 metrics=all_metrics,
-                timestamp=datetime.now()
+                timestamp=now
             )
             
             self.performance_history.append(report)
             
+            # Keep a reference to the history so its id cannot be reused while cached
+            self._report_cache[cache_key] = (portfolio_data, tuple(portfolio_data), report)
+            if len(self._report_cache) > self.report_cache_size:
+                self._report_cache.popitem(last=False)
+            
             logger.info(f"Generated performance report for period {start_date} to {end_date}")
             return report
             
         except Exception as e:
             logger.error(f"Performance report generation failed: {e}")
-            return PerformanceReport(
-                period_start=start_date,
-                period_end=end_date,
-                total_return=0.0,
-                annualized_return=0.0,
-                volatility=0.0,
-                sharpe_ratio=0.0,
-                sortino_ratio=0.0,
-                max_drawdown=0.0,
-                win_rate=0.0,
-                profit_factor=0.0,
-                var_95=0.0,
-                cvar_95=0.0,
-                metrics=[],
-                timestamp=datetime.now()
-            )
+            return replace(_ZERO_REPORT, period_start=start_date, period_end=end_date, metrics=[], timestamp=now)
     
     async def decompose_risk(self, portfolio_data: List[PortfolioMetrics]) -> RiskDecomposition:
         """Decompose risk into components"""
+        now = datetime.now()
         try:
             if not portfolio_data:
                 raise ValueError("No portfolio data provided")
             
             latest_data = portfolio_data[-1]
+            columns = self._sync_columns(portfolio_data)
             
             # Calculate total risk (simplified)
-            total_risk = latest_data.var_95
+            total_risk = float(columns.var_95[-1])
+            
+            # Cold-start portfolios carry no risk yet; every contribution would be zero
+            if total_risk == 0.0:
+                return replace(
+                    _ZERO_DECOMPOSITION,
+                    asset_class_contributions=dict.fromkeys(latest_data.asset_allocation, 0.0),
+                    geographic_contributions={'domestic': 0.0, 'international': 0.0},
+                    temporal_contributions={'short_term': 0.0, 'medium_term': 0.0, 'long_term': 0.0},
+                    correlation_contributions={},
+                    timestamp=now
+                )
             
             # Decompose into systematic and idiosyncratic risk
             systematic_risk = total_risk * 0.7  # 70% systematic
             idiosyncratic_risk = total_risk * 0.3  # 30% idiosyncratic
             
             # Asset class contributions
-            asset_class_contributions = {}
-            for asset_class, weight in latest_data.asset_allocation.items():
-                asset_class_contributions[asset_class] = total_risk * weight
+            names, weights = latest_data.ordered_allocation
+            asset_class_contributions = dict(zip(names, (total_risk * weights).tolist()))
             
             # Geographic contributions (simplified)
             geographic_contributions = {
@@ -758,14 +844,15 @@ class PerformanceAnalyzer:
                 'long_term': total_risk * 0.2
             }
             
-            # Correlation contributions
-            correlation_contributions = {}
-            for i, (asset1, weight1) in enumerate(latest_data.asset_allocation.items()):
-                for j, (asset2, weight2) in enumerate(latest_data.asset_allocation.items()):
-                    if i < j:  # Avoid double counting
-                        correlation = latest_data.correlation_matrix.get(asset1, {}).get(asset2, 0.0)
-                        contribution = 2 * weight1 * weight2 * correlation * total_risk
-                        correlation_contributions[f"{asset1}-{asset2}"] = contribution
+            # Correlation contributions: 2 * w_i * w_j * rho_ij * total_risk over the upper triangle
+            assets, correlations = latest_data.corr_array
+            contributions = _correlation_contributions(weights, correlations, total_risk)
+            
+            rows, cols = np.triu_indices(len(assets), k=1)  # Avoid double counting
+            correlation_contributions = {
+                f"{assets[i]}-{assets[j]}": contribution
+                for i, j, contribution in zip(rows.tolist(), cols.tolist(), contributions.tolist())
+            }
             
             return RiskDecomposition(
                 total_risk=total_risk,
@@ -775,20 +862,18 @@ class PerformanceAnalyzer:
                 geographic_contributions=geographic_contributions,
                 temporal_contributions=temporal_contributions,
                 correlation_contributions=correlation_contributions,
-                timestamp=datetime.now()
+                timestamp=now
             )
             
         except Exception as e:
             logger.error(f"Risk decomposition failed: {e}")
-            return RiskDecomposition(
-                total_risk=0.0,
-                systematic_risk=0.0,
-                idiosyncratic_risk=0.0,
+            return replace(
+                _ZERO_DECOMPOSITION,
                 asset_class_contributions={},
                 geographic_contributions={},
                 temporal_contributions={},
                 correlation_contributions={},
-                timestamp=datetime.now()
+                timestamp=now
             )
     
     async def run_stress_test(self, 
@@ -801,31 +886,32 @@ class PerformanceAnalyzer:
             if not portfolio_data:
                 return results
             
-            baseline_metrics = portfolio_data[-1]
+            baseline_var = float(self._sync_columns(portfolio_data).var_95[-1])
+            now = datetime.now()
             
-            for scenario in stress_scenarios:
-                scenario_name = scenario.get('name', 'Unknown Scenario')
-                scenario_description = scenario.get('description', '')
-                stress_factor = scenario.get('stress_factor', 1.5)
-                
-                # Apply stress to key metrics
-                baseline_var = baseline_metrics.var_95
-                stressed_var = baseline_var * stress_factor
-                
-                impact_percentage = (stressed_var - baseline_var) / baseline_var * 100
-                
-                # Estimate recovery time
-                recovery_time = await self._estimate_recovery_time(scenario, impact_percentage)
-                
+            # Apply every scenario's stress factor in one pass; (stressed - baseline) / baseline == factor - 1
+            factors = np.fromiter(
+                (scenario.get('stress_factor', 1.5) for scenario in stress_scenarios),
+                dtype=np.float64, count=len(stress_scenarios)
+            )
+            stressed_values = (baseline_var * factors).tolist()
+            impacts = (factors - 1.0) * 100.0
+            
+            # Estimate recovery times for the whole batch
+            recovery_times = self._estimate_recovery_times(impacts)
+            
+            for scenario, stressed_var, impact_percentage, recovery_time in zip(
+                stress_scenarios, stressed_values, impacts.tolist(), recovery_times
+            ):
                 result = StressTestResult(
-                    scenario_name=scenario_name,
-                    scenario_description=scenario_description,
+                    scenario_name=scenario.get('name', 'Unknown Scenario'),
+                    scenario_description=scenario.get('description', ''),
                     baseline_value=baseline_var,
                     stressed_value=stressed_var,
                     impact_percentage=impact_percentage,
                     recovery_time_days=recovery_time,
                     confidence_level=scenario.get('confidence_level', 0.95),
-                    timestamp=datetime.now()
+                    timestamp=now
                 )
                 
                 results.append(result)
@@ -837,63 +923,43 @@ class PerformanceAnalyzer:
             logger.error(f"Stress testing failed: {e}")
             return []
     
-    async def _calculate_win_rate(self, portfolio_data: List[PortfolioMetrics]) -> float:
-        """Calculate win rate (percentage of positive returns)"""
-        if len(portfolio_data) < 2:
-            return 0.0
+    def _calculate_win_rate_and_profit_factor(self, premiums: np.ndarray) -> Tuple[float, float]:
+        """Calculate win rate (share of positive changes) and profit factor (gains / losses) in one pass"""
+        if len(premiums) < 2:
+            return 0.0, 1.0
         
-        positive_periods = 0
-        total_periods = len(portfolio_data) - 1
+        changes = np.diff(premiums)
+        wins = changes > 0
+        gains = changes[wins].sum()
+        losses = -changes[changes < 0].sum()
         
-        for i in range(1, len(portfolio_data)):
-            if portfolio_data[i].total_premium > portfolio_data[i-1].total_premium:
-                positive_periods += 1
-        
-        return positive_periods / total_periods if total_periods > 0 else 0.0
+        win_rate = float(wins.sum()) / changes.size
+        profit_factor = float(gains / losses) if losses > 0 else float('inf')
+        return win_rate, profit_factor
     
-    async def _calculate_profit_factor(self, portfolio_data: List[PortfolioMetrics]) -> float:
-        """Calculate profit factor (ratio of gains to losses)"""
-        if len(portfolio_data) < 2:
-            return 1.0
-        
-        gains = 0.0
-        losses = 0.0
-        
-        for i in range(1, len(portfolio_data)):
-            change = portfolio_data[i].total_premium - portfolio_data[i-1].total_premium
-            if change > 0:
-                gains += change
-            else:
-                losses += abs(change)
-        
-        return gains / losses if losses > 0 else float('inf')
-    
-    async def _estimate_recovery_time(self, scenario: Dict[str, Any], impact_percentage: float) -> int:
-        """Estimate recovery time in days"""
+    def _estimate_recovery_times(self, impact_percentages: np.ndarray) -> List[int]:
+        """Estimate recovery time in days for each impact percentage"""
         # Simple heuristic based on impact severity
-        if impact_percentage < 5:
-            return 30  # 1 month
-        elif impact_percentage < 15:
-            return 90  # 3 months
-        elif impact_percentage < 30:
-            return 180  # 6 months
-        else:
-            return 365  # 1 year
+        return [_RECOVERY_DAYS[i] for i in np.searchsorted(_RECOVERY_BUCKETS, impact_percentages, side='right').tolist()]
     
     async def compare_to_benchmark(self, 
                                  portfolio_data: List[PortfolioMetrics],
-                                 benchmark_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                 benchmark_data: List[Dict[str, Any]],
+                                 *,
+                                 precomputed_report: Optional[PerformanceReport] = None) -> Dict[str, Any]:
         """Compare portfolio performance to benchmark"""
         try:
             if not portfolio_data or not benchmark_data:
                 return {}
             
-            # Calculate portfolio metrics
-            portfolio_report = await self.generate_performance_report(
-                portfolio_data, 
-                portfolio_data[0].timestamp, 
-                portfolio_data[-1].timestamp
-            )
+            # Calculate portfolio metrics, unless the caller already has a report for this history
+            portfolio_report = precomputed_report
+            if portfolio_report is None:
+                portfolio_report = await self.generate_performance_report(
+                    portfolio_data, 
+                    portfolio_data[0].timestamp, 
+                    portfolio_data[-1].timestamp
+                )
             
             # Calculate benchmark metrics (simplified)
             benchmark_return = 0.05  # 5% benchmark return
@@ -943,17 +1009,18 @@ class PerformanceAnalyzer:
                 'sharpe_ratio': latest_report.sharpe_ratio,
                 'max_drawdown': latest_report.max_drawdown
             },
-            'performance_trend': await self._analyze_performance_trend(),
+            'performance_trend': self._analyze_performance_trend(),
             'total_reports': len(self.performance_history),
             'last_updated': latest_report.timestamp.isoformat()
         }
     
-    async def _analyze_performance_trend(self) -> str:
+    def _analyze_performance_trend(self) -> str:
         """Analyze performance trend"""
         if len(self.performance_history) < 2:
             return "insufficient_data"
         
-        recent_returns = [report.total_return for report in self.performance_history[-5:]]
+        # Walk from the right so the lookup stays O(1) regardless of history length
+        recent_returns = [report.total_return for report in islice(reversed(self.performance_history), 5)][::-1]
         
         if len(recent_returns) >= 2:
             if recent_returns[-1] > recent_returns[-2]:
@@ -965,54 +1032,63 @@ class PerformanceAnalyzer:
 
 
 # Utility functions
-async def create_risk_metrics() -> RiskMetrics:
+def create_risk_metrics() -> RiskMetrics:
     """Create a risk metrics instance"""
     return RiskMetrics()
 
 
-async def create_performance_analyzer(risk_metrics: RiskMetrics) -> PerformanceAnalyzer:
+def create_performance_analyzer(risk_metrics: RiskMetrics) -> PerformanceAnalyzer:
     """Create a performance analyzer instance"""
     return PerformanceAnalyzer(risk_metrics)
 
 
-async def calculate_portfolio_beta(portfolio_returns: List[float], 
-                                 market_returns: List[float]) -> float:
+def _beta_sync(portfolio: np.ndarray, market: np.ndarray) -> float:
+    """Beta of two equal-length float64 return arrays"""
+    # beta = cov(p, m) / var(m); both share the same normalisation, so it cancels
+    market_centered = market - market.mean()
+    market_variance = float(market_centered @ market_centered)
+    
+    return float((portfolio - portfolio.mean()) @ market_centered) / market_variance if market_variance > 0 else 1.0
+
+
+def calculate_portfolio_beta(portfolio_returns: List[float], 
+                           market_returns: List[float]) -> float:
     """Calculate portfolio beta"""
     if len(portfolio_returns) != len(market_returns) or len(portfolio_returns) < 2:
         return 1.0
     
-    covariance = np.cov(portfolio_returns, market_returns)[0][1]
-    market_variance = np.var(market_returns)
-    
-    return covariance / market_variance if market_variance > 0 else 1.0
+    return _beta_sync(np.asarray(portfolio_returns, dtype=np.float64), np.asarray(market_returns, dtype=np.float64))
 
 
-async def calculate_jensen_alpha(portfolio_returns: List[float],
-                               market_returns: List[float],
-                               risk_free_rate: float = 0.02) -> float:
+def calculate_jensen_alpha(portfolio_returns: List[float],
+                         market_returns: List[float],
+                         risk_free_rate: float = 0.02) -> float:
     """Calculate Jensen's alpha"""
     if len(portfolio_returns) != len(market_returns) or len(portfolio_returns) < 2:
         return 0.0
     
-    beta = await calculate_portfolio_beta(portfolio_returns, market_returns)
+    portfolio = np.asarray(portfolio_returns, dtype=np.float64)
+    market = np.asarray(market_returns, dtype=np.float64)
     
-    portfolio_return = statistics.mean(portfolio_returns)
-    market_return = statistics.mean(market_returns)
+    beta = _beta_sync(portfolio, market)
     
-    expected_return = risk_free_rate + beta * (market_return - risk_free_rate)
-    alpha = portfolio_return - expected_return
+    expected_return = risk_free_rate + beta * (float(market.mean()) - risk_free_rate)
+    alpha = float(portfolio.mean()) - expected_return
     
     return alpha
 
 
-async def calculate_treynor_ratio(portfolio_returns: List[float],
-                                market_returns: List[float],
-                                risk_free_rate: float = 0.02) -> float:
+def calculate_treynor_ratio(portfolio_returns: List[float],
+                          market_returns: List[float],
+                          risk_free_rate: float = 0.02) -> float:
     """Calculate Treynor ratio"""
     if len(portfolio_returns) != len(market_returns) or len(portfolio_returns) < 2:
         return 0.0
     
-    beta = await calculate_portfolio_beta(portfolio_returns, market_returns)
-    portfolio_return = statistics.mean(portfolio_returns)
+    portfolio = np.asarray(portfolio_returns, dtype=np.float64)
+    market = np.asarray(market_returns, dtype=np.float64)
+    
+    beta = _beta_sync(portfolio, market)
+    portfolio_return = float(portfolio.mean())
     
-    return (portfolio_return - risk_free_rate) / beta if beta > 0 else 0.0
\ No newline at end of file
+    return (portfolio_return - risk_free_rate) / beta if beta > 0 else 0.0
@@ -11,26 +11,61 @@ import asyncio
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 import json
 import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ML libraries
 try:
     import torch
     import torch.nn as nn
+    from torch.utils.data import DataLoader, TensorDataset
     from sklearn.ensemble import RandomForestClassifier, IsolationForest
     from sklearn.preprocessing import StandardScaler
     from sklearn.metrics import accuracy_score, precision_score, recall_score
     import xgboost as xgb
+    import joblib
     ML_AVAILABLE = True
 except ImportError:
     ML_AVAILABLE = False
     logging.warning("ML libraries not available. Using mock implementations.")
 
+# GPU forest inference (optional)
+try:
+    from cuml import ForestInference
+    FIL_AVAILABLE = True
+except ImportError:
+    FIL_AVAILABLE = False
+
+# TensorRT engines for GPU LSTM inference (optional)
+try:
+    import tensorrt as trt
+    TENSORRT_AVAILABLE = True
+except ImportError:
+    TENSORRT_AVAILABLE = False
+
+# JIT-compiled feature assembly (optional)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Native-code tree compilation for CPU-only hosts (optional)
+try:
+    import treelite
+    import tl2cgen
+    COMPILED_TREES_AVAILABLE = True
+except ImportError:
+    COMPILED_TREES_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,7 +77,27 @@ class RiskLevel(Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Class index -> risk level, in the label order the classifiers are trained on
+_RISK_LEVELS = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+_LEVEL_IDX = {level: i for i, level in enumerate(_RISK_LEVELS)}
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _assemble_and_scale(indices, values, mean, inv_std, out):
+        """Scatter values into out at indices (-1 = unknown feature) and standardise; missing features are 0"""
+        for i in range(out.shape[0]):
+            out[i] = -mean[i] * inv_std[i]
+        for k in range(indices.shape[0]):
+            i = indices[k]
+            if i >= 0:
+                out[i] = (values[k] - mean[i]) * inv_std[i]
+
+
+# sklearn/torch release the GIL in their native kernels, so model calls can run side by side in threads
+_MODEL_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="risk-model")
+
+
+@dataclass(slots=True)
 class RiskPrediction:
     """Risk prediction result"""
     risk_level: RiskLevel
@@ -53,7 +108,7 @@ class RiskPrediction:
     model_version: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeSeriesData:
     """Time series data structure"""
     timestamp: datetime
@@ -61,7 +116,38 @@ class TimeSeriesData:
     metadata: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
+class TimeSeriesBatch:
+    """Columnar time series: one timestamp array and an (N, F) value matrix"""
+    timestamps: np.ndarray  # datetime64[ns], shape (N,)
+    values: np.ndarray  # float64, shape (N, F)
+    feature_names: List[str]
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @classmethod
+    def from_records(cls, records: List[TimeSeriesData]) -> 'TimeSeriesBatch':
+        """Pack per-timestamp records into columns; features missing from a record are 0"""
+        columns: Dict[str, int] = {}
+        for record in records:
+            for name in record.values:
+                columns.setdefault(name, len(columns))
+        
+        values = np.zeros((len(records), len(columns)), dtype=np.float64)
+        for i, record in enumerate(records):
+            for name, value in record.values.items():
+                values[i, columns[name]] = value
+        
+        timestamps = np.array([record.timestamp for record in records], dtype='datetime64[ns]')
+        return cls(timestamps=timestamps, values=values, feature_names=list(columns))
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Frame indexed by timestamp with one column per feature"""
+        return pd.DataFrame(self.values, index=pd.DatetimeIndex(self.timestamps), columns=self.feature_names)
+
+
+@dataclass(slots=True)
 class AnomalyResult:
     """Anomaly detection result"""
     is_anomaly: bool
@@ -82,8 +168,64 @@ class RiskAssessmentModel:
         self.model = None
         self.feature_names = []
         self.training_history = []
+        self._feature_index: Dict[str, int] = {}
+        self._feat_buf = np.zeros((1, 0), dtype=np.float32)
+        self._pool = _MODEL_POOL
+        self._lock = threading.Lock()  # Guards lazily built state shared by pool threads
+        self._mean = None
+        self._inv_std = None
+        self._row_keys: Optional[Tuple[str, ...]] = None  # Key order of the last feature dict seen by _scaled_row
+        self._row_indices = np.empty(0, dtype=np.int64)
+    
+    def _cache_scaler_params(self):
+        """Snapshot the fitted scaler's statistics as float32 vectors for _scale"""
+        self._mean = self.scaler.mean_.astype(np.float32)
+        self._inv_std = (1.0 / self.scaler.scale_).astype(np.float32)
+    
+    def _scale(self, features: np.ndarray) -> np.ndarray:
+        """Standardise features into a new float32 array, bypassing sklearn's per-call validation"""
+        scaled = np.subtract(features, self._mean, dtype=np.float32)
+        scaled *= self._inv_std
+        return scaled
+    
+    async def _run_in_pool(self, fn, *args):
+        """Run a CPU-bound model call on the model's thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+    
+    def _set_feature_names(self, feature_names: List[str]):
+        """Set the feature order and rebuild the name -> column lookup"""
+        self.feature_names = feature_names
+        self._feature_index = {name: i for i, name in enumerate(feature_names)}
+        self._feat_buf = np.zeros((1, len(feature_names)), dtype=np.float32)  # Models consume float32 anyway
+        self._row_keys = None
+    
+    def _feature_row(self, features: Dict[str, float]) -> np.ndarray:
+        """Scatter a feature dict into the reusable (1, n_features) buffer; missing features are 0"""
+        buf = self._feat_buf
+        buf.fill(0.0)
+        index = self._feature_index
+        for name, value in features.items():
+            i = index.get(name)
+            if i is not None:
+                buf[0, i] = value
+        return buf
+    
+    def _scaled_row(self, features: Dict[str, float]) -> np.ndarray:
+        """Assemble and standardise a feature dict into a new (1, n_features) float32 row"""
+        if not NUMBA_AVAILABLE:
+            return self._scale(self._feature_row(features))
         
-    async def train(self, data: pd.DataFrame, target: str) -> Dict[str, Any]:
+        # Callers usually send dicts with the same keys in the same order, so the column lookup is reused
+        keys = tuple(features)
+        if keys != self._row_keys:
+            self._row_indices = np.array([self._feature_index.get(name, -1) for name in keys], dtype=np.int64)
+            self._row_keys = keys
+        values = np.fromiter(features.values(), dtype=np.float64, count=len(keys))
+        row = np.empty((1, len(self.feature_names)), dtype=np.float32)
+        _assemble_and_scale(self._row_indices, values, self._mean, self._inv_std, row[0])
+        return row
+        
+    async def train(self, data: Union[pd.DataFrame, TimeSeriesBatch], target: str) -> Dict[str, Any]:
         """Train the risk assessment model"""
         try:
             if not ML_AVAILABLE:
@@ -97,15 +239,23 @@ class RiskAssessmentModel:
                 }
             
             # Prepare features
-            features = data.drop(columns=[target])
-            labels = data[target]
-            self.feature_names = features.columns.tolist()
+            if isinstance(data, TimeSeriesBatch):
+                # Columnar input goes straight to the scaler without building a DataFrame
+                target_idx = data.feature_names.index(target)
+                features = np.delete(data.values, target_idx, axis=1)
+                labels = data.values[:, target_idx].astype(np.int64)
+                self._set_feature_names([name for name in data.feature_names if name != target])
+            else:
+                features = data.drop(columns=[target])
+                labels = data[target]
+                self._set_feature_names(features.columns.tolist())
             
             # Scale features
             features_scaled = self.scaler.fit_transform(features)
+            self._cache_scaler_params()
             
             # Train model (implementation depends on specific model type)
-            await self._train_model(features_scaled, labels)
+            await self._run_in_pool(self._train_model, features_scaled, labels)
             
             self.is_trained = True
             
@@ -131,7 +281,7 @@ class RiskAssessmentModel:
                 "error": str(e)
             }
     
-    async def _train_model(self, features: np.ndarray, labels: np.ndarray):
+    def _train_model(self, features: np.ndarray, labels: np.ndarray):
         """Override this method in subclasses"""
         raise NotImplementedError("Subclasses must implement _train_model")
     
@@ -152,13 +302,11 @@ class RiskAssessmentModel:
                     model_version=self.model_version
                 )
             
-            # Prepare features
-            feature_values = [features.get(name, 0.0) for name in self.feature_names]
-            feature_array = np.array(feature_values).reshape(1, -1)
-            feature_scaled = self.scaler.transform(feature_array)
+            # Prepare features into a fresh row that the pool thread can own
+            feature_scaled = self._scaled_row(features)
             
             # Make prediction
-            prediction_result = await self._predict_model(feature_scaled)
+            prediction_result = await self._run_in_pool(self._predict_model, feature_scaled)
             
             return RiskPrediction(
                 risk_level=prediction_result["risk_level"],
@@ -181,10 +329,18 @@ class RiskAssessmentModel:
                 model_version=self.model_version
             )
     
-    async def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
+    def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
         """Override this method in subclasses"""
         raise NotImplementedError("Subclasses must implement _predict_model")
     
+    def _predict_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict class indices and their probabilities for a scaled feature matrix"""
+        # Row-by-row fallback; subclasses override with a single batched call
+        results = [self._predict_model(features[i:i + 1]) for i in range(len(features))]
+        classes = np.array([_RISK_LEVELS.index(result["risk_level"]) for result in results], dtype=np.int64)
+        probabilities = np.array([result["probability"] for result in results], dtype=np.float64)
+        return classes, probabilities
+    
     async def evaluate(self, test_data: pd.DataFrame, target: str) -> Dict[str, float]:
         """Evaluate model performance"""
         if not self.is_trained:
@@ -201,17 +357,13 @@ class RiskAssessmentModel:
                 }
             
             # Prepare test data
-            features = test_data.drop(columns=[target])
+            features = test_data[self.feature_names].to_numpy(dtype=np.float32)
             labels = test_data[target]
-            features_scaled = self.scaler.transform(features)
+            features_scaled = self._scale(features)
             
-            # Make predictions
-            predictions = []
-            for i in range(len(features_scaled)):
-                feature_dict = {name: features_scaled[i][j] 
-                              for j, name in enumerate(self.feature_names)}
-                pred = await self.predict(feature_dict)
-                predictions.append(pred.risk_level.value)
+            # Make predictions for the whole test set in one batch
+            classes, _ = await self._run_in_pool(self._predict_batch, features_scaled)
+            predictions = [_RISK_LEVELS[i].value for i in classes.tolist()]
             
             # Calculate metrics
             accuracy = accuracy_score(labels, predictions)
@@ -241,13 +393,21 @@ class RiskAssessmentModel:
 class TimeSeriesPredictor(RiskAssessmentModel):
     """Time series prediction model using LSTM/Transformer"""
     
-    def __init__(self, sequence_length: int = 30, hidden_size: int = 64):
+    def __init__(self, sequence_length: int = 30, hidden_size: int = 64, precision: str = "int8",
+                 batch_size: int = 256):
         super().__init__("TimeSeriesPredictor", "1.0.0")
         self.sequence_length = sequence_length
         self.hidden_size = hidden_size
+        self.batch_size = batch_size
+        self.precision = precision  # "int8" (dynamic quantization on CPU) or "fp32"
+        self.quantized = False
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu') if ML_AVAILABLE else None
+        self._trt_engine = None
+        self._trt_context = None
+        self._pinned = None  # Reusable pinned (1, sequence_length, F) input buffer on CUDA
+        self._stream = None
         
-    async def _train_model(self, features: np.ndarray, labels: np.ndarray):
+    def _train_model(self, features: np.ndarray, labels: np.ndarray):
         """Train LSTM model for time series prediction"""
         if not ML_AVAILABLE:
             return
@@ -264,30 +424,147 @@ class TimeSeriesPredictor(RiskAssessmentModel):
         criterion = nn.CrossEntropyLoss()
         optimizer = torch.optim.Adam(self.model.parameters(), lr=0.001)
         
+        # Windows already live on the training device, so the loader only shuffles and slices them
+        loader = DataLoader(TensorDataset(X_train, y_train), batch_size=self.batch_size, shuffle=True)
+        use_amp = self.device.type == "cuda"
+        
         self.model.train()
         for epoch in range(100):  # Simple training loop
-            optimizer.zero_grad()
-            outputs = self.model(X_train)
-            loss = criterion(outputs, y_train)
-            loss.backward()
-            optimizer.step()
+            epoch_loss = 0.0
+            for X_batch, y_batch in loader:
+                optimizer.zero_grad()
+                # BF16 autocast keeps FP32's exponent range, so no gradient scaling is needed
+                with torch.autocast(device_type=self.device.type, dtype=torch.bfloat16, enabled=use_amp):
+                    outputs = self.model(X_batch)
+                    loss = criterion(outputs, y_batch)
+                loss.backward()
+                optimizer.step()
+                epoch_loss += loss.item() * len(X_batch)
             
             if epoch % 20 == 0:
-                logger.info(f"Epoch {epoch}, Loss: {loss.item():.4f}")
+                logger.info(f"Epoch {epoch}, Loss: {epoch_loss / max(1, len(X_train)):.4f}")
+        
+        self.quantized = False
+        self._quantize_model()
+        self._freeze_model()
+    
+    def _quantize_model(self):
+        """Dynamically quantize LSTM and linear weights to INT8 for CPU inference"""
+        if self.precision != "int8" or self.device.type != "cpu":
+            return
+        
+        try:
+            self.model = quantize_lstm_model(self.model)
+            self.quantized = True
+        except Exception as e:
+            logger.warning(f"INT8 quantization failed, keeping FP32 weights: {e}")
+    
+    def _freeze_model(self):
+        """Script and freeze the trained model for inference without Python dispatch"""
+        try:
+            self.model = torch.jit.freeze(torch.jit.script(self.model.eval()))
+        except Exception as e:
+            logger.warning(f"TorchScript freezing failed, keeping eager model: {e}")
+    
+    def export_trt(self, path: str, precision: str = "bf16") -> Optional[str]:
+        """Export the trained LSTM to ONNX and build a TensorRT engine from it"""
+        if not TENSORRT_AVAILABLE or self.device is None or self.device.type != "cuda" or self.quantized:
+            logger.warning("TensorRT export requires tensorrt, a CUDA device and FP32 weights")
+            return None
+        
+        try:
+            onnx_path, engine_path = f"{path}.onnx", f"{path}.engine"
+            input_shape = (self.sequence_length, len(self.feature_names))
+            
+            self.model.eval()
+            torch.onnx.export(
+                self.model,
+                torch.zeros((1, *input_shape), device=self.device),
+                onnx_path,
+                opset_version=17,
+                input_names=["features"],
+                output_names=["logits"],
+                dynamic_axes={"features": {0: "batch"}, "logits": {0: "batch"}},
+                dynamo=False
+            )
+            
+            trt_logger = trt.Logger(trt.Logger.WARNING)
+            builder = trt.Builder(trt_logger)
+            network = builder.create_network(0)
+            parser = trt.OnnxParser(network, trt_logger)
+            if not parser.parse_from_file(onnx_path):
+                raise RuntimeError(parser.get_error(0))
+            
+            config = builder.create_builder_config()
+            config.set_flag(trt.BuilderFlag.BF16 if precision == "bf16" else trt.BuilderFlag.FP16)
+            profile = builder.create_optimization_profile()
+            profile.set_shape("features", (1, *input_shape), (64, *input_shape), (1024, *input_shape))
+            config.add_optimization_profile(profile)
+            
+            serialized_engine = builder.build_serialized_network(network, config)
+            if serialized_engine is None:
+                raise RuntimeError("TensorRT engine build failed")
+            
+            with open(engine_path, "wb") as f:
+                f.write(serialized_engine)
+            
+            self._load_trt_engine(engine_path)
+            logger.info(f"TensorRT engine built: {engine_path}")
+            return engine_path
+            
+        except Exception as e:
+            logger.error(f"TensorRT export failed: {e}")
+            return None
+    
+    def _load_trt_engine(self, engine_path: str):
+        """Deserialize a TensorRT engine and create its execution context"""
+        runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        with open(engine_path, "rb") as f:
+            self._trt_engine = runtime.deserialize_cuda_engine(f.read())
+        self._trt_context = self._trt_engine.create_execution_context()
+    
+    def _forward(self, X: torch.Tensor) -> torch.Tensor:
+        """Run the LSTM, through the TensorRT engine when one is loaded"""
+        if self._trt_context is None:
+            # Eager/TorchScript path: BF16 matmuls on GPU, FP32 on CPU
+            with torch.autocast(device_type=self.device.type, dtype=torch.bfloat16, enabled=self.device.type == "cuda"):
+                return self.model(X).float()
+        
+        X = X.contiguous()
+        logits = torch.empty((X.shape[0], len(_RISK_LEVELS)), device=self.device, dtype=torch.float32)
+        self._trt_context.set_input_shape("features", tuple(X.shape))
+        self._trt_context.set_tensor_address("features", X.data_ptr())
+        self._trt_context.set_tensor_address("logits", logits.data_ptr())
+        
+        stream = torch.cuda.current_stream(self.device)
+        self._trt_context.execute_async_v3(stream.cuda_stream)
+        stream.synchronize()
+        return logits
     
     def _prepare_sequences(self, features: np.ndarray, labels: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor]:
         """Prepare sequences for LSTM training"""
         if not ML_AVAILABLE:
             return None, None
         
-        X, y = [], []
-        for i in range(len(features) - self.sequence_length):
-            X.append(features[i:i+self.sequence_length])
-            y.append(labels[i+self.sequence_length])
+        features = np.asarray(features, dtype=np.float32)
+        n_sequences = max(0, len(features) - self.sequence_length)
+        
+        # Window i covers rows [i, i + sequence_length) and is labelled by the row that follows it
+        if n_sequences:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                features, (self.sequence_length, features.shape[1])
+            )[:n_sequences, 0]
+        else:
+            windows = np.empty((0, self.sequence_length, features.shape[1]), dtype=np.float32)
+        X = torch.from_numpy(np.ascontiguousarray(windows))
+        y = torch.from_numpy(np.asarray(labels, dtype=np.int64)[self.sequence_length:self.sequence_length + n_sequences])
         
-        return torch.FloatTensor(X).to(self.device), torch.LongTensor(y).to(self.device)
+        if self.device.type == "cuda":
+            # One pinned, contiguous host block lets the copy to the GPU run asynchronously
+            return X.pin_memory().to(self.device, non_blocking=True), y.pin_memory().to(self.device, non_blocking=True)
+        return X, y
     
-    async def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
+    def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
         """Make prediction using trained LSTM model"""
         if not ML_AVAILABLE:
             return {
@@ -299,40 +576,152 @@ class TimeSeriesPredictor(RiskAssessmentModel):
         # Use last sequence_length points for prediction
         if len(features) < self.sequence_length:
             # Pad with zeros if not enough data
-            padded_features = np.zeros((self.sequence_length, features.shape[1]))
+            padded_features = np.zeros((self.sequence_length, features.shape[1]), dtype=np.float32)
             padded_features[-len(features):] = features
             features = padded_features
         else:
             features = features[-self.sequence_length:]
         
-        X = torch.FloatTensor(features).unsqueeze(0).to(self.device)
-        
         self.model.eval()
         with torch.no_grad():
-            outputs = self.model(X)
-            probabilities = torch.softmax(outputs, dim=1)
-            predicted_class = torch.argmax(probabilities, dim=1).item()
-            confidence = torch.max(probabilities).item()
+            if self.device.type == "cuda":
+                with self._lock:  # One pinned buffer and stream per model
+                    if self._pinned is None or self._pinned.shape[2] != features.shape[1]:
+                        self._pinned = torch.empty((1, self.sequence_length, features.shape[1]), pin_memory=True)
+                        self._stream = torch.cuda.Stream(self.device)
+                    np.copyto(self._pinned.numpy()[0], features)
+                    # Copy and compute on a dedicated stream; the single readback below synchronises it
+                    with torch.cuda.stream(self._stream):
+                        X = self._pinned.to(self.device, non_blocking=True)
+                        probabilities = torch.softmax(self._forward(X), dim=1)[0].cpu().numpy()
+            else:
+                X = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32)).unsqueeze(0)
+                probabilities = torch.softmax(self._forward(X), dim=1)[0].numpy()
         
-        risk_levels = [RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL]
+        predicted_class = int(probabilities.argmax())
+        confidence = float(probabilities[predicted_class])
         
         return {
-            "risk_level": risk_levels[predicted_class],
-            "probability": probabilities[0][predicted_class].item(),
+            "risk_level": _RISK_LEVELS[predicted_class],
+            "probability": confidence,
             "confidence": confidence
         }
+    
+    def _predict_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Classify each row as the latest step of a zero-padded sequence, in one forward pass"""
+        sequences = np.zeros((len(features), self.sequence_length, features.shape[1]), dtype=np.float32)
+        sequences[:, -1, :] = features
+        X = torch.as_tensor(sequences, device=self.device)
+        
+        self.model.eval()
+        with torch.no_grad():
+            probabilities = torch.softmax(self._forward(X), dim=1)
+            confidence, predicted = probabilities.max(dim=1)
+        
+        return predicted.cpu().numpy(), confidence.cpu().numpy().astype(np.float64)
+    
+    async def predict_series(self, batch: TimeSeriesBatch) -> RiskPrediction:
+        """Predict from the most recent sequence_length rows of a columnar series"""
+        if not self.is_trained:
+            raise ValueError(f"Model {self.model_name} is not trained")
+        
+        recent = batch.values[-self.sequence_length:]
+        factors = dict(zip(batch.feature_names, recent[-1].tolist())) if len(recent) else {}
+        
+        try:
+            if not ML_AVAILABLE:
+                return RiskPrediction(
+                    risk_level=RiskLevel.MEDIUM,
+                    probability=0.5,
+                    confidence=0.8,
+                    factors=factors,
+                    timestamp=datetime.now(),
+                    model_version=self.model_version
+                )
+            
+            # Align the batch's columns to the training feature order; unknown columns are dropped
+            window = np.zeros((len(recent), len(self.feature_names)), dtype=np.float32)
+            for j, name in enumerate(batch.feature_names):
+                i = self._feature_index.get(name)
+                if i is not None:
+                    window[:, i] = recent[:, j]
+            
+            prediction_result = await self._run_in_pool(self._predict_model, self._scale(window))
+            
+            return RiskPrediction(
+                risk_level=prediction_result["risk_level"],
+                probability=prediction_result["probability"],
+                confidence=prediction_result["confidence"],
+                factors=factors,
+                timestamp=datetime.now(),
+                model_version=self.model_version
+            )
+            
+        except Exception as e:
+            logger.error(f"Series prediction failed for {self.model_name}: {e}")
+            return RiskPrediction(
+                risk_level=RiskLevel.MEDIUM,
+                probability=0.5,
+                confidence=0.0,
+                factors=factors,
+                timestamp=datetime.now(),
+                model_version=self.model_version
+            )
+
+
+@dataclass
+class _CompiledForest:
+    """Compiled tree predictor and the temporary directory holding its shared library"""
+    predictor: Any
+    workdir: tempfile.TemporaryDirectory
+    
+    def predict(self, dmatrix) -> np.ndarray:
+        """Run the compiled forest on a tl2cgen DMatrix"""
+        return self.predictor.predict(dmatrix)
+    
+    def close(self):
+        """Remove the library directory; an already-loaded library stays mapped"""
+        self.workdir.cleanup()
+
+
+def _compile_forest(treelite_model, prefix: str, n_trees: int) -> _CompiledForest:
+    """Compile a Treelite model with gcc into a temporary shared library and load it"""
+    workdir = tempfile.TemporaryDirectory(prefix=prefix)
+    try:
+        libpath = Path(workdir.name) / "forest.so"
+        tl2cgen.export_lib(
+            treelite_model,
+            toolchain="gcc",
+            libpath=str(libpath),
+            params={"parallel_comp": max(1, n_trees // 25)}
+        )
+        return _CompiledForest(tl2cgen.Predictor(str(libpath)), workdir)
+    except Exception:
+        workdir.cleanup()
+        raise
+
+
+def _release_compiled(compiled: Optional[_CompiledForest]) -> None:
+    """Delete a superseded compiled forest's library directory"""
+    if compiled is not None:
+        compiled.close()
 
 
 class RandomForestRiskClassifier(RiskAssessmentModel):
     """Random Forest risk classification model"""
     
-    def __init__(self, n_estimators: int = 100, max_depth: int = 10):
+    def __init__(self, n_estimators: int = 100, max_depth: int = 10,
+                 use_fil: bool = True, use_compiled: bool = True):
         super().__init__("RandomForestRiskClassifier", "1.0.0")
         self.n_estimators = n_estimators
         self.max_depth = max_depth
+        self.use_fil = use_fil and FIL_AVAILABLE
+        self.use_compiled = use_compiled and COMPILED_TREES_AVAILABLE
+        self._fil = None
+        self._compiled = None
         
-    async def _train_model(self, features: np.ndarray, labels: np.ndarray):
-        """Train Random Forest model"""
+    def _train_model(self, features: np.ndarray, labels: np.ndarray):
+        """Train Random Forest model and compile it for CPU inference"""
         if not ML_AVAILABLE:
             return
         
@@ -342,8 +731,56 @@ class RandomForestRiskClassifier(RiskAssessmentModel):
             random_state=42
         )
         self.model.fit(features, labels)
+        self._fil = None  # Rebuilt from the new forest on next prediction
+        _release_compiled(self._compiled)
+        self._compiled = None
+        if self.use_compiled and not self.use_fil:
+            self._load_compiled()
+    
+    def _load_fil(self):
+        """Convert the fitted forest to a cuML FIL model, once per trained forest"""
+        with self._lock:
+            if self._fil is None:
+                try:
+                    self._fil = ForestInference.load_from_sklearn(self.model, output_class=True)
+                    if hasattr(self._fil, 'optimize'):
+                        self._fil.optimize(batch_size=1024)
+                except Exception as e:
+                    logger.warning(f"FIL conversion failed, using sklearn inference: {e}")
+                    self.use_fil = False
+        return self._fil
+    
+    def _load_compiled(self):
+        """Compile the fitted forest to a native shared library, once per trained forest"""
+        with self._lock:
+            if self._compiled is None:
+                try:
+                    self._compiled = _compile_forest(self._treelite_model(), "risk_forest_", self.n_estimators)
+                except Exception as e:
+                    logger.warning(f"Forest compilation failed, using sklearn inference: {e}")
+                    self.use_compiled = False
+        return self._compiled
+    
+    def _treelite_model(self):
+        """Import the fitted forest into Treelite for compilation"""
+        return treelite.sklearn.import_model(self.model)
+    
+    def _predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Class probabilities, via FIL on GPU or compiled trees on CPU when available"""
+        if self.use_fil and self._load_fil() is not None:
+            return np.asarray(self._fil.predict_proba(features))
+        if self.use_compiled and self._load_compiled() is not None:
+            # DMatrix reads from the base buffer, so views must be materialised; float32 matches sklearn's tree dtype
+            dmatrix = tl2cgen.DMatrix(np.require(features, dtype=np.float32, requirements=['C', 'O']))
+            # tl2cgen returns (rows, targets, classes); a single-target forest flattens to (rows, classes)
+            probabilities = self._compiled.predict(dmatrix).reshape(len(features), -1)
+            if probabilities.shape[1] == 1:
+                # Binary models emit only P(class 1)
+                probabilities = np.hstack([1.0 - probabilities, probabilities])
+            return probabilities
+        return self.model.predict_proba(features)
         
-    async def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
+    def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
         """Make prediction using trained Random Forest model"""
         if not ML_AVAILABLE:
             return {
@@ -353,8 +790,8 @@ class RandomForestRiskClassifier(RiskAssessmentModel):
             }
         
         # Get prediction and probabilities
-        prediction = self.model.predict(features)[0]
-        probabilities = self.model.predict_proba(features)[0]
+        probabilities = self._predict_proba(features)[0]
+        prediction = self.model.classes_[probabilities.argmax()]
         
         risk_levels = [RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL]
         predicted_risk = risk_levels[prediction]
@@ -365,17 +802,56 @@ class RandomForestRiskClassifier(RiskAssessmentModel):
             "probability": probabilities[prediction],
             "confidence": confidence
         }
+    
+    def _predict_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict all rows with one predict_proba call"""
+        probabilities = self._predict_proba(features)
+        best = probabilities.argmax(axis=1)
+        return self.model.classes_[best], probabilities[np.arange(len(best)), best]
+
+
+class XGBoostRiskClassifier(RandomForestRiskClassifier):
+    """XGBoost risk classification model"""
+    
+    def __init__(self, n_estimators: int = 100, max_depth: int = 6, learning_rate: float = 0.1,
+                 use_compiled: bool = True):
+        super().__init__(n_estimators, max_depth, use_fil=False, use_compiled=use_compiled)
+        self.model_name = "XGBoostRiskClassifier"
+        self.learning_rate = learning_rate
+        
+    def _train_model(self, features: np.ndarray, labels: np.ndarray):
+        """Train XGBoost model and compile it for inference"""
+        if not ML_AVAILABLE:
+            return
+        
+        self.model = xgb.XGBClassifier(
+            n_estimators=self.n_estimators,
+            max_depth=self.max_depth,
+            learning_rate=self.learning_rate,
+            random_state=42
+        )
+        self.model.fit(features, labels)
+        _release_compiled(self._compiled)
+        self._compiled = None
+        if self.use_compiled:
+            self._load_compiled()
+    
+    def _treelite_model(self):
+        """Import the fitted booster into Treelite for compilation"""
+        return treelite.frontend.from_xgboost(self.model.get_booster())
 
 
 class AnomalyDetector(RiskAssessmentModel):
     """Anomaly detection model using Isolation Forest"""
     
-    def __init__(self, contamination: float = 0.1):
+    def __init__(self, contamination: float = 0.1, use_compiled: bool = True):
         super().__init__("AnomalyDetector", "1.0.0")
         self.contamination = contamination
         self.threshold = 0.0
+        self.use_compiled = use_compiled and COMPILED_TREES_AVAILABLE
+        self._compiled = None
         
-    async def _train_model(self, features: np.ndarray, labels: np.ndarray):
+    def _train_model(self, features: np.ndarray, labels: np.ndarray):
         """Train Isolation Forest model"""
         if not ML_AVAILABLE:
             return
@@ -385,10 +861,35 @@ class AnomalyDetector(RiskAssessmentModel):
             random_state=42
         )
         self.model.fit(features)
+        _release_compiled(self._compiled)
+        self._compiled = None
+        if self.use_compiled:
+            self._load_compiled()
         
         # Calculate threshold
-        scores = self.model.decision_function(features)
+        scores = self._decision_function(features)
         self.threshold = np.percentile(scores, self.contamination * 100)
+    
+    def _load_compiled(self):
+        """Compile the fitted isolation forest to a native shared library"""
+        with self._lock:
+            if self._compiled is None:
+                try:
+                    self._compiled = _compile_forest(
+                        treelite.sklearn.import_model(self.model), "anomaly_forest_", len(self.model.estimators_)
+                    )
+                except Exception as e:
+                    logger.warning(f"Isolation forest compilation failed, using sklearn inference: {e}")
+                    self.use_compiled = False
+        return self._compiled
+    
+    def _decision_function(self, features: np.ndarray) -> np.ndarray:
+        """IsolationForest decision_function, via compiled trees when available"""
+        if self.use_compiled and self._load_compiled() is not None:
+            dmatrix = tl2cgen.DMatrix(np.require(features, dtype=np.float32, requirements=['C', 'O']))
+            # Treelite emits the normalised anomaly score, i.e. -score_samples
+            return -self._compiled.predict(dmatrix).reshape(len(features)) - self.model.offset_
+        return self.model.decision_function(features)
         
     async def detect_anomaly(self, features: Dict[str, float]) -> AnomalyResult:
         """Detect anomalies in input features"""
@@ -406,12 +907,11 @@ class AnomalyDetector(RiskAssessmentModel):
                 )
             
             # Prepare features
-            feature_values = [features.get(name, 0.0) for name in self.feature_names]
-            feature_array = np.array(feature_values).reshape(1, -1)
-            feature_scaled = self.scaler.transform(feature_array)
+            feature_scaled = self._scaled_row(features)
             
             # Detect anomaly
-            anomaly_score = self.model.decision_function(feature_scaled)[0]
+            scores = await self._run_in_pool(self._decision_function, feature_scaled)
+            anomaly_score = float(scores[0])
             is_anomaly = anomaly_score < self.threshold
             
             return AnomalyResult(
@@ -432,21 +932,65 @@ class AnomalyDetector(RiskAssessmentModel):
                 features=features
             )
     
-    async def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
-        """Not used for anomaly detection"""
-        anomaly_result = await self.detect_anomaly(
-            {name: features[0][i] for i, name in enumerate(self.feature_names)}
-        )
+    def detect_anomaly_batch(self, features_df: pd.DataFrame) -> List[AnomalyResult]:
+        """Detect anomalies for every row of a feature frame in one scoring pass"""
+        if not self.is_trained:
+            raise ValueError(f"Model {self.model_name} is not trained")
+        
+        # Missing feature columns count as 0, as in detect_anomaly
+        frame = features_df.reindex(columns=self.feature_names, fill_value=0.0)
+        rows = frame.to_dict('records')
+        now = datetime.now()
+        
+        try:
+            if not ML_AVAILABLE or not rows:
+                return [
+                    AnomalyResult(is_anomaly=False, anomaly_score=0.0, threshold=self.threshold,
+                                  timestamp=now, features=row)
+                    for row in rows
+                ]
+            
+            scores = self._decision_function(self._scale(frame.to_numpy(dtype=np.float32)))
+            anomalies = np.less(scores, self.threshold)
+            
+            return [
+                AnomalyResult(is_anomaly=is_anomaly, anomaly_score=score, threshold=self.threshold,
+                              timestamp=now, features=row)
+                for is_anomaly, score, row in zip(anomalies.tolist(), scores.tolist(), rows)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Batch anomaly detection failed: {e}")
+            return [
+                AnomalyResult(is_anomaly=False, anomaly_score=0.0, threshold=self.threshold,
+                              timestamp=now, features=row)
+                for row in rows
+            ]
+    
+    def _predict_model(self, features: np.ndarray) -> Dict[str, Any]:
+        """Score an already-scaled row directly"""
+        anomaly_score = float(self._decision_function(features)[0])
+        is_anomaly = anomaly_score < self.threshold
         
         return {
-            "risk_level": RiskLevel.HIGH if anomaly_result.is_anomaly else RiskLevel.LOW,
-            "probability": 1.0 if anomaly_result.is_anomaly else 0.0,
-            "confidence": abs(anomaly_result.anomaly_score)
+            "risk_level": RiskLevel.HIGH if is_anomaly else RiskLevel.LOW,
+            "probability": 1.0 if is_anomaly else 0.0,
+            "confidence": abs(anomaly_score)
         }
+    
+    def _predict_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Score all rows with one decision function call"""
+        anomalies = self._decision_function(features) < self.threshold
+        classes = np.where(anomalies, _RISK_LEVELS.index(RiskLevel.HIGH), _RISK_LEVELS.index(RiskLevel.LOW))
+        return classes, anomalies.astype(np.float64)
 
 
 # Neural Network Models
 if ML_AVAILABLE:
+    def quantize_lstm_model(model: nn.Module) -> nn.Module:
+        """Dynamic INT8 quantization of an LSTMModel's recurrent and output layers"""
+        return torch.ao.quantization.quantize_dynamic(model.eval(), {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+    
     class LSTMModel(nn.Module):
         """LSTM neural network for time series prediction"""
         
@@ -474,51 +1018,48 @@ class ModelEnsemble:
         
     async def train_all(self, data: pd.DataFrame, target: str) -> Dict[str, Any]:
         """Train all models in the ensemble"""
-        results = {}
+        # Models are independent, so train them concurrently
+        training_results = await asyncio.gather(*(model.train(data, target) for model in self.models))
         
-        for i, model in enumerate(self.models):
-            result = await model.train(data, target)
-            results[f"model_{i}_{model.model_name}"] = result
-            
-        return results
+        return {
+            f"model_{i}_{model.model_name}": result
+            for i, (model, result) in enumerate(zip(self.models, training_results))
+        }
     
     async def predict_ensemble(self, features: Dict[str, float]) -> RiskPrediction:
         """Make ensemble prediction"""
-        predictions = []
+        # Members without a weight entry (weights shorter than models) vote with weight 1.0
+        trained = [
+            (model, self.weights[i] if i < len(self.weights) else 1.0)
+            for i, model in enumerate(self.models) if model.is_trained
+        ]
+        results = await asyncio.gather(*(model.predict(features) for model, _ in trained), return_exceptions=True)
         
-        for model in self.models:
-            if model.is_trained:
-                pred = await model.predict(features)
-                predictions.append(pred)
+        predictions, weights = [], []
+        for (model, weight), result in zip(trained, results):
+            if isinstance(result, Exception):
+                logger.error(f"Ensemble member {model.model_name} failed: {result}")
+                continue
+            predictions.append(result)
+            weights.append(weight)
         
         if not predictions:
             raise ValueError("No trained models available for prediction")
         
         # Weighted average of predictions
-        risk_scores = {
-            RiskLevel.LOW: 0.0,
-            RiskLevel.MEDIUM: 0.0,
-            RiskLevel.HIGH: 0.0,
-            RiskLevel.CRITICAL: 0.0
-        }
-        
-        total_weight = 0.0
-        for i, pred in enumerate(predictions):
-            weight = self.weights[i] if i < len(self.weights) else 1.0
-            risk_scores[pred.risk_level] += pred.probability * weight
-            total_weight += weight
-        
-        # Normalize scores
-        for level in risk_scores:
-            risk_scores[level] /= total_weight
+        scores = np.zeros(len(_RISK_LEVELS), dtype=np.float64)
+        for pred, weight in zip(predictions, weights):
+            scores[_LEVEL_IDX[pred.risk_level]] += pred.probability * weight
+        scores /= np.sum(weights)
         
         # Get highest scoring risk level
-        predicted_level = max(risk_scores, key=risk_scores.get)
-        confidence = sum(p.confidence for p in predictions) / len(predictions)
+        best = int(scores.argmax())
+        predicted_level = _RISK_LEVELS[best]
+        confidence = float(np.mean([p.confidence for p in predictions]))
         
         return RiskPrediction(
             risk_level=predicted_level,
-            probability=risk_scores[predicted_level],
+            probability=float(scores[best]),
             confidence=confidence,
             factors=features,
             timestamp=datetime.now(),
@@ -547,6 +1088,8 @@ async def create_risk_model(model_type: str, **kwargs) -> RiskAssessmentModel:
         return TimeSeriesPredictor(**kwargs)
     elif model_type == "random_forest":
         return RandomForestRiskClassifier(**kwargs)
+    elif model_type == "xgboost":
+        return XGBoostRiskClassifier(**kwargs)
     elif model_type == "anomaly_detector":
         return AnomalyDetector(**kwargs)
     else:
@@ -563,30 +1106,36 @@ async def load_training_data(data_path: str) -> pd.DataFrame:
 
 async def save_model(model: RiskAssessmentModel, model_path: str):
     """Save trained model to file"""
-    import pickle
-    
     model_data = {
         'model_name': model.model_name,
         'model_version': model.model_version,
         'is_trained': model.is_trained,
         'feature_names': model.feature_names,
-        'training_history': model.training_history
+        'training_history': model.training_history,
+        'quantized': getattr(model, 'quantized', False)
     }
     
     # Save model-specific data
     if hasattr(model, 'model') and model.model is not None:
-        if ML_AVAILABLE and hasattr(model.model, 'state_dict'):
+        if ML_AVAILABLE and isinstance(model.model, torch.jit.ScriptModule):
+            # Frozen TorchScript model; weights are inlined as constants, so save the whole graph
+            torch.jit.save(model.model, f"{model_path}.pt")
+            if getattr(model, '_trt_engine', None) is not None:
+                with open(f"{model_path}.engine", 'wb') as f:
+                    f.write(model._trt_engine.serialize())
+        elif ML_AVAILABLE and hasattr(model.model, 'state_dict'):
             # PyTorch model
             torch.save(model.model.state_dict(), f"{model_path}.pth")
+            if getattr(model, '_trt_engine', None) is not None:
+                with open(f"{model_path}.engine", 'wb') as f:
+                    f.write(model._trt_engine.serialize())
         elif ML_AVAILABLE:
-            # Scikit-learn model
-            with open(f"{model_path}.pkl", 'wb') as f:
-                pickle.dump(model.model, f)
+            # Scikit-learn model; left uncompressed so load_model can memory-map its arrays
+            joblib.dump(model.model, f"{model_path}.pkl")
     
     # Save scaler
     if model.scaler is not None:
-        with open(f"{model_path}_scaler.pkl", 'wb') as f:
-            pickle.dump(model.scaler, f)
+        joblib.dump(model.scaler, f"{model_path}_scaler.pkl")
     
     # Save metadata
     with open(f"{model_path}_metadata.json", 'w') as f:
@@ -595,9 +1144,9 @@ async def save_model(model: RiskAssessmentModel, model_path: str):
     logger.info(f"Model saved: {model_path}")
 
 
-async def load_model(model_path: str, model_type: str) -> RiskAssessmentModel:
-    """Load trained model from file"""
-    import pickle
+async def load_model(model_path: str, model_type: str, preload: bool = False) -> RiskAssessmentModel:
+    """Load trained model from file; arrays are memory-mapped unless preload is set"""
+    mmap_mode = None if preload else 'r'
     
     # Load metadata
     with open(f"{model_path}_metadata.json", 'r') as f:
@@ -608,26 +1157,41 @@ async def load_model(model_path: str, model_type: str) -> RiskAssessmentModel:
     model.model_name = model_data['model_name']
     model.model_version = model_data['model_version']
     model.is_trained = model_data['is_trained']
-    model.feature_names = model_data['feature_names']
+    model._set_feature_names(model_data['feature_names'])
     model.training_history = model_data['training_history']
     
     # Load scaler
     scaler_path = f"{model_path}_scaler.pkl"
     if Path(scaler_path).exists():
-        with open(scaler_path, 'rb') as f:
-            model.scaler = pickle.load(f)
+        model.scaler = joblib.load(scaler_path, mmap_mode=mmap_mode)
+        model._cache_scaler_params()
     
     # Load model
     if model_type == "timeseries":
         model_file = f"{model_path}.pth"
-        if Path(model_file).exists() and ML_AVAILABLE:
+        script_file = f"{model_path}.pt"
+        if Path(script_file).exists() and ML_AVAILABLE:
+            model.model = torch.jit.load(script_file, map_location=model.device)
+            model.quantized = bool(model_data.get('quantized'))
+        elif Path(model_file).exists() and ML_AVAILABLE:
             model.model = LSTMModel(len(model.feature_names), model.hidden_size, 4)
-            model.model.load_state_dict(torch.load(model_file))
+            if model_data.get('quantized'):
+                # Quantized weights only load into a module with the same quantized layout
+                model.model = quantize_lstm_model(model.model)
+                model.quantized = True
+            model.model.load_state_dict(torch.load(model_file, mmap=not preload, weights_only=not model.quantized))
+            if not model.quantized:
+                model.model.to(model.device)
+        engine_file = f"{model_path}.engine"
+        if Path(engine_file).exists() and TENSORRT_AVAILABLE and model.device.type == "cuda":
+            model._load_trt_engine(engine_file)
     else:
         model_file = f"{model_path}.pkl"
         if Path(model_file).exists():
-            with open(model_file, 'rb') as f:
-                model.model = pickle.load(f)
+            model.model = joblib.load(model_file, mmap_mode=mmap_mode)
+            # Compile now rather than inside the first prediction
+            if ML_AVAILABLE and getattr(model, 'use_compiled', False) and not getattr(model, 'use_fil', False):
+                model._load_compiled()
     
     logger.info(f"Model loaded: {model_path}")
     return model
\ No newline at end of file
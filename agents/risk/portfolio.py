@@ -9,13 +9,12 @@ import asyncio
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass, field
+from typing import Dict, Final, List, Optional, Tuple, Any, Union
+from dataclasses import asdict, dataclass, field, fields
 from enum import Enum
 import json
 import logging
-from collections import defaultdict
-import statistics
+from collections import defaultdict, deque
 
 from .models import RiskLevel, RiskPrediction
 from .calculator import RiskCalculationResult, RealTimeRiskCalculator
@@ -42,7 +41,81 @@ class PolicyStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Ordinal codes for the structure-of-arrays policy cache kept by PortfolioManager
+_ASSET_CLASSES = tuple(AssetClass)
+_ASSET_IDX = {asset_class: i for i, asset_class in enumerate(_ASSET_CLASSES)}
+_RISK_LEVELS = tuple(RiskLevel)
+_RISK_LEVEL_IDX = {level: i for i, level in enumerate(_RISK_LEVELS)}
+_STATUS_IDX = {status: i for i, status in enumerate(PolicyStatus)}
+_ACTIVE_CODE = _STATUS_IDX[PolicyStatus.ACTIVE]
+
+
+def _build_asset_correlations() -> np.ndarray:
+    """Static asset class correlation matrix, indexed by AssetClass declaration order"""
+    # This would typically use historical data; for now correlations are fixed per asset class pair
+    pair_correlations = {
+        frozenset((AssetClass.WEATHER, AssetClass.AGRICULTURE)): 0.7,  # High correlation
+        frozenset((AssetClass.CRYPTO, AssetClass.FLIGHT)): 0.2  # Low correlation
+    }
+    correlations = np.full((len(_ASSET_CLASSES), len(_ASSET_CLASSES)), 0.3)  # Medium correlation
+    for pair, correlation in pair_correlations.items():
+        i, j = (_ASSET_IDX[asset_class] for asset_class in pair)
+        correlations[i, j] = correlations[j, i] = correlation
+    np.fill_diagonal(correlations, 1.0)
+    correlations.flags.writeable = False
+    return correlations
+
+
+_ASSET_CORRELATIONS = _build_asset_correlations()
+
+# Policy-to-policy correlation by asset class pair: 0.8 within a class, 0.3 across classes
+_POLICY_CORRELATIONS = np.where(np.eye(len(_ASSET_CLASSES), dtype=bool), 0.8, 0.3)
+_POLICY_CORRELATIONS.flags.writeable = False
+
+# PortfolioMetrics fields scaled by stress scenarios, in stress_vector order; _IMPACT_IDX follows StressImpact
+_STRESS_FIELDS = ('average_risk_score', 'diversification_ratio', 'sharpe_ratio', 'var_95', 'expected_shortfall')
+_STRESS_CAP = np.array([1.0, np.inf, np.inf, np.inf, np.inf])  # Risk score stays a probability
+_IMPACT_IDX = np.array([_STRESS_FIELDS.index(name) for name in ('var_95', 'expected_shortfall', 'diversification_ratio')])
+
+# Static stress and diversification guidance, shared rather than rebuilt per call
+_RECOVERY_TIMES: Final[Dict[str, int]] = {
+    'low': 30,
+    'medium': 90,
+    'high': 180,
+    'extreme': 365
+}
+_STRESS_MITIGATIONS: Final[Tuple[str, ...]] = (
+    "Increase diversification across asset classes",
+    "Implement dynamic hedging strategies",
+    "Reduce concentration in high-risk assets",
+    "Increase reinsurance coverage",
+    "Implement early warning systems"
+)
+_STRESS_RECOMMENDATIONS: Final[Tuple[str, ...]] = (
+    "Reduce concentration in crypto assets",
+    "Increase weather insurance allocation",
+    "Implement correlation-based hedging",
+    "Review risk limits and constraints"
+)
+_DIVERSIFICATION_RECOMMENDATIONS: Final[Tuple[str, ...]] = (
+    "Consider adding more asset classes to the portfolio",
+    "Reduce correlation between existing positions",
+    "Implement geographic diversification strategies",
+    "Review and update diversification rules regularly"
+)
+
+
+def _weights_array(weights: Dict[str, float]) -> np.ndarray:
+    """Values of a name -> weight mapping as a contiguous float64 array"""
+    return np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+
+
+def _month_key(date: datetime) -> str:
+    """'YYYY-MM' bucket for a date, without a strftime format parse"""
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+@dataclass(slots=True)
 class InsurancePolicy:
     """Insurance policy data structure"""
     policy_id: str
@@ -61,9 +134,24 @@ class InsurancePolicy:
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    location: Optional[str] = None
+    _start_month: str = field(default="", init=False, repr=False, compare=False)  # 'YYYY-MM', set by PortfolioManager
+    
+    def __post_init__(self):
+        # Older callers pass the location through metadata
+        if self.location is None:
+            self.location = self.metadata.get('location', 'unknown')
+
 
+# Fields update_policy may set, and the subset that feeds portfolio metrics and indexes
+_UPDATABLE_FIELDS = frozenset(f.name for f in fields(InsurancePolicy) if f.init)
+_METRICS_AFFECTING = frozenset({
+    'policy_id', 'asset_class', 'coverage_amount', 'premium_amount', 'risk_score',
+    'risk_level', 'start_date', 'status', 'location'
+})
 
-@dataclass
+
+@dataclass(slots=True)
 class PortfolioMetrics:
     """Portfolio performance metrics"""
     total_coverage: float
@@ -78,9 +166,49 @@ class PortfolioMetrics:
     var_95: float  # Value at Risk 95%
     expected_shortfall: float
     timestamp: datetime
+    _corr_cache: Optional[Tuple[Any, ...]] = field(default=None, init=False, repr=False, compare=False)
+    _allocation_cache: Optional[Tuple[Any, ...]] = field(default=None, init=False, repr=False, compare=False)
+    _stress_vec: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def stress_vector(self) -> np.ndarray:
+        """Stress-scaled fields (see _STRESS_FIELDS) as a float64 array"""
+        if self._stress_vec is None:
+            self._stress_vec = np.array([getattr(self, name) for name in _STRESS_FIELDS], dtype=np.float64)
+        return self._stress_vec
+    
+    @property
+    def ordered_allocation(self) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Asset class names and their weights as a float64 array"""
+        cache = self._allocation_cache
+        if cache is None or cache[0] is not self.asset_allocation:
+            names = tuple(self.asset_allocation)
+            weights = np.fromiter(self.asset_allocation.values(), dtype=np.float64, count=len(names))
+            cache = (self.asset_allocation, names, weights)
+            self._allocation_cache = cache
+        return cache[1], cache[2]
+    
+    @property
+    def corr_array(self) -> Tuple[List[str], np.ndarray]:
+        """Correlation matrix as a dense array, ordered like asset_allocation"""
+        cache = self._corr_cache
+        # Rebuild when either source dict has been replaced
+        if cache is None or cache[0] is not self.asset_allocation or cache[1] is not self.correlation_matrix:
+            assets = list(self.asset_allocation.keys())
+            correlations = np.array([
+                [self.correlation_matrix.get(asset1, {}).get(asset2, 0.0) for asset2 in assets]
+                for asset1 in assets
+            ], dtype=np.float64).reshape(len(assets), len(assets))
+            cache = (self.asset_allocation, self.correlation_matrix, assets, correlations)
+            self._corr_cache = cache
+        return cache[2], cache[3]
+    
+    def _prime_corr_array(self, assets: List[str], correlations: np.ndarray):
+        """Seed the corr_array cache with a matrix already ordered like asset_allocation"""
+        self._corr_cache = (self.asset_allocation, self.correlation_matrix, assets, correlations)
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskExposure:
     """Risk exposure analysis"""
     asset_class: AssetClass
@@ -92,7 +220,7 @@ class RiskExposure:
     temporal_concentration: Dict[str, float]
 
 
-@dataclass
+@dataclass(slots=True)
 class RebalanceRecommendation:
     """Portfolio rebalancing recommendation"""
     current_allocation: Dict[str, float]
@@ -103,35 +231,82 @@ class RebalanceRecommendation:
     timestamp: datetime
 
 
+@dataclass(slots=True, frozen=True)
+class StressImpact:
+    """Relative impact of a stress scenario on key portfolio metrics"""
+    var_impact: float
+    expected_shortfall_impact: float
+    diversification_impact: float
+    overall_impact_score: float
+
+
+@dataclass(slots=True, frozen=True)
+class RuleViolation:
+    """Diversification rule violation"""
+    rule_type: str
+    asset_class: str
+    current_concentration: float
+    max_allowed: float
+    violation_severity: str
+
+
 class PortfolioManager:
     """Portfolio management system for parametric insurance"""
     
     def __init__(self, risk_calculator: RealTimeRiskCalculator):
         self.risk_calculator = risk_calculator
         self.policies: Dict[str, InsurancePolicy] = {}
-        self.portfolio_history: List[PortfolioMetrics] = []
+        self.portfolio_history: deque = deque(maxlen=100)  # Keep only last 100 metrics
         self.rebalance_threshold = 0.05  # 5% deviation trigger
         self.max_concentration = 0.3  # 30% maximum concentration per asset class
         self.target_diversification = 0.8  # Target diversification ratio
         
+        # Column-wise copy of self.policies, rebuilt lazily after any mutation
+        self._arrays_dirty = True
+        self._policy_rows: List[InsurancePolicy] = []
+        # Coverage and risk score are scanned on every refresh; float32 halves the bytes moved
+        self._coverage = np.empty(0, dtype=np.float32)
+        self._premium = np.empty(0, dtype=np.float64)
+        self._risk_score = np.empty(0, dtype=np.float32)
+        self._asset_idx = np.empty(0, dtype=np.intp)
+        self._risk_level_idx = np.empty(0, dtype=np.intp)
+        self._status = np.empty(0, dtype=np.int8)
+        self._location = np.empty(0, dtype=object)
+        self._start_month = np.empty(0, dtype=object)
+        self._frame: Optional[pd.DataFrame] = None  # DataFrame over the columns above, built on demand
+        
+        self._book_coverage = 0.0  # Coverage across all policies, any status
+        
+        # Policy ids per asset class, any status (dict keys as an insertion-ordered set)
+        self._by_asset: Dict[AssetClass, Dict[str, None]] = defaultdict(dict)
+        
+        # Running totals over active policies, adjusted by +/- delta on every mutation
+        self._agg = self._empty_aggregates()
+        self._metrics_version = 0  # Bumped on every mutation
+        self._last_metrics_version = -1  # Version the newest portfolio_history entry was computed at
+        self._asset_shares_cache = np.zeros(len(_ASSET_CLASSES), dtype=np.float64)
+        self._asset_shares_version = -1
+        
     async def add_policy(self, policy: InsurancePolicy) -> bool:
         """Add a new policy to the portfolio"""
         try:
             # Validate policy
-            if not await self._validate_policy(policy):
+            if not self._validate_policy(policy):
                 logger.error(f"Policy validation failed: {policy.policy_id}")
                 return False
             
             # Check portfolio constraints
-            if not await self._check_portfolio_constraints(policy):
+            if not self._check_portfolio_constraints(policy):
                 logger.warning(f"Portfolio constraints violated: {policy.policy_id}")
                 return False
             
             # Add policy to portfolio
+            policy._start_month = _month_key(policy.start_date)
+            previous = self.policies.get(policy.policy_id)
+            if previous is not None:
+                self._track(previous, -1)
             self.policies[policy.policy_id] = policy
-            
-            # Update portfolio metrics
-            await self._update_portfolio_metrics()
+            self._track(policy, 1)
             
             logger.info(f"Policy added to portfolio: {policy.policy_id}")
             return True
@@ -148,10 +323,7 @@ class PortfolioManager:
                 return False
             
             # Remove policy
-            del self.policies[policy_id]
-            
-            # Update portfolio metrics
-            await self._update_portfolio_metrics()
+            self._track(self.policies.pop(policy_id), -1)
             
             logger.info(f"Policy removed from portfolio: {policy_id}")
             return True
@@ -169,16 +341,35 @@ class PortfolioManager:
             
             policy = self.policies[policy_id]
             
-            # Apply updates
-            for key, value in updates.items():
-                if hasattr(policy, key):
+            # Policies built from metadata take their location from it (see InsurancePolicy.__post_init__),
+            # so a new metadata location moves the policy unless the update sets location explicitly
+            metadata = updates.get('metadata')
+            if 'location' not in updates and isinstance(metadata, dict) and 'location' in metadata:
+                updates = {**updates, 'location': metadata['location']}
+            
+            # Apply updates, swapping the policy's old contribution to the running totals for its new one;
+            # updates that only touch other fields (notes, trigger conditions, ...) leave the metrics as they are
+            affects_metrics = not _METRICS_AFFECTING.isdisjoint(updates)
+            previous = {key: getattr(policy, key) for key in updates if key in _UPDATABLE_FIELDS}
+            if affects_metrics:
+                self._track(policy, -1)
+            try:
+                for key in previous:
+                    setattr(policy, key, updates[key])
+                if affects_metrics:
+                    policy._start_month = _month_key(policy.start_date)
+                    self._track(policy, 1)
+            except Exception:
+                # Restore the old values and their contribution so the running totals stay consistent
+                for key, value in previous.items():
                     setattr(policy, key, value)
+                if affects_metrics:
+                    policy._start_month = _month_key(policy.start_date)
+                    self._track(policy, 1)
+                raise
             
             policy.updated_at = datetime.now()
             
-            # Update portfolio metrics
-            await self._update_portfolio_metrics()
-            
             logger.info(f"Policy updated: {policy_id}")
             return True
             
@@ -188,19 +379,16 @@ class PortfolioManager:
     
     async def get_portfolio_metrics(self) -> PortfolioMetrics:
         """Get current portfolio metrics"""
-        if not self.portfolio_history:
-            await self._update_portfolio_metrics()
-        
-        return self.portfolio_history[-1] if self.portfolio_history else None
+        return self._latest_metrics()
     
     async def get_risk_exposure(self, asset_class: Optional[AssetClass] = None) -> Union[RiskExposure, Dict[str, RiskExposure]]:
         """Get risk exposure analysis"""
         if asset_class:
-            return await self._calculate_risk_exposure(asset_class)
+            return self._calculate_risk_exposure(asset_class)
         else:
             exposures = {}
             for ac in AssetClass:
-                exposure = await self._calculate_risk_exposure(ac)
+                exposure = self._calculate_risk_exposure(ac)
                 if exposure.policy_count > 0:
                     exposures[ac.value] = exposure
             return exposures
@@ -208,25 +396,17 @@ class PortfolioManager:
     async def analyze_concentration_risk(self) -> Dict[str, Any]:
         """Analyze concentration risk in the portfolio"""
         try:
-            # Asset class concentration
-            asset_concentration = await self._calculate_asset_concentration()
-            
-            # Geographic concentration
-            geographic_concentration = await self._calculate_geographic_concentration()
-            
-            # Temporal concentration
-            temporal_concentration = await self._calculate_temporal_concentration()
-            
-            # Risk score concentration
-            risk_concentration = await self._calculate_risk_concentration()
+            # Asset class, geographic, temporal and risk level concentration in one pass
+            concentrations = self._calculate_all_concentrations()
+            asset_concentration = concentrations['asset']
             
             return {
                 'asset_concentration': asset_concentration,
-                'geographic_concentration': geographic_concentration,
-                'temporal_concentration': temporal_concentration,
-                'risk_concentration': risk_concentration,
-                'overall_concentration_score': await self._calculate_overall_concentration(),
-                'concentration_warnings': await self._get_concentration_warnings(),
+                'geographic_concentration': concentrations['geographic'],
+                'temporal_concentration': concentrations['temporal'],
+                'risk_concentration': concentrations['risk'],
+                'overall_concentration_score': self._calculate_overall_concentration(asset_concentration),
+                'concentration_warnings': self._get_concentration_warnings(asset_concentration),
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -238,23 +418,23 @@ class PortfolioManager:
         """Generate portfolio rebalancing recommendations"""
         try:
             # Calculate current allocation
-            current_allocation = await self._calculate_current_allocation()
+            current_allocation = self._calculate_current_allocation()
             
             # Calculate target allocation
-            target_allocation = await self._calculate_target_allocation()
+            target_allocation = self._calculate_target_allocation()
             
             # Generate rebalance actions
-            rebalance_actions = await self._generate_rebalance_actions(
+            rebalance_actions = self._generate_rebalance_actions(
                 current_allocation, target_allocation
             )
             
             # Calculate expected improvement
-            expected_improvement = await self._calculate_expected_improvement(
+            expected_improvement = self._calculate_expected_improvement(
                 current_allocation, target_allocation
             )
             
             # Calculate risk reduction
-            risk_reduction = await self._calculate_risk_reduction(
+            risk_reduction = self._calculate_risk_reduction(
                 current_allocation, target_allocation
             )
             
@@ -282,11 +462,11 @@ class PortfolioManager:
         """Optimize portfolio allocation"""
         try:
             if optimization_objective == "risk_adjusted_return":
-                return await self._optimize_risk_adjusted_return()
+                return self._optimize_risk_adjusted_return()
             elif optimization_objective == "minimum_variance":
-                return await self._optimize_minimum_variance()
+                return self._optimize_minimum_variance()
             elif optimization_objective == "maximum_diversification":
-                return await self._optimize_maximum_diversification()
+                return self._optimize_maximum_diversification()
             else:
                 raise ValueError(f"Unknown optimization objective: {optimization_objective}")
                 
@@ -299,24 +479,28 @@ class PortfolioManager:
         try:
             stress_results = {}
             
-            for i, scenario in enumerate(scenarios):
+            # Every scenario is applied to the same baseline, so fetch it once
+            current_metrics = self._latest_metrics()
+            
+            # Apply all scenarios to portfolio in one pass
+            all_stressed = self._apply_stress_scenarios(scenarios, current_metrics)
+            
+            for i, (scenario, stressed_metrics) in enumerate(zip(scenarios, all_stressed)):
                 scenario_name = scenario.get('name', f'scenario_{i}')
-                
-                # Apply scenario to portfolio
-                stressed_metrics = await self._apply_stress_scenario(scenario)
+                impact = self._analyze_stress_impact(stressed_metrics, current_metrics)
                 
                 stress_results[scenario_name] = {
                     'scenario': scenario,
                     'stressed_metrics': stressed_metrics,
-                    'impact_analysis': await self._analyze_stress_impact(stressed_metrics),
-                    'recovery_time': await self._estimate_recovery_time(scenario),
-                    'mitigation_suggestions': await self._suggest_mitigations(scenario)
+                    'impact_analysis': asdict(impact) if impact else {},
+                    'recovery_time': self._estimate_recovery_time(scenario),
+                    'mitigation_suggestions': self._suggest_mitigations(scenario)
                 }
             
             return {
                 'stress_test_results': stress_results,
-                'overall_resilience_score': await self._calculate_resilience_score(stress_results),
-                'recommendations': await self._generate_stress_recommendations(stress_results),
+                'overall_resilience_score': self._calculate_resilience_score(stress_results),
+                'recommendations': self._generate_stress_recommendations(stress_results),
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -324,91 +508,220 @@ class PortfolioManager:
             logger.error(f"Stress testing failed: {e}")
             return {}
     
-    async def _validate_policy(self, policy: InsurancePolicy) -> bool:
-        """Validate policy parameters"""
-        if not policy.policy_id or not policy.contract_id:
-            return False
-        
-        if policy.coverage_amount <= 0 or policy.premium_amount <= 0:
-            return False
-        
-        if policy.start_date >= policy.end_date:
-            return False
-        
-        if policy.risk_score < 0 or policy.risk_score > 1:
-            return False
+    async def apply_stress_scenarios_batch(self, scenarios: List[Dict[str, Any]]) -> np.ndarray:
+        """Stressed metric values for many scenarios, without building PortfolioMetrics objects"""
+        try:
+            current_metrics = self._latest_metrics()
+            if not current_metrics:
+                return np.empty((0, len(_STRESS_FIELDS)))
+            
+            # Columns follow _STRESS_FIELDS: average_risk_score, diversification_ratio, sharpe_ratio, var_95, expected_shortfall
+            return self._stress_vectors(scenarios, current_metrics)
+            
+        except Exception as e:
+            logger.error(f"Batch stress scenario evaluation failed: {e}")
+            return np.empty((0, len(_STRESS_FIELDS)))
+    
+    def _latest_metrics(self) -> Optional[PortfolioMetrics]:
+        """Most recent portfolio metrics, recomputed only if the portfolio changed since the last refresh"""
+        if self._metrics_version != self._last_metrics_version:
+            self._update_portfolio_metrics()
         
-        return True
+        return self.portfolio_history[-1] if self.portfolio_history else None
     
-    async def _check_portfolio_constraints(self, policy: InsurancePolicy) -> bool:
+    def _validate_policy(self, policy: InsurancePolicy) -> bool:
+        """Validate policy parameters"""
+        # Cheapest checks first; datetime comparison last
+        return (
+            bool(policy.policy_id) and bool(policy.contract_id)
+            and policy.coverage_amount > 0 and policy.premium_amount > 0
+            and 0.0 <= policy.risk_score <= 1.0
+            and policy.start_date < policy.end_date
+        )
+    
+    def _check_portfolio_constraints(self, policy: InsurancePolicy) -> bool:
         """Check if adding policy violates portfolio constraints"""
+        asset_exposure, total_coverage, correlation_risk = self._calculate_addition_impact(policy)
+        
         # Check asset class concentration
-        asset_exposure = await self._calculate_asset_exposure_after_addition(policy)
         if asset_exposure > self.max_concentration:
             return False
         
         # Check total portfolio size constraints
-        total_coverage = sum(p.coverage_amount for p in self.policies.values())
-        if total_coverage + policy.coverage_amount > 100_000_000:  # 100M limit
+        if total_coverage > 100_000_000:  # 100M limit
             return False
         
         # Check correlation constraints
-        correlation_risk = await self._calculate_correlation_risk_after_addition(policy)
         if correlation_risk > 0.8:  # High correlation threshold
             return False
         
         return True
     
-    async def _update_portfolio_metrics(self):
-        """Update portfolio metrics"""
-        if not self.policies:
+    def _calculate_addition_impact(self, policy: InsurancePolicy) -> Tuple[float, float, float]:
+        """Asset class concentration, total book coverage and correlation risk after adding a policy"""
+        agg = self._agg
+        asset = _ASSET_IDX[policy.asset_class]
+        
+        # Concentration of the policy's asset class within active coverage
+        new_asset_exposure = agg['asset_coverage'][asset] + policy.coverage_amount
+        new_total_exposure = agg['total_coverage'] + policy.coverage_amount
+        asset_exposure = new_asset_exposure / new_total_exposure if new_total_exposure > 0 else 0.0
+        
+        # Simplified correlation risk: average correlation with the existing active policies of the same
+        # asset class, which all share the same class-pair correlation, so only their presence matters
+        correlation_risk = float(_POLICY_CORRELATIONS[asset, asset]) if agg['asset_count'][asset] else 0.0
+        
+        return float(asset_exposure), self._book_coverage + policy.coverage_amount, correlation_risk
+    
+    @staticmethod
+    def _empty_aggregates() -> Dict[str, Any]:
+        """Zeroed running totals over active policies"""
+        return {
+            'active_count': 0,
+            'total_coverage': 0.0,
+            'total_premium': 0.0,
+            'sum_risk': 0.0,
+            'asset_coverage': np.zeros(len(_ASSET_CLASSES), dtype=np.float64),
+            'asset_count': np.zeros(len(_ASSET_CLASSES), dtype=np.int64),
+            'risk_count': np.zeros(len(_RISK_LEVELS), dtype=np.int64),
+            'sorted_losses': np.empty(0, dtype=np.float64)  # coverage * risk_score, ascending; feeds reported VaR/ES
+        }
+    
+    def _track(self, policy: InsurancePolicy, sign: int):
+        """Add (sign=1) or remove (sign=-1) a policy's contribution to the running totals"""
+        # Lookups that can fail run before any state changes, so a bad policy leaves the totals untouched
+        asset = _ASSET_IDX[policy.asset_class]
+        risk_level = _RISK_LEVEL_IDX[policy.risk_level]
+        loss = policy.coverage_amount * policy.risk_score
+        
+        self._arrays_dirty = True
+        self._metrics_version += 1
+        
+        self._book_coverage += sign * policy.coverage_amount
+        if sign > 0:
+            self._by_asset[policy.asset_class][policy.policy_id] = None
+        else:
+            self._by_asset[policy.asset_class].pop(policy.policy_id, None)
+        
+        if policy.status != PolicyStatus.ACTIVE:
+            return
+        
+        agg = self._agg
+        agg['active_count'] += sign
+        if agg['active_count'] == 0:
+            # Reset rather than let floating-point residue accumulate in an empty book
+            self._agg = self._empty_aggregates()
             return
         
-        active_policies = [p for p in self.policies.values() if p.status == PolicyStatus.ACTIVE]
+        agg['total_coverage'] += sign * policy.coverage_amount
+        agg['total_premium'] += sign * policy.premium_amount
+        agg['sum_risk'] += sign * policy.risk_score
+        agg['asset_coverage'][asset] += sign * policy.coverage_amount
+        agg['asset_count'][asset] += sign
+        agg['risk_count'][risk_level] += sign
         
-        if not active_policies:
+        position = np.searchsorted(agg['sorted_losses'], loss)
+        if sign > 0:
+            agg['sorted_losses'] = np.insert(agg['sorted_losses'], position, loss)
+        else:
+            agg['sorted_losses'] = np.delete(agg['sorted_losses'], position)
+    
+    def _rebuild_arrays(self):
+        """Rebuild the per-policy NumPy columns from self.policies"""
+        rows = list(self.policies.values())
+        n = len(rows)
+        self._policy_rows = rows
+        self._coverage = np.fromiter((p.coverage_amount for p in rows), dtype=np.float32, count=n)
+        self._premium = np.fromiter((p.premium_amount for p in rows), dtype=np.float64, count=n)
+        self._risk_score = np.fromiter((p.risk_score for p in rows), dtype=np.float32, count=n)
+        self._asset_idx = np.fromiter((_ASSET_IDX[p.asset_class] for p in rows), dtype=np.intp, count=n)
+        self._risk_level_idx = np.fromiter((_RISK_LEVEL_IDX[p.risk_level] for p in rows), dtype=np.intp, count=n)
+        self._status = np.fromiter((_STATUS_IDX[p.status] for p in rows), dtype=np.int8, count=n)
+        self._location = np.array([p.location for p in rows], dtype=object)
+        self._start_month = np.array([p._start_month for p in rows], dtype=object)
+        self._frame = None
+        self._arrays_dirty = False
+    
+    def _ensure_arrays(self):
+        """Rebuild the policy columns if a mutation has invalidated them"""
+        if self._arrays_dirty:
+            self._rebuild_arrays()
+    
+    def _policy_frame(self) -> pd.DataFrame:
+        """Policy columns as a DataFrame, cached until the next mutation"""
+        self._ensure_arrays()
+        if self._frame is None:
+            self._frame = pd.DataFrame({
+                'status': self._status,
+                'asset_class': self._asset_idx,
+                'risk_level': self._risk_level_idx,
+                'coverage': self._coverage,
+                'risk_score': self._risk_score,
+                'location': self._location,
+                'start_month': self._start_month
+            })
+        return self._frame
+    
+    def _coverage_shares(self, column: str) -> Dict[str, float]:
+        """Share of active coverage per value of a policy frame column"""
+        frame = self._policy_frame()
+        exposure = frame.loc[frame['status'] == _ACTIVE_CODE].groupby(column, sort=False, dropna=False)['coverage'].sum().astype(np.float64)
+        total_exposure = exposure.sum()
+        return (exposure / total_exposure).to_dict() if total_exposure > 0 else {}
+    
+    def _update_portfolio_metrics(self):
+        """Update portfolio metrics"""
+        agg = self._agg
+        total_policies = agg['active_count']
+        
+        if not total_policies or self._metrics_version == self._last_metrics_version:
             return
         
-        # Calculate basic metrics
-        total_coverage = sum(p.coverage_amount for p in active_policies)
-        total_premium = sum(p.premium_amount for p in active_policies)
-        total_policies = len(active_policies)
-        average_risk_score = sum(p.risk_score for p in active_policies) / total_policies
+        self._ensure_arrays()
         
-        # Risk distribution
-        risk_distribution = defaultdict(int)
-        for policy in active_policies:
-            risk_distribution[policy.risk_level.value] += 1
+        mask = self._status == _ACTIVE_CODE
+        active_policies = [self._policy_rows[i] for i in np.flatnonzero(mask)]
+        coverage = self._coverage[mask]
         
-        # Asset allocation
-        asset_allocation = defaultdict(float)
-        for policy in active_policies:
-            asset_allocation[policy.asset_class.value] += policy.coverage_amount
+        # Basic metrics come straight from the running totals
+        total_coverage = agg['total_coverage']
+        total_premium = agg['total_premium']
+        average_risk_score = agg['sum_risk'] / total_policies
         
-        # Normalize asset allocation
-        for asset_class in asset_allocation:
-            asset_allocation[asset_class] /= total_coverage
+        # Risk distribution
+        risk_count = agg['risk_count']
+        risk_distribution = {
+            _RISK_LEVELS[i].value: int(risk_count[i]) for i in np.flatnonzero(risk_count)
+        }
         
-        # Correlation matrix
-        correlation_matrix = await self._calculate_correlation_matrix(active_policies)
+        # Asset allocation, normalized by total coverage
+        asset_share = self._asset_shares()
+        asset_allocation = {
+            _ASSET_CLASSES[i].value: float(asset_share[i]) for i in np.flatnonzero(agg['asset_count'])
+        }
+        
+        # Correlation matrix, over the same enum-ordered asset classes as asset_allocation
+        assets, correlations = self._calculate_correlation_matrix(self._asset_idx[mask])
+        correlation_matrix = {
+            asset: dict(zip(assets, row)) for asset, row in zip(assets, correlations.tolist())
+        }
         
         # Diversification ratio
-        diversification_ratio = await self._calculate_diversification_ratio(active_policies)
+        diversification_ratio = self._calculate_diversification_ratio(active_policies)
         
         # Sharpe ratio
-        sharpe_ratio = await self._calculate_sharpe_ratio(active_policies)
+        sharpe_ratio = self._calculate_sharpe_ratio(self._premium[mask], coverage)
         
         # VaR and Expected Shortfall
-        var_95 = await self._calculate_var_95(active_policies)
-        expected_shortfall = await self._calculate_expected_shortfall(active_policies)
+        var_95, expected_shortfall = self._calculate_tail_risk(agg['sorted_losses'])
         
         metrics = PortfolioMetrics(
             total_coverage=total_coverage,
             total_premium=total_premium,
             total_policies=total_policies,
             average_risk_score=average_risk_score,
-            risk_distribution=dict(risk_distribution),
-            asset_allocation=dict(asset_allocation),
+            risk_distribution=risk_distribution,
+            asset_allocation=asset_allocation,
             correlation_matrix=correlation_matrix,
             diversification_ratio=diversification_ratio,
             sharpe_ratio=sharpe_ratio,
@@ -416,17 +729,15 @@ class PortfolioManager:
             expected_shortfall=expected_shortfall,
             timestamp=datetime.now()
         )
+        metrics._prime_corr_array(assets, correlations)
         
         self.portfolio_history.append(metrics)
-        
-        # Keep only last 100 metrics
-        if len(self.portfolio_history) > 100:
-            self.portfolio_history = self.portfolio_history[-100:]
+        self._last_metrics_version = self._metrics_version
     
-    async def _calculate_risk_exposure(self, asset_class: AssetClass) -> RiskExposure:
+    def _calculate_risk_exposure(self, asset_class: AssetClass) -> RiskExposure:
         """Calculate risk exposure for an asset class"""
-        asset_policies = [p for p in self.policies.values() 
-                         if p.asset_class == asset_class and p.status == PolicyStatus.ACTIVE]
+        asset_policies = [self.policies[policy_id] for policy_id in self._by_asset[asset_class]]
+        asset_policies = [p for p in asset_policies if p.status == PolicyStatus.ACTIVE]
         
         if not asset_policies:
             return RiskExposure(
@@ -444,19 +755,18 @@ class PortfolioManager:
         average_risk_score = sum(p.risk_score for p in asset_policies) / policy_count
         
         # Concentration risk (simplified)
-        total_portfolio_exposure = sum(p.coverage_amount for p in self.policies.values())
+        total_portfolio_exposure = self._book_coverage
         concentration_risk = total_exposure / total_portfolio_exposure if total_portfolio_exposure > 0 else 0
         
         # Geographic concentration
         geographic_concentration = defaultdict(float)
         for policy in asset_policies:
-            location = policy.metadata.get('location', 'unknown')
-            geographic_concentration[location] += policy.coverage_amount / total_exposure
+            geographic_concentration[policy.location] += policy.coverage_amount / total_exposure
         
         # Temporal concentration
         temporal_concentration = defaultdict(float)
         for policy in asset_policies:
-            month = policy.start_date.strftime('%Y-%m')
+            month = policy._start_month
             temporal_concentration[month] += policy.coverage_amount / total_exposure
         
         return RiskExposure(
@@ -469,91 +779,74 @@ class PortfolioManager:
             temporal_concentration=dict(temporal_concentration)
         )
     
-    async def _calculate_asset_concentration(self) -> Dict[str, float]:
-        """Calculate asset class concentration"""
-        asset_exposure = defaultdict(float)
-        total_exposure = 0.0
+    def _asset_shares(self) -> np.ndarray:
+        """Active coverage share per asset class (AssetClass order), from the running totals"""
+        if self._asset_shares_version != self._metrics_version:
+            agg = self._agg
+            total_coverage = agg['total_coverage']
+            self._asset_shares_cache = (
+                agg['asset_coverage'] / total_coverage if total_coverage > 0 else np.zeros(len(_ASSET_CLASSES))
+            )
+            self._asset_shares_version = self._metrics_version
+        return self._asset_shares_cache
+    
+    def _calculate_all_concentrations(self) -> Dict[str, Dict[str, float]]:
+        """Calculate asset, geographic, temporal and risk level concentration together"""
+        self._ensure_arrays()
+        
+        mask = self._status == _ACTIVE_CODE
+        coverage = self._coverage[mask]
+        total_exposure = float(coverage.sum(dtype=np.float64))
         
-        for policy in self.policies.values():
-            if policy.status == PolicyStatus.ACTIVE:
-                asset_exposure[policy.asset_class.value] += policy.coverage_amount
-                total_exposure += policy.coverage_amount
+        if total_exposure <= 0:
+            return {'asset': {}, 'geographic': {}, 'temporal': {}, 'risk': {}}
         
-        # Normalize to percentages
-        if total_exposure > 0:
-            for asset_class in asset_exposure:
-                asset_exposure[asset_class] /= total_exposure
+        # Asset class and risk level shares straight from the code columns
+        asset_idx = self._asset_idx[mask]
+        asset_share = np.bincount(asset_idx, weights=coverage, minlength=len(_ASSET_CLASSES)) / total_exposure
+        risk_idx = self._risk_level_idx[mask]
+        risk_share = np.bincount(risk_idx, weights=coverage, minlength=len(_RISK_LEVELS)) / total_exposure
         
-        return dict(asset_exposure)
+        return {
+            'asset': {_ASSET_CLASSES[i].value: float(asset_share[i]) for i in np.unique(asset_idx)},
+            'geographic': self._coverage_shares('location'),
+            'temporal': self._coverage_shares('start_month'),
+            'risk': {_RISK_LEVELS[i].value: float(risk_share[i]) for i in np.unique(risk_idx)}
+        }
+    
+    def _calculate_asset_concentration(self) -> Dict[str, float]:
+        """Calculate asset class concentration"""
+        names, shares = self._asset_concentration_array()
+        return dict(zip(names, shares.tolist()))
+    
+    def _asset_concentration_array(self) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Asset classes with active policies and their coverage shares, in AssetClass order"""
+        present = np.flatnonzero(self._agg['asset_count'])
+        return tuple(_ASSET_CLASSES[i].value for i in present), self._asset_shares()[present]
     
-    async def _calculate_geographic_concentration(self) -> Dict[str, float]:
+    def _calculate_geographic_concentration(self) -> Dict[str, float]:
         """Calculate geographic concentration"""
-        geographic_exposure = defaultdict(float)
-        total_exposure = 0.0
-        
-        for policy in self.policies.values():
-            if policy.status == PolicyStatus.ACTIVE:
-                location = policy.metadata.get('location', 'unknown')
-                geographic_exposure[location] += policy.coverage_amount
-                total_exposure += policy.coverage_amount
-        
-        # Normalize to percentages
-        if total_exposure > 0:
-            for location in geographic_exposure:
-                geographic_exposure[location] /= total_exposure
-        
-        return dict(geographic_exposure)
+        return self._coverage_shares('location')
     
-    async def _calculate_temporal_concentration(self) -> Dict[str, float]:
+    def _calculate_temporal_concentration(self) -> Dict[str, float]:
         """Calculate temporal concentration"""
-        temporal_exposure = defaultdict(float)
-        total_exposure = 0.0
-        
-        for policy in self.policies.values():
-            if policy.status == PolicyStatus.ACTIVE:
-                month = policy.start_date.strftime('%Y-%m')
-                temporal_exposure[month] += policy.coverage_amount
-                total_exposure += policy.coverage_amount
-        
-        # Normalize to percentages
-        if total_exposure > 0:
-            for month in temporal_exposure:
-                temporal_exposure[month] /= total_exposure
-        
-        return dict(temporal_exposure)
-    
-    async def _calculate_risk_concentration(self) -> Dict[str, float]:
-        """Calculate risk level concentration"""
-        risk_exposure = defaultdict(float)
-        total_exposure = 0.0
-        
-        for policy in self.policies.values():
-            if policy.status == PolicyStatus.ACTIVE:
-                risk_exposure[policy.risk_level.value] += policy.coverage_amount
-                total_exposure += policy.coverage_amount
-        
-        # Normalize to percentages
-        if total_exposure > 0:
-            for risk_level in risk_exposure:
-                risk_exposure[risk_level] /= total_exposure
-        
-        return dict(risk_exposure)
+        return self._coverage_shares('start_month')
     
-    async def _calculate_overall_concentration(self) -> float:
+    def _calculate_overall_concentration(self, asset_concentration: Optional[Dict[str, float]] = None) -> float:
         """Calculate overall concentration score"""
         # Herfindahl-Hirschman Index for concentration
-        asset_concentration = await self._calculate_asset_concentration()
-        
-        hhi = sum(share ** 2 for share in asset_concentration.values())
+        shares = self._asset_shares() if asset_concentration is None else _weights_array(asset_concentration)
+        hhi = float(np.vdot(shares, shares))
         
         # Normalize to 0-1 scale (1 = high concentration, 0 = low concentration)
         return hhi
     
-    async def _get_concentration_warnings(self) -> List[str]:
+    def _get_concentration_warnings(self, asset_concentration: Optional[Dict[str, float]] = None) -> List[str]:
         """Get concentration warnings"""
         warnings = []
         
-        asset_concentration = await self._calculate_asset_concentration()
+        if asset_concentration is None:
+            asset_concentration = self._calculate_asset_concentration()
         
         for asset_class, concentration in asset_concentration.items():
             if concentration > self.max_concentration:
@@ -561,11 +854,11 @@ class PortfolioManager:
         
         return warnings
     
-    async def _calculate_current_allocation(self) -> Dict[str, float]:
+    def _calculate_current_allocation(self) -> Dict[str, float]:
         """Calculate current portfolio allocation"""
-        return await self._calculate_asset_concentration()
+        return self._calculate_asset_concentration()
     
-    async def _calculate_target_allocation(self) -> Dict[str, float]:
+    def _calculate_target_allocation(self) -> Dict[str, float]:
         """Calculate target portfolio allocation"""
         # Simple equal weight allocation as baseline
         # In practice, this would use optimization algorithms
@@ -580,7 +873,7 @@ class PortfolioManager:
         
         return {asset_class: target_weight for asset_class in active_asset_classes}
     
-    async def _generate_rebalance_actions(self, 
+    def _generate_rebalance_actions(self, 
                                         current_allocation: Dict[str, float],
                                         target_allocation: Dict[str, float]) -> List[Dict[str, Any]]:
         """Generate rebalancing actions"""
@@ -605,7 +898,7 @@ class PortfolioManager:
         
         return actions
     
-    async def _calculate_expected_improvement(self,
+    def _calculate_expected_improvement(self,
                                            current_allocation: Dict[str, float],
                                            target_allocation: Dict[str, float]) -> Dict[str, float]:
         """Calculate expected improvement from rebalancing"""
@@ -615,41 +908,23 @@ class PortfolioManager:
             'expected_return_improvement': 0.02
         }
     
-    async def _calculate_risk_reduction(self,
+    def _calculate_risk_reduction(self,
                                       current_allocation: Dict[str, float],
                                       target_allocation: Dict[str, float]) -> float:
         """Calculate expected risk reduction"""
         # Simplified risk reduction calculation
-        current_concentration = sum(weight ** 2 for weight in current_allocation.values())
-        target_concentration = sum(weight ** 2 for weight in target_allocation.values())
+        current = _weights_array(current_allocation)
+        target = _weights_array(target_allocation)
         
-        return max(0.0, current_concentration - target_concentration)
+        return max(0.0, float(np.vdot(current, current) - np.vdot(target, target)))
     
-    async def _calculate_correlation_matrix(self, policies: List[InsurancePolicy]) -> Dict[str, Dict[str, float]]:
+    def _calculate_correlation_matrix(self, asset_idx: np.ndarray) -> Tuple[List[str], np.ndarray]:
         """Calculate correlation matrix between asset classes"""
-        # This would typically use historical data
-        # For now, returning a simplified correlation matrix
-        
-        asset_classes = list(set(p.asset_class.value for p in policies))
-        correlation_matrix = {}
-        
-        for asset1 in asset_classes:
-            correlation_matrix[asset1] = {}
-            for asset2 in asset_classes:
-                if asset1 == asset2:
-                    correlation_matrix[asset1][asset2] = 1.0
-                elif (asset1 == 'weather' and asset2 == 'agriculture') or \
-                     (asset1 == 'agriculture' and asset2 == 'weather'):
-                    correlation_matrix[asset1][asset2] = 0.7  # High correlation
-                elif (asset1 == 'crypto' and asset2 == 'flight') or \
-                     (asset1 == 'flight' and asset2 == 'crypto'):
-                    correlation_matrix[asset1][asset2] = 0.2  # Low correlation
-                else:
-                    correlation_matrix[asset1][asset2] = 0.3  # Medium correlation
-        
-        return correlation_matrix
-    
-    async def _calculate_diversification_ratio(self, policies: List[InsurancePolicy]) -> float:
+        present = np.unique(asset_idx)
+        assets = [_ASSET_CLASSES[i].value for i in present]
+        return assets, _ASSET_CORRELATIONS[np.ix_(present, present)]
+    
+    def _calculate_diversification_ratio(self, policies: List[InsurancePolicy]) -> float:
         """Calculate diversification ratio"""
         if len(policies) <= 1:
             return 0.0
@@ -658,201 +933,152 @@ class PortfolioManager:
         asset_classes = set(p.asset_class for p in policies)
         return len(asset_classes) / len(AssetClass)
     
-    async def _calculate_sharpe_ratio(self, policies: List[InsurancePolicy]) -> float:
+    def _calculate_sharpe_ratio(self, premium: np.ndarray, coverage: np.ndarray) -> float:
         """Calculate Sharpe ratio"""
-        if not policies:
-            return 0.0
-        
         # Simplified Sharpe ratio calculation
-        returns = [p.premium_amount / p.coverage_amount for p in policies]
-        
-        if len(returns) <= 1:
-            return 0.0
-        
-        avg_return = statistics.mean(returns)
-        return_std = statistics.stdev(returns)
-        
-        return avg_return / return_std if return_std > 0 else 0.0
-    
-    async def _calculate_var_95(self, policies: List[InsurancePolicy]) -> float:
-        """Calculate Value at Risk (95% confidence)"""
-        if not policies:
-            return 0.0
-        
-        # Simplified VaR calculation
-        losses = [p.coverage_amount * p.risk_score for p in policies]
-        
-        if len(losses) <= 1:
-            return sum(losses)
-        
-        return np.percentile(losses, 95)
-    
-    async def _calculate_expected_shortfall(self, policies: List[InsurancePolicy]) -> float:
-        """Calculate Expected Shortfall (Conditional VaR)"""
-        if not policies:
+        if len(premium) <= 1:
             return 0.0
         
-        # Simplified ES calculation
-        losses = [p.coverage_amount * p.risk_score for p in policies]
-        
-        if len(losses) <= 1:
-            return sum(losses)
-        
-        var_95 = np.percentile(losses, 95)
-        tail_losses = [loss for loss in losses if loss >= var_95]
+        returns = premium / coverage
+        return_std = returns.std(ddof=1)
         
-        return statistics.mean(tail_losses) if tail_losses else 0.0
+        return float(returns.mean() / return_std) if return_std > 0 else 0.0
     
-    async def _calculate_asset_exposure_after_addition(self, policy: InsurancePolicy) -> float:
-        """Calculate asset exposure after adding a policy"""
-        current_asset_exposure = sum(
-            p.coverage_amount for p in self.policies.values()
-            if p.asset_class == policy.asset_class and p.status == PolicyStatus.ACTIVE
-        )
-        
-        total_exposure = sum(
-            p.coverage_amount for p in self.policies.values()
-            if p.status == PolicyStatus.ACTIVE
-        )
-        
-        new_asset_exposure = current_asset_exposure + policy.coverage_amount
-        new_total_exposure = total_exposure + policy.coverage_amount
-        
-        return new_asset_exposure / new_total_exposure if new_total_exposure > 0 else 0.0
-    
-    async def _calculate_correlation_risk_after_addition(self, policy: InsurancePolicy) -> float:
-        """Calculate correlation risk after adding a policy"""
-        # Simplified correlation risk calculation
-        same_asset_policies = [
-            p for p in self.policies.values()
-            if p.asset_class == policy.asset_class and p.status == PolicyStatus.ACTIVE
-        ]
-        
-        if not same_asset_policies:
-            return 0.0
-        
-        # Calculate average correlation with existing policies
-        correlations = []
-        for existing_policy in same_asset_policies:
-            # This would use actual correlation calculation
-            # For now, using asset class correlation
-            correlation = 0.8 if existing_policy.asset_class == policy.asset_class else 0.3
-            correlations.append(correlation)
-        
-        return statistics.mean(correlations) if correlations else 0.0
+    def _calculate_tail_risk(self, sorted_losses: np.ndarray) -> Tuple[float, float]:
+        """Calculate Value at Risk (95% confidence) and Expected Shortfall from ascending losses"""
+        # Simplified VaR/ES calculation
+        if len(sorted_losses) <= 1:
+            total = float(sorted_losses.sum(dtype=np.float64))
+            return total, total
+        
+        # Same linear interpolation as np.percentile(losses, 95), between the two order statistics around it
+        position = 0.95 * (len(sorted_losses) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(sorted_losses) - 1)
+        var_95 = sorted_losses[lower] + (position - lower) * (sorted_losses[upper] - sorted_losses[lower])
+        
+        # The tail is a contiguous suffix of the sorted losses
+        tail_losses = sorted_losses[np.searchsorted(sorted_losses, var_95):]
+        expected_shortfall = tail_losses.mean(dtype=np.float64) if len(tail_losses) else 0.0
+        
+        return float(var_95), float(expected_shortfall)
     
     # Additional methods for stress testing and optimization would be implemented here
-    async def _optimize_risk_adjusted_return(self) -> Dict[str, Any]:
+    def _optimize_risk_adjusted_return(self) -> Dict[str, Any]:
         """Optimize for risk-adjusted return"""
         # This would implement portfolio optimization algorithms
         # For now, returning a simplified result
         return {
             'optimization_objective': 'risk_adjusted_return',
-            'optimal_allocation': await self._calculate_target_allocation(),
+            'optimal_allocation': self._calculate_target_allocation(),
             'expected_return': 0.08,
             'expected_risk': 0.12,
             'sharpe_ratio': 0.67
         }
     
-    async def _optimize_minimum_variance(self) -> Dict[str, Any]:
+    def _optimize_minimum_variance(self) -> Dict[str, Any]:
         """Optimize for minimum variance"""
         return {
             'optimization_objective': 'minimum_variance',
-            'optimal_allocation': await self._calculate_target_allocation(),
+            'optimal_allocation': self._calculate_target_allocation(),
             'expected_variance': 0.05,
             'risk_reduction': 0.03
         }
     
-    async def _optimize_maximum_diversification(self) -> Dict[str, Any]:
+    def _optimize_maximum_diversification(self) -> Dict[str, Any]:
         """Optimize for maximum diversification"""
         return {
             'optimization_objective': 'maximum_diversification',
-            'optimal_allocation': await self._calculate_target_allocation(),
+            'optimal_allocation': self._calculate_target_allocation(),
             'diversification_ratio': 0.85,
             'concentration_reduction': 0.1
         }
     
-    async def _apply_stress_scenario(self, scenario: Dict[str, Any]) -> PortfolioMetrics:
+    def _apply_stress_scenario(self, scenario: Dict[str, Any],
+                               current_metrics: Optional[PortfolioMetrics] = None) -> PortfolioMetrics:
         """Apply stress scenario to portfolio"""
+        return self._apply_stress_scenarios([scenario], current_metrics)[0]
+    
+    def _apply_stress_scenarios(self, scenarios: List[Dict[str, Any]],
+                                current_metrics: Optional[PortfolioMetrics] = None) -> List[PortfolioMetrics]:
+        """Apply several stress scenarios to the same baseline in one broadcast multiply"""
         # This would simulate the impact of stress scenarios
         # For now, returning modified metrics
-        current_metrics = await self.get_portfolio_metrics()
+        if current_metrics is None:
+            current_metrics = self._latest_metrics()
         
         if not current_metrics:
-            return current_metrics
-        
-        # Apply stress multipliers
-        stress_multiplier = scenario.get('stress_multiplier', 1.5)
-        
-        stressed_metrics = PortfolioMetrics(
-            total_coverage=current_metrics.total_coverage,
-            total_premium=current_metrics.total_premium,
-            total_policies=current_metrics.total_policies,
-            average_risk_score=min(1.0, current_metrics.average_risk_score * stress_multiplier),
-            risk_distribution=current_metrics.risk_distribution,
-            asset_allocation=current_metrics.asset_allocation,
-            correlation_matrix=current_metrics.correlation_matrix,
-            diversification_ratio=current_metrics.diversification_ratio * 0.8,
-            sharpe_ratio=current_metrics.sharpe_ratio * 0.7,
-            var_95=current_metrics.var_95 * stress_multiplier,
-            expected_shortfall=current_metrics.expected_shortfall * stress_multiplier,
-            timestamp=datetime.now()
-        )
+            return [current_metrics] * len(scenarios)
+        
+        stressed = self._stress_vectors(scenarios, current_metrics)
+        
+        timestamp = datetime.now()
+        all_stressed = []
+        for vector, values in zip(stressed, stressed.tolist()):
+            stressed_metrics = PortfolioMetrics(
+                total_coverage=current_metrics.total_coverage,
+                total_premium=current_metrics.total_premium,
+                total_policies=current_metrics.total_policies,
+                risk_distribution=current_metrics.risk_distribution,
+                asset_allocation=current_metrics.asset_allocation,
+                correlation_matrix=current_metrics.correlation_matrix,
+                timestamp=timestamp,
+                **dict(zip(_STRESS_FIELDS, values))
+            )
+            stressed_metrics._stress_vec = vector
+            # Same allocation and correlation dicts as the baseline, so its dense caches stay valid
+            stressed_metrics._corr_cache = current_metrics._corr_cache
+            stressed_metrics._allocation_cache = current_metrics._allocation_cache
+            all_stressed.append(stressed_metrics)
         
-        return stressed_metrics
+        return all_stressed
     
-    async def _analyze_stress_impact(self, stressed_metrics: PortfolioMetrics) -> Dict[str, Any]:
+    def _stress_vectors(self, scenarios: List[Dict[str, Any]], current_metrics: PortfolioMetrics) -> np.ndarray:
+        """Stressed _STRESS_FIELDS values, one row per scenario"""
+        # Stress multipliers per _STRESS_FIELDS entry, one row per scenario
+        multipliers = np.array([
+            [stress_multiplier, 0.8, 0.7, stress_multiplier, stress_multiplier]
+            for stress_multiplier in (scenario.get('stress_multiplier', 1.5) for scenario in scenarios)
+        ], dtype=np.float64).reshape(len(scenarios), len(_STRESS_FIELDS))
+        
+        # Scale and clamp in place; the multiplier matrix becomes the result
+        np.multiply(multipliers, current_metrics.stress_vector, out=multipliers)
+        return np.minimum(multipliers, _STRESS_CAP, out=multipliers)
+    
+    def _analyze_stress_impact(self, stressed_metrics: PortfolioMetrics,
+                               current_metrics: Optional[PortfolioMetrics] = None) -> Optional[StressImpact]:
         """Analyze impact of stress scenario"""
-        current_metrics = await self.get_portfolio_metrics()
+        if current_metrics is None:
+            current_metrics = self._latest_metrics()
         
         if not current_metrics:
-            return {}
+            return None
         
-        return {
-            'var_impact': (stressed_metrics.var_95 - current_metrics.var_95) / current_metrics.var_95,
-            'expected_shortfall_impact': (stressed_metrics.expected_shortfall - current_metrics.expected_shortfall) / current_metrics.expected_shortfall,
-            'diversification_impact': (stressed_metrics.diversification_ratio - current_metrics.diversification_ratio) / current_metrics.diversification_ratio,
-            'overall_impact_score': 0.3  # Simplified
-        }
+        # Relative change of each impacted field; a zero baseline raises like a scalar division would
+        baseline = current_metrics.stress_vector[_IMPACT_IDX]
+        with np.errstate(divide='raise', invalid='raise'):
+            impacts = (stressed_metrics.stress_vector[_IMPACT_IDX] - baseline) / baseline
+        
+        return StressImpact(*impacts.tolist(), overall_impact_score=0.3)  # Simplified overall score
     
-    async def _estimate_recovery_time(self, scenario: Dict[str, Any]) -> int:
+    def _estimate_recovery_time(self, scenario: Dict[str, Any]) -> int:
         """Estimate recovery time in days"""
         # This would use historical data and simulation
         # For now, returning a simplified estimate
-        severity = scenario.get('severity', 'medium')
-        
-        recovery_times = {
-            'low': 30,
-            'medium': 90,
-            'high': 180,
-            'extreme': 365
-        }
-        
-        return recovery_times.get(severity, 90)
+        return _RECOVERY_TIMES.get(scenario.get('severity', 'medium'), 90)
     
-    async def _suggest_mitigations(self, scenario: Dict[str, Any]) -> List[str]:
+    def _suggest_mitigations(self, scenario: Dict[str, Any]) -> Tuple[str, ...]:
         """Suggest mitigation strategies"""
-        return [
-            "Increase diversification across asset classes",
-            "Implement dynamic hedging strategies",
-            "Reduce concentration in high-risk assets",
-            "Increase reinsurance coverage",
-            "Implement early warning systems"
-        ]
-    
-    async def _calculate_resilience_score(self, stress_results: Dict[str, Any]) -> float:
+        return _STRESS_MITIGATIONS
+    
+    def _calculate_resilience_score(self, stress_results: Dict[str, Any]) -> float:
         """Calculate overall portfolio resilience score"""
         # Simplified resilience score
         return 0.75  # Would be based on stress test results
     
-    async def _generate_stress_recommendations(self, stress_results: Dict[str, Any]) -> List[str]:
+    def _generate_stress_recommendations(self, stress_results: Dict[str, Any]) -> Tuple[str, ...]:
         """Generate recommendations based on stress test results"""
-        return [
-            "Reduce concentration in crypto assets",
-            "Increase weather insurance allocation",
-            "Implement correlation-based hedging",
-            "Review risk limits and constraints"
-        ]
+        return _STRESS_RECOMMENDATIONS
 
 
 class RiskDiversificationSystem:
@@ -863,58 +1089,66 @@ class RiskDiversificationSystem:
         self.diversification_rules = []
         self.monitoring_alerts = []
         
+        # Rule type -> check; every check takes (rule, asset_concentration)
+        self._rule_checks = {
+            'asset_concentration': self._check_asset_concentration_rule,
+            'correlation_limit': self._check_correlation_limit_rule,
+            'geographic_diversification': self._check_geographic_diversification_rule
+        }
+        
     async def add_diversification_rule(self, rule: Dict[str, Any]):
         """Add a diversification rule"""
         self.diversification_rules.append(rule)
         logger.info(f"Diversification rule added: {rule}")
     
-    async def check_diversification_rules(self) -> List[Dict[str, Any]]:
+    async def check_diversification_rules(self) -> List[RuleViolation]:
         """Check all diversification rules"""
-        violations = []
+        if not self.diversification_rules:
+            return []
         
-        for rule in self.diversification_rules:
-            violation = await self._check_rule(rule)
-            if violation:
-                violations.append(violation)
+        # Rule checks are synchronous reads of the same portfolio state, so they share one snapshot
+        asset_concentration = self.portfolio_manager._asset_concentration_array()
+        violations = (self._check_rule(rule, asset_concentration) for rule in self.diversification_rules)
         
-        return violations
+        return [violation for violation in violations if violation]
     
-    async def _check_rule(self, rule: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _check_rule(self, rule: Dict[str, Any],
+                    asset_concentration: Optional[Tuple[Tuple[str, ...], np.ndarray]] = None) -> Optional[RuleViolation]:
         """Check a specific diversification rule"""
-        rule_type = rule.get('type')
-        
-        if rule_type == 'asset_concentration':
-            return await self._check_asset_concentration_rule(rule)
-        elif rule_type == 'correlation_limit':
-            return await self._check_correlation_limit_rule(rule)
-        elif rule_type == 'geographic_diversification':
-            return await self._check_geographic_diversification_rule(rule)
-        
-        return None
+        check = self._rule_checks.get(rule.get('type'))
+        return check(rule, asset_concentration) if check else None
     
-    async def _check_asset_concentration_rule(self, rule: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _check_asset_concentration_rule(self, rule: Dict[str, Any],
+                                        asset_concentration: Optional[Tuple[Tuple[str, ...], np.ndarray]] = None) -> Optional[RuleViolation]:
         """Check asset concentration rule"""
         max_concentration = rule.get('max_concentration', 0.3)
-        asset_concentration = await self.portfolio_manager._calculate_asset_concentration()
-        
-        for asset_class, concentration in asset_concentration.items():
-            if concentration > max_concentration:
-                return {
-                    'rule_type': 'asset_concentration',
-                    'asset_class': asset_class,
-                    'current_concentration': concentration,
-                    'max_allowed': max_concentration,
-                    'violation_severity': 'high' if concentration > max_concentration * 1.5 else 'medium'
-                }
-        
-        return None
+        if asset_concentration is None:
+            asset_concentration = self.portfolio_manager._asset_concentration_array()
+        asset_classes, concentrations = asset_concentration
+        
+        over_limit = concentrations > max_concentration
+        if not over_limit.any():
+            return None
+        
+        # First asset class over the limit
+        i = int(np.argmax(over_limit))
+        concentration = float(concentrations[i])
+        return RuleViolation(
+            rule_type='asset_concentration',
+            asset_class=asset_classes[i],
+            current_concentration=concentration,
+            max_allowed=max_concentration,
+            violation_severity='high' if concentration > max_concentration * 1.5 else 'medium'
+        )
     
-    async def _check_correlation_limit_rule(self, rule: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _check_correlation_limit_rule(self, rule: Dict[str, Any],
+                                      asset_concentration: Optional[Tuple[Tuple[str, ...], np.ndarray]] = None) -> Optional[RuleViolation]:
         """Check correlation limit rule"""
         # Simplified correlation check
         return None
     
-    async def _check_geographic_diversification_rule(self, rule: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _check_geographic_diversification_rule(self, rule: Dict[str, Any],
+                                               asset_concentration: Optional[Tuple[Tuple[str, ...], np.ndarray]] = None) -> Optional[RuleViolation]:
         """Check geographic diversification rule"""
         # Simplified geographic diversification check
         return None
@@ -926,20 +1160,15 @@ class RiskDiversificationSystem:
         
         return {
             'diversification_score': metrics.diversification_ratio if metrics else 0.0,
-            'rule_violations': violations,
-            'recommendations': await self._generate_diversification_recommendations(),
+            'rule_violations': [asdict(violation) for violation in violations],
+            'recommendations': self._generate_diversification_recommendations(),
             'monitoring_alerts': self.monitoring_alerts,
             'timestamp': datetime.now().isoformat()
         }
     
-    async def _generate_diversification_recommendations(self) -> List[str]:
+    def _generate_diversification_recommendations(self) -> Tuple[str, ...]:
         """Generate diversification recommendations"""
-        return [
-            "Consider adding more asset classes to the portfolio",
-            "Reduce correlation between existing positions",
-            "Implement geographic diversification strategies",
-            "Review and update diversification rules regularly"
-        ]
+        return _DIVERSIFICATION_RECOMMENDATIONS
 
 
 # Utility functions
@@ -955,11 +1184,13 @@ async def create_diversification_system(portfolio_manager: PortfolioManager) ->
 
 async def create_sample_portfolio() -> List[InsurancePolicy]:
     """Create sample policies for testing"""
-    policies = []
+    # One policy period shared by every sample policy
+    start_date = datetime.now()
+    end_date = start_date + timedelta(days=30)
     
     # Weather insurance policies
-    for i in range(5):
-        policy = InsurancePolicy(
+    policies = [
+        InsurancePolicy(
             policy_id=f"weather_{i}",
             contract_id=f"contract_weather_{i}",
             policy_holder=f"holder_{i}",
@@ -970,16 +1201,17 @@ async def create_sample_portfolio() -> List[InsurancePolicy]:
             risk_score=0.3 + i * 0.1,
             risk_level=RiskLevel.MEDIUM,
             trigger_conditions={"weather_event": "typhoon"},
-            start_date=datetime.now(),
-            end_date=datetime.now() + timedelta(days=30),
+            start_date=start_date,
+            end_date=end_date,
             status=PolicyStatus.ACTIVE,
             metadata={"location": "Tokyo"}
         )
-        policies.append(policy)
+        for i in range(5)
+    ]
     
     # Crypto insurance policies
-    for i in range(3):
-        policy = InsurancePolicy(
+    policies.extend(
+        InsurancePolicy(
             policy_id=f"crypto_{i}",
             contract_id=f"contract_crypto_{i}",
             policy_holder=f"holder_{i+5}",
@@ -990,11 +1222,12 @@ async def create_sample_portfolio() -> List[InsurancePolicy]:
             risk_score=0.4 + i * 0.1,
             risk_level=RiskLevel.HIGH,
             trigger_conditions={"crypto_symbol": "BTC"},
-            start_date=datetime.now(),
-            end_date=datetime.now() + timedelta(days=30),
+            start_date=start_date,
+            end_date=end_date,
             status=PolicyStatus.ACTIVE,
             metadata={"symbol": "BTC"}
         )
-        policies.append(policy)
+        for i in range(3)
+    )
     
     return policies
\ No newline at end of file
@@ -3,580 +3,149 @@
 Risk Assessment Integration Test Suite
 
 This test suite validates the integration between all risk assessment components.
+Each module is parsed once and checked against the declarative MODULE_SPEC table;
+run with `python -m pytest -n auto agents/risk/tests/` to fan modules out across cores.
 """
 
 import sys
-import os
-import asyncio
+import ast
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, timedelta
+
+import pytest
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-def test_risk_module_structure():
-    """Test that all risk module components are properly structured"""
-    print("📁 Testing Risk Module Structure...")
-    
-    try:
-        # Test risk module directory
-        risk_dir = project_root / "agents" / "risk"
-        assert risk_dir.exists()
-        print(f"   ✅ Risk directory exists: {risk_dir}")
-        
-        # Test module files
-        expected_files = [
-            "__init__.py",
-            "models.py",
-            "calculator.py",
-            "portfolio.py",
-            "metrics.py",
-            "dashboard.py"
-        ]
-        
-        for file_name in expected_files:
-            file_path = risk_dir / file_name
-            assert file_path.exists()
-            print(f"   ✅ Module file exists: {file_name}")
-        
-        # Test tests directory
-        tests_dir = risk_dir / "tests"
-        assert tests_dir.exists()
-        print(f"   ✅ Tests directory exists: {tests_dir}")
-        
-        print("✅ Risk Module Structure tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Module Structure tests failed: {e}")
-        return False
+risk_dir = project_root / "agents" / "risk"
+
+MODULES = ["models.py", "calculator.py", "portfolio.py", "metrics.py", "dashboard.py"]
+
+# Source-style declarations each module must contain
+MODULE_SPEC = {
+    "__init__.py": [
+        "from .models import",
+        "from .calculator import",
+        "from .portfolio import",
+        "from .metrics import",
+        "from .dashboard import"
+    ],
+    "models.py": [
+        "@dataclass",
+        "class RiskLevel(Enum):",
+        "class RiskPrediction:",
+        "class TimeSeriesData:",
+        "class AnomalyResult:",
+        "class RiskAssessmentModel",
+        "class TimeSeriesPredictor",
+        "class RandomForestRiskClassifier",
+        "class AnomalyDetector",
+        "class ModelEnsemble"
+    ],
+    "calculator.py": [
+        "class PricingModel(Enum):",
+        "class RealTimeRiskCalculator",
+        "class DynamicPricingEngine",
+        "class RiskFactors",
+        "class RiskCalculationResult",
+        "async def calculate_risk",
+        "async def calculate_dynamic_price",
+        "from .models import",
+        "from ..data.weather import",
+        "from ..data.flight import",
+        "from ..data.crypto import"
+    ],
+    "portfolio.py": [
+        "class AssetClass(Enum):",
+        "class PolicyStatus(Enum):",
+        "class PortfolioManager",
+        "class RiskDiversificationSystem",
+        "class InsurancePolicy",
+        "class PortfolioMetrics",
+        "async def add_policy",
+        "async def get_portfolio_metrics"
+    ],
+    "metrics.py": [
+        "class MetricType(Enum):",
+        "class TimeFrame(Enum):",
+        "class RiskMetrics",
+        "class PerformanceAnalyzer",
+        "class MetricResult",
+        "class PerformanceReport",
+        "async def calculate_return_metrics",
+        "async def calculate_risk_metrics"
+    ],
+    "dashboard.py": [
+        "class AlertSeverity(Enum):",
+        "class AlertType(Enum):",
+        "class RiskDashboard",
+        "class AlertSystem",
+        "class Alert",
+        "class DashboardWidget",
+        "async def start_dashboard",
+        "async def _trigger_alert"
+    ]
+}
 
-def test_risk_models_structure():
-    """Test risk models structure"""
-    print("\n🤖 Testing Risk Models Structure...")
-    
-    try:
-        risk_models_path = project_root / "agents" / "risk" / "models.py"
-        assert risk_models_path.exists()
-        
-        with open(risk_models_path, 'r') as f:
-            content = f.read()
-        
-        # Check for key components
-        key_components = [
-            "class RiskLevel",
-            "class RiskPrediction",
-            "class RiskAssessmentModel",
-            "class TimeSeriesPredictor",
-            "class RandomForestRiskClassifier",
-            "class AnomalyDetector",
-            "class ModelEnsemble"
-        ]
-        
-        for component in key_components:
-            assert component in content
-            print(f"   ✅ Found component: {component}")
-        
-        print("✅ Risk Models Structure tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Models Structure tests failed: {e}")
-        return False
 
-def test_risk_calculator_structure():
-    """Test risk calculator structure"""
-    print("\n⚡ Testing Risk Calculator Structure...")
-    
-    try:
-        calculator_path = project_root / "agents" / "risk" / "calculator.py"
-        assert calculator_path.exists()
-        
-        with open(calculator_path, 'r') as f:
-            content = f.read()
-        
-        # Check for key components
-        key_components = [
-            "class RealTimeRiskCalculator",
-            "class DynamicPricingEngine",
-            "class RiskFactors",
-            "class RiskCalculationResult",
-            "async def calculate_risk",
-            "async def calculate_dynamic_price"
-        ]
-        
-        for component in key_components:
-            assert component in content
-            print(f"   ✅ Found component: {component}")
-        
-        print("✅ Risk Calculator Structure tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Calculator Structure tests failed: {e}")
-        return False
+@lru_cache(maxsize=None)
+def _nodes(path: Path) -> tuple:
+    """Every AST node of a module, parsed once per test run"""
+    return tuple(ast.walk(ast.parse(path.read_text())))
 
-def test_portfolio_manager_structure():
-    """Test portfolio manager structure"""
-    print("\n📊 Testing Portfolio Manager Structure...")
-    
-    try:
-        portfolio_path = project_root / "agents" / "risk" / "portfolio.py"
-        assert portfolio_path.exists()
-        
-        with open(portfolio_path, 'r') as f:
-            content = f.read()
-        
-        # Check for key components
-        key_components = [
-            "class PortfolioManager",
-            "class RiskDiversificationSystem",
-            "class InsurancePolicy",
-            "class PortfolioMetrics",
-            "async def add_policy",
-            "async def get_portfolio_metrics"
-        ]
-        
-        for component in key_components:
-            assert component in content
-            print(f"   ✅ Found component: {component}")
-        
-        print("✅ Portfolio Manager Structure tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Portfolio Manager Structure tests failed: {e}")
-        return False
 
-def test_risk_metrics_structure():
-    """Test risk metrics structure"""
-    print("\n📈 Testing Risk Metrics Structure...")
-    
-    try:
-        metrics_path = project_root / "agents" / "risk" / "metrics.py"
-        assert metrics_path.exists()
-        
-        with open(metrics_path, 'r') as f:
-            content = f.read()
-        
-        # Check for key components
-        key_components = [
-            "class RiskMetrics",
-            "class PerformanceAnalyzer",
-            "class MetricResult",
-            "class PerformanceReport",
-            "async def calculate_return_metrics",
-            "async def calculate_risk_metrics"
-        ]
-        
-        for component in key_components:
-            assert component in content
-            print(f"   ✅ Found component: {component}")
-        
-        print("✅ Risk Metrics Structure tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Metrics Structure tests failed: {e}")
-        return False
+@lru_cache(maxsize=None)
+def _declarations(path: Path) -> frozenset:
+    """Source-style declarations found in a module, collected in a single pass over its AST"""
+    found = set()
+    for node in _nodes(path):
+        if isinstance(node, ast.ClassDef):
+            found.add(f"class {node.name}")
+            found.update(f"class {node.name}({ast.unparse(base)})" for base in node.bases)
+            if any(ast.unparse(decorator).split("(")[0] == "dataclass" for decorator in node.decorator_list):
+                found.add("@dataclass")
+        elif isinstance(node, ast.AsyncFunctionDef):
+            found.add(f"async def {node.name}")
+        elif isinstance(node, ast.ImportFrom):
+            found.add(f"from {'.' * node.level}{node.module or ''} import")
+    return frozenset(found)
 
-def test_dashboard_structure():
-    """Test dashboard structure"""
-    print("\n🎛️ Testing Dashboard Structure...")
-    
-    try:
-        dashboard_path = project_root / "agents" / "risk" / "dashboard.py"
-        assert dashboard_path.exists()
-        
-        with open(dashboard_path, 'r') as f:
-            content = f.read()
-        
-        # Check for key components
-        key_components = [
-            "class RiskDashboard",
-            "class AlertSystem",
-            "class Alert",
-            "class DashboardWidget",
-            "async def start_dashboard",
-            "async def _trigger_alert"
-        ]
-        
-        for component in key_components:
-            assert component in content
-            print(f"   ✅ Found component: {component}")
-        
-        print("✅ Dashboard Structure tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Dashboard Structure tests failed: {e}")
-        return False
 
-def test_risk_init_structure():
-    """Test risk module init structure"""
-    print("\n📦 Testing Risk Module Init Structure...")
-    
-    try:
-        # Test risk __init__.py
-        risk_init = project_root / "agents" / "risk" / "__init__.py"
-        assert risk_init.exists()
-        
-        with open(risk_init, 'r') as f:
-            init_content = f.read()
-        
-        # Check for key imports
-        key_imports = [
-            "from .models import",
-            "from .calculator import",
-            "from .portfolio import",
-            "from .metrics import",
-            "from .dashboard import"
-        ]
-        
-        for import_line in key_imports:
-            assert import_line in init_content
-            print(f"   ✅ Found import: {import_line}")
-        
-        print("✅ Risk Module Init Structure tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Module Init Structure tests failed: {e}")
-        return False
+def test_risk_module_structure():
+    """Test that all risk module components are properly structured"""
+    assert risk_dir.exists()
 
-def test_risk_data_structures():
-    """Test risk data structures"""
-    print("\n🏗️ Testing Risk Data Structures...")
-    
-    try:
-        # Test models.py for data structures
-        models_path = project_root / "agents" / "risk" / "models.py"
-        assert models_path.exists()
-        
-        with open(models_path, 'r') as f:
-            content = f.read()
-        
-        # Check for key data structures
-        key_structures = [
-            "@dataclass",
-            "class RiskPrediction:",
-            "class TimeSeriesData:",
-            "class AnomalyResult:",
-            "class RiskLevel(Enum):"
-        ]
-        
-        for structure in key_structures:
-            assert structure in content
-            print(f"   ✅ Found structure: {structure}")
-        
-        print("✅ Risk Data Structures tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Data Structures tests failed: {e}")
-        return False
+    for file_name in MODULE_SPEC:
+        assert (risk_dir / file_name).exists(), f"Missing module file: {file_name}"
 
-def test_risk_integration_dependencies():
-    """Test risk integration dependencies"""
-    print("\n🔗 Testing Risk Integration Dependencies...")
-    
-    try:
-        # Test calculator.py dependencies
-        calculator_path = project_root / "agents" / "risk" / "calculator.py"
-        assert calculator_path.exists()
-        
-        with open(calculator_path, 'r') as f:
-            content = f.read()
-        
-        # Check for dependency imports
-        dependencies = [
-            "from .models import",
-            "from ..data.weather import",
-            "from ..data.flight import",
-            "from ..data.crypto import"
-        ]
-        
-        for dep in dependencies:
-            assert dep in content
-            print(f"   ✅ Found dependency: {dep}")
-        
-        print("✅ Risk Integration Dependencies tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Integration Dependencies tests failed: {e}")
-        return False
+    assert (risk_dir / "tests").exists()
 
-def test_risk_async_patterns():
-    """Test risk async patterns"""
-    print("\n🔄 Testing Risk Async Patterns...")
-    
-    try:
-        # Check async patterns across modules
-        modules = [
-            "models.py",
-            "calculator.py",
-            "portfolio.py",
-            "metrics.py",
-            "dashboard.py"
-        ]
-        
-        for module in modules:
-            module_path = project_root / "agents" / "risk" / module
-            assert module_path.exists()
-            
-            with open(module_path, 'r') as f:
-                content = f.read()
-            
-            # Check for async patterns
-            async_patterns = [
-                "async def",
-                "await "
-            ]
-            
-            has_async = any(pattern in content for pattern in async_patterns)
-            assert has_async, f"No async patterns found in {module}"
-            print(f"   ✅ Async patterns found in {module}")
-        
-        print("✅ Risk Async Patterns tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Async Patterns tests failed: {e}")
-        return False
 
-def test_risk_error_handling():
-    """Test risk error handling"""
-    print("\n🚨 Testing Risk Error Handling...")
-    
-    try:
-        # Check error handling patterns
-        modules = [
-            "models.py",
-            "calculator.py",
-            "portfolio.py",
-            "metrics.py",
-            "dashboard.py"
-        ]
-        
-        for module in modules:
-            module_path = project_root / "agents" / "risk" / module
-            assert module_path.exists()
-            
-            with open(module_path, 'r') as f:
-                content = f.read()
-            
-            # Check for error handling
-            error_patterns = [
-                "try:",
-                "except Exception as e:",
-                "logger.error"
-            ]
-            
-            has_error_handling = any(pattern in content for pattern in error_patterns)
-            assert has_error_handling, f"No error handling found in {module}"
-            print(f"   ✅ Error handling found in {module}")
-        
-        print("✅ Risk Error Handling tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Error Handling tests failed: {e}")
-        return False
+@pytest.mark.parametrize("module,components", list(MODULE_SPEC.items()))
+def test_module_declarations(module, components):
+    """Test that a module declares its expected classes, enums, coroutines and imports"""
+    declarations = _declarations(risk_dir / module)
+    missing = [component for component in components if component.rstrip(":") not in declarations]
+    assert not missing, f"{module} is missing: {missing}"
 
-def test_risk_typing_annotations():
-    """Test risk typing annotations"""
-    print("\n🏷️ Testing Risk Typing Annotations...")
-    
-    try:
-        # Check typing annotations
-        modules = [
-            "models.py",
-            "calculator.py",
-            "portfolio.py",
-            "metrics.py",
-            "dashboard.py"
-        ]
-        
-        for module in modules:
-            module_path = project_root / "agents" / "risk" / module
-            assert module_path.exists()
-            
-            with open(module_path, 'r') as f:
-                content = f.read()
-            
-            # Check for typing imports and annotations
-            typing_patterns = [
-                "from typing import",
-                "-> Dict[str, Any]",
-                "-> List[",
-                "-> Optional[",
-                ": str",
-                ": float",
-                ": int"
-            ]
-            
-            has_typing = any(pattern in content for pattern in typing_patterns)
-            assert has_typing, f"No typing annotations found in {module}"
-            print(f"   ✅ Typing annotations found in {module}")
-        
-        print("✅ Risk Typing Annotations tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Typing Annotations tests failed: {e}")
-        return False
 
-def test_risk_enum_definitions():
-    """Test risk enum definitions"""
-    print("\n🔢 Testing Risk Enum Definitions...")
-    
-    try:
-        # Check enum definitions
-        modules_enums = {
-            "models.py": ["RiskLevel"],
-            "calculator.py": ["PricingModel"],
-            "portfolio.py": ["AssetClass", "PolicyStatus"],
-            "metrics.py": ["MetricType", "TimeFrame"],
-            "dashboard.py": ["AlertSeverity", "AlertType"]
-        }
-        
-        for module, expected_enums in modules_enums.items():
-            module_path = project_root / "agents" / "risk" / module
-            assert module_path.exists()
-            
-            with open(module_path, 'r') as f:
-                content = f.read()
-            
-            for enum_name in expected_enums:
-                assert f"class {enum_name}(Enum):" in content
-                print(f"   ✅ Found enum {enum_name} in {module}")
-        
-        print("✅ Risk Enum Definitions tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Enum Definitions tests failed: {e}")
-        return False
+@pytest.mark.parametrize("module", MODULES)
+def test_module_patterns(module):
+    """Test async, error handling and typing patterns in a module"""
+    nodes = _nodes(risk_dir / module)
 
-def test_risk_module_integration():
-    """Test risk module integration"""
-    print("\n🔗 Testing Risk Module Integration...")
-    
-    try:
-        # Test that modules can import each other
-        import_tests = [
-            ("models", ["RiskLevel", "RiskPrediction"]),
-            ("calculator", ["RealTimeRiskCalculator", "DynamicPricingEngine"]),
-            ("portfolio", ["PortfolioManager", "InsurancePolicy"]),
-            ("metrics", ["RiskMetrics", "PerformanceAnalyzer"]),
-            ("dashboard", ["RiskDashboard", "AlertSystem"])
-        ]
-        
-        for module_name, expected_classes in import_tests:
-            module_path = project_root / "agents" / "risk" / f"{module_name}.py"
-            assert module_path.exists()
-            
-            with open(module_path, 'r') as f:
-                content = f.read()
-            
-            for class_name in expected_classes:
-                assert f"class {class_name}" in content
-                print(f"   ✅ Found class {class_name} in {module_name}.py")
-        
-        print("✅ Risk Module Integration tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Risk Module Integration tests failed: {e}")
-        return False
+    assert any(isinstance(node, (ast.AsyncFunctionDef, ast.Await)) for node in nodes), \
+        f"No async patterns found in {module}"
+    assert any(isinstance(node, ast.Try) and node.handlers for node in nodes), \
+        f"No error handling found in {module}"
+    assert any(
+        (isinstance(node, ast.ImportFrom) and node.module == "typing")
+        or (isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.returns is not None)
+        or isinstance(node, ast.AnnAssign)
+        for node in nodes
+    ), f"No typing annotations found in {module}"
 
-def main():
-    """Main test function"""
-    print("🚀 Starting Risk Assessment Integration Tests")
-    print("=" * 60)
-    
-    # Run tests
-    tests = [
-        test_risk_module_structure,
-        test_risk_models_structure,
-        test_risk_calculator_structure,
-        test_portfolio_manager_structure,
-        test_risk_metrics_structure,
-        test_dashboard_structure,
-        test_risk_init_structure,
-        test_risk_data_structures,
-        test_risk_integration_dependencies,
-        test_risk_async_patterns,
-        test_risk_error_handling,
-        test_risk_typing_annotations,
-        test_risk_enum_definitions,
-        test_risk_module_integration
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            result = test()
-            if result:
-                passed += 1
-            else:
-                failed += 1
-        except Exception as e:
-            print(f"❌ {test.__name__} failed with exception: {e}")
-            failed += 1
-    
-    # Summary
-    print("\n" + "=" * 60)
-    print("📊 Test Summary")
-    print("=" * 60)
-    
-    total_tests = len(tests)
-    print(f"Total tests: {total_tests}")
-    print(f"Passed: {passed}")
-    print(f"Failed: {failed}")
-    print(f"Success rate: {(passed/total_tests)*100:.1f}%")
-    
-    if failed == 0:
-        print("\n🎉 All risk assessment integration tests passed!")
-        print("✅ Phase 3: Advanced Risk Assessment Models - STRUCTURE VALIDATED")
-        
-        print("\n📋 Phase 3 Structure Summary:")
-        print("   - ✅ Risk Models: AI/ML models for risk prediction")
-        print("   - ✅ Risk Calculator: Real-time risk calculation engine")
-        print("   - ✅ Portfolio Manager: Portfolio optimization and management")
-        print("   - ✅ Risk Metrics: Comprehensive risk and performance metrics")
-        print("   - ✅ Dashboard: Real-time monitoring and alerting system")
-        print("   - ✅ Integration: Seamless module integration")
-        print("   - ✅ Error Handling: Robust error management")
-        print("   - ✅ Async Patterns: Efficient asynchronous operations")
-        
-        print("\n📊 Implementation Progress:")
-        print("   - 🤖 AI/ML Models: 100% complete")
-        print("   - ⚡ Real-time Calculator: 100% complete")
-        print("   - 📊 Portfolio Management: 100% complete")
-        print("   - 📈 Risk Metrics: 100% complete")
-        print("   - 🎛️ Dashboard & Alerts: 100% complete")
-        print("   - 🧪 Testing Framework: 100% complete")
-        
-        print("\n🎯 Phase 3 Achievements:")
-        print("   1. Advanced ML-based risk assessment models")
-        print("   2. Real-time risk calculation and pricing engine")
-        print("   3. Comprehensive portfolio management system")
-        print("   4. Advanced risk metrics and performance analysis")
-        print("   5. Real-time dashboard and alerting system")
-        print("   6. Time series analysis and anomaly detection")
-        print("   7. Stress testing and scenario analysis")
-        print("   8. Risk diversification and optimization")
-        
-        print("\n🚀 Ready for Phase 4: Web UI and API Server")
-        return 0
-    else:
-        print(f"\n❌ {failed} test(s) failed")
-        return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))
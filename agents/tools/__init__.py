@@ -1,4 +1,4 @@
 """Tools for LangGraph agents"""
-from .insurance import collect_event_data, calculate_loss_ratio
+from .insurance import collect_event_data, calculate_loss_ratio, calculate_loss_ratios_np
 
-__all__ = ["collect_event_data", "calculate_loss_ratio"]
\ No newline at end of file
+__all__ = ["collect_event_data", "calculate_loss_ratio", "calculate_loss_ratios_np"]
\ No newline at end of file
@@ -1,9 +1,53 @@
 """Insurance-related tools for V0.1 MVP"""
 import random
+from types import MappingProxyType
 from typing import Dict, Any
+import numpy as np
 from langchain_core.tools import tool
 
 
+# Mock data for different event types (read-only; collect_event_data copies the entry it returns)
+_MOCK_DATA = MappingProxyType({
+    "typhoon": MappingProxyType({
+        "event_type": "typhoon",
+        "historical_frequency": 0.15,  # 15% chance per year
+        "average_damage": 150000,  # USD
+        "affected_regions": ["Tokyo", "Osaka", "Kyoto"],
+        "season": "summer",
+        "data_source": "JMA_historical_data_mock"
+    }),
+    "flight_delay": MappingProxyType({
+        "event_type": "flight_delay",
+        "historical_frequency": 0.25,  # 25% chance for 2+ hour delays
+        "average_delay": 3.5,  # hours
+        "affected_airports": ["NRT", "HND", "KIX"],
+        "peak_season": "summer",
+        "data_source": "aviation_api_mock"
+    }),
+    "earthquake": MappingProxyType({
+        "event_type": "earthquake",
+        "historical_frequency": 0.08,  # 8% chance for major quakes
+        "average_magnitude": 6.2,
+        "affected_regions": ["Kanto", "Kansai", "Kyushu"],
+        "depth": "shallow",
+        "data_source": "usgs_mock"
+    })
+})
+
+# Loss ratio multipliers by event type
+_MULTIPLIERS = MappingProxyType({
+    "typhoon": 1.2,
+    "earthquake": 1.5,
+    "flight_delay": 0.8,
+    "flood": 1.3,
+    "drought": 1.1
+})
+
+# Event type -> slot in _MULT_LUT; the extra last slot holds the 1.0 multiplier for unknown types
+_MULT_INDEX = {event_type: i for i, event_type in enumerate(_MULTIPLIERS)}
+_MULT_LUT = np.array([*_MULTIPLIERS.values(), 1.0])
+
+
 @tool
 async def collect_event_data(event_type: str) -> Dict[str, Any]:
     """
@@ -17,40 +61,15 @@ async def collect_event_data(event_type: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing event data with historical statistics
     """
-    # Mock data for different event types
-    mock_data = {
-        "typhoon": {
-            "event_type": "typhoon",
-            "historical_frequency": 0.15,  # 15% chance per year
-            "average_damage": 150000,  # USD
-            "affected_regions": ["Tokyo", "Osaka", "Kyoto"],
-            "season": "summer",
-            "data_source": "JMA_historical_data_mock"
-        },
-        "flight_delay": {
-            "event_type": "flight_delay",
-            "historical_frequency": 0.25,  # 25% chance for 2+ hour delays
-            "average_delay": 3.5,  # hours
-            "affected_airports": ["NRT", "HND", "KIX"],
-            "peak_season": "summer",
-            "data_source": "aviation_api_mock"
-        },
-        "earthquake": {
-            "event_type": "earthquake",
-            "historical_frequency": 0.08,  # 8% chance for major quakes
-            "average_magnitude": 6.2,
-            "affected_regions": ["Kanto", "Kansai", "Kyushu"],
-            "depth": "shallow",
-            "data_source": "usgs_mock"
-        }
-    }
-    
     # Return mock data with some randomization
-    base_data = mock_data.get(event_type, {
-        "event_type": event_type,
-        "historical_frequency": random.uniform(0.05, 0.30),
-        "data_source": "generic_mock"
-    })
+    if event_type in _MOCK_DATA:
+        base_data = dict(_MOCK_DATA[event_type])
+    else:
+        base_data = {
+            "event_type": event_type,
+            "historical_frequency": random.uniform(0.05, 0.30),
+            "data_source": "generic_mock"
+        }
     
     # Add some random variation to make it more realistic
     if "historical_frequency" in base_data:
@@ -84,15 +103,7 @@ async def calculate_loss_ratio(event_data: Dict[str, Any]) -> float:
     # Adjust based on event type
     event_type = event_data.get("event_type", "")
     
-    multipliers = {
-        "typhoon": 1.2,
-        "earthquake": 1.5,
-        "flight_delay": 0.8,
-        "flood": 1.3,
-        "drought": 1.1
-    }
-    
-    multiplier = multipliers.get(event_type, 1.0)
+    multiplier = _MULTIPLIERS.get(event_type, 1.0)
     
     # Calculate base loss ratio
     base_ratio = frequency * multiplier
@@ -104,4 +115,25 @@ async def calculate_loss_ratio(event_data: Dict[str, Any]) -> float:
     # Ensure ratio is within reasonable bounds
     loss_ratio = min(max(adjusted_ratio, 0.0), 0.95)
     
-    return round(loss_ratio, 4)
\ No newline at end of file
+    return round(loss_ratio, 4)
+
+
+def calculate_loss_ratios_np(freqs: np.ndarray, types: np.ndarray, confs: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_loss_ratio for batch event scoring.
+    
+    Args:
+        freqs: Historical frequencies, one per event
+        types: Event types, one per event
+        confs: Confidence levels, one per event
+        
+    Returns:
+        Loss ratios clipped to [0.0, 0.95] and rounded to 4 decimals
+    """
+    # Map only the distinct event types to LUT slots, then broadcast back per event
+    unique_types, inverse = np.unique(np.asarray(types, dtype=str), return_inverse=True)
+    slots = np.array([_MULT_INDEX.get(t, len(_MULT_INDEX)) for t in unique_types.tolist()], dtype=np.intp)
+    multipliers = _MULT_LUT[slots][inverse.reshape(-1)]
+    
+    ratios = np.asarray(freqs, dtype=np.float64) * multipliers * np.asarray(confs, dtype=np.float64)
+    return np.clip(ratios, 0.0, 0.95).round(4)
\ No newline at end of file
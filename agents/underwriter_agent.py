@@ -46,6 +46,7 @@ from .pricing.nodes import (
     pricing_calculation_node,
     pricing_report_node
 )
+from .pricing.kernels import warm_up as warm_up_pricing_kernels
 
 
 class UnderwriterAgent:
@@ -59,6 +60,7 @@ class UnderwriterAgent:
         """
         self.simulation_years = simulation_years
         self.enable_audit_trail = enable_audit_trail
+        warm_up_pricing_kernels()  # 첫 요청 전에 Monte Carlo 집계 커널 JIT 컴파일
         self.graph = self._create_graph()
         self.agent = self.graph.compile()
     
@@ -1,41 +1,63 @@
 from typing import Dict, Any, List, Optional
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from .state import AgentState, SolanaAgentState
 from .tools import get_solana_tools, get_tool_by_name
 import re
 import json
 
+# Base58 Solana address / signature
+_ADDR_RE = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}')
+
+# Intent keywords, in priority order
+_INTENT_KEYWORDS = (
+    ("check_balance", ("balance", "bal", "how much")),
+    ("transaction_info", ("transaction", "tx", "transfer")),
+    ("verify_signature", ("signature", "sig", "verify", "validate")),
+    ("account_info", ("account", "info", "details"))
+)
+
+
+def _last_message(state: SolanaAgentState, index_key: str, message_type: type) -> Optional[BaseMessage]:
+    """Latest message of message_type, read through the index pointer kept in state"""
+    idx = state.get(index_key)
+    if idx is not None:
+        return state["messages"][idx]
+    
+    # Pointer not seeded (state built outside run_solana_agent): scan back from the end
+    for msg in reversed(state["messages"]):
+        if isinstance(msg, message_type):
+            return msg
+    return None
+
+
+def _classify_intent(text: str) -> str:
+    """Highest-priority intent whose keyword appears in text"""
+    text = text.lower()
+    for intent, keywords in _INTENT_KEYWORDS:
+        for keyword in keywords:
+            if keyword in text:
+                return intent
+    return "general_query"
+
 
 def think_node(state: SolanaAgentState) -> SolanaAgentState:
     """Thinking node - analyzes the input and determines intent"""
     state["current_step"] = "thinking"
     
     # Get the last human message
-    human_messages = [msg for msg in state["messages"] if isinstance(msg, HumanMessage)]
-    if not human_messages:
+    human_message = _last_message(state, "last_human_idx", HumanMessage)
+    if human_message is None:
         state["intent"] = "no_input"
         return state
     
-    last_message = human_messages[-1].content.lower()
-    
     # Intent classification
-    if any(keyword in last_message for keyword in ["balance", "bal", "how much"]):
-        state["intent"] = "check_balance"
-    elif any(keyword in last_message for keyword in ["transaction", "tx", "transfer"]):
-        state["intent"] = "transaction_info"
-    elif any(keyword in last_message for keyword in ["signature", "sig", "verify", "validate"]):
-        state["intent"] = "verify_signature"
-    elif any(keyword in last_message for keyword in ["account", "info", "details"]):
-        state["intent"] = "account_info"
-    else:
-        state["intent"] = "general_query"
+    state["intent"] = _classify_intent(human_message.content)
     
     # Extract Solana addresses, signatures, or transaction hashes
-    address_pattern = r'[1-9A-HJ-NP-Za-km-z]{32,44}'
-    matches = re.findall(address_pattern, human_messages[-1].content)
+    match = _ADDR_RE.search(human_message.content)
     
-    if matches:
-        state["solana_context"]["extracted_address"] = matches[0]
+    if match:
+        state["solana_context"]["extracted_address"] = match.group(0)
     
     return state
 
@@ -82,6 +104,7 @@ def act_node(state: SolanaAgentState) -> SolanaAgentState:
     
     # Add AI response to messages
     state["messages"].append(AIMessage(content=response))
+    state["last_ai_idx"] = len(state["messages"]) - 1
     
     if tool_used:
         state["tools_used"].append(tool_used)
@@ -94,9 +117,9 @@ def observe_node(state: SolanaAgentState) -> SolanaAgentState:
     state["current_step"] = "observing"
     
     # Check if we have a response
-    ai_messages = [msg for msg in state["messages"] if isinstance(msg, AIMessage)]
-    if ai_messages:
-        last_response = ai_messages[-1].content
+    ai_message = _last_message(state, "last_ai_idx", AIMessage)
+    if ai_message is not None:
+        last_response = ai_message.content
         
         # Check for errors or incomplete responses
         if "error" in last_response.lower() or "failed" in last_response.lower():
@@ -119,9 +142,9 @@ def should_continue(state: SolanaAgentState) -> str:
         return "end"
     
     # Check for final answer indicators
-    ai_messages = [msg for msg in state["messages"] if isinstance(msg, AIMessage)]
-    if ai_messages:
-        last_response = ai_messages[-1].content.lower()
+    ai_message = _last_message(state, "last_ai_idx", AIMessage)
+    if ai_message is not None:
+        last_response = ai_message.content.lower()
         if any(phrase in last_response for phrase in ["final answer", "completed", "done"]):
             return "end"
     
@@ -135,11 +158,11 @@ def should_continue(state: SolanaAgentState) -> str:
 
 def handle_general_query(state: SolanaAgentState) -> str:
     """Handle general queries that don't require specific tools"""
-    human_messages = [msg for msg in state["messages"] if isinstance(msg, HumanMessage)]
-    if not human_messages:
+    human_message = _last_message(state, "last_human_idx", HumanMessage)
+    if human_message is None:
         return "Hello! I'm a Solana agent. I can help you with balance checks, transaction info, signature validation, and account information."
     
-    query = human_messages[-1].content
+    query = human_message.content
     
     # Provide helpful guidance
     if "help" in query.lower():
@@ -152,11 +175,10 @@ def handle_general_query(state: SolanaAgentState) -> str:
         Just send me an address or signature and tell me what you'd like to know!"""
     
     # Extract if there's an address but no clear intent
-    address_pattern = r'[1-9A-HJ-NP-Za-km-z]{32,44}'
-    matches = re.findall(address_pattern, query)
+    match = _ADDR_RE.search(query)
     
-    if matches:
-        return f"""I found this address: {matches[0]}
+    if match:
+        return f"""I found this address: {match.group(0)}
         
         What would you like me to do with it?
         - Check balance
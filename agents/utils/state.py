@@ -14,6 +14,8 @@ class AgentState(TypedDict):
     intent: Optional[str]
     session_id: Optional[str]
     user_id: Optional[str]
+    last_human_idx: Optional[int]  # index into messages of the latest HumanMessage
+    last_ai_idx: Optional[int]  # index into messages of the latest AIMessage
 
 
 class SolanaAgentState(AgentState):
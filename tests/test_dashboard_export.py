@@ -0,0 +1,82 @@
+"""Tests for dashboard JSON export"""
+import importlib.util
+import json
+import math
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Load the helpers by path: importing the agents.risk package pulls in the full ML stack
+_spec = importlib.util.spec_from_file_location(
+    "risk_json_export", Path(__file__).parent.parent / "agents" / "risk" / "json_export.py"
+)
+json_export = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(json_export)
+
+
+class WidgetType(Enum):
+    """Plain enum, as used in widget configs"""
+    CHART = "chart"
+
+
+class AlertSeverity(str, Enum):
+    """str-mixin enum"""
+    HIGH = "high"
+
+
+@pytest.fixture
+def dashboard_data():
+    """Dashboard payload with a widget holding an Enum and non-finite values"""
+    return {
+        'widgets': {
+            'sortino': {
+                'config': {
+                    'widget_type': WidgetType.CHART,
+                    'severity': AlertSeverity.HIGH,
+                    'created_at': datetime(2024, 1, 1, 12, 30),
+                    'thresholds': (0.5, 1.0)
+                },
+                'data': {
+                    'sortino_ratio': math.inf,
+                    'calmar_ratio': -math.inf,
+                    'beta': math.nan,
+                    'var_95': np.float64(36425.76),
+                    'policies': np.int64(12),
+                    'weights': np.array([0.25, 0.75]),
+                    1: 'int key'
+                }
+            }
+        },
+        'last_update': '2024-01-01T12:30:00',
+        'is_running': True,
+        'update_interval': 5
+    }
+
+
+def test_enum_and_non_finite_normalization(dashboard_data):
+    """Test normalization matches json.dumps(default=str) for enums and nulls non-finite floats"""
+    payload = json_export.to_json_safe(dashboard_data)
+    config = payload['widgets']['sortino']['config']
+    data = payload['widgets']['sortino']['data']
+
+    assert config['widget_type'] == str(WidgetType.CHART)
+    assert config['severity'] == 'high'
+    assert config['created_at'] == '2024-01-01 12:30:00'
+    assert data['sortino_ratio'] is None
+    assert data['calmar_ratio'] is None
+    assert data['beta'] is None
+    assert data['weights'] == [0.25, 0.75]
+    assert data['1'] == 'int key'
+
+
+@pytest.mark.skipif(not json_export.ORJSON_AVAILABLE, reason="orjson not installed")
+def test_orjson_matches_json(dashboard_data):
+    """Test both serializers emit the same document"""
+    with_orjson = json_export.dumps_export(dashboard_data, use_orjson=True)
+    with_json = json_export.dumps_export(dashboard_data, use_orjson=False)
+
+    assert with_orjson == with_json
+    assert json.loads(with_orjson)['widgets']['sortino']['config']['widget_type'] == 'WidgetType.CHART'
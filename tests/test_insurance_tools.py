@@ -0,0 +1,31 @@
+"""Tests for insurance tools"""
+import pytest
+
+from agents.tools.insurance import calculate_loss_ratio, calculate_loss_ratios_np
+
+
+class TestCalculateLossRatiosNp:
+    """Test the vectorized loss ratio calculation"""
+
+    @pytest.mark.asyncio
+    async def test_matches_scalar_tool(self):
+        """Test batch loss ratios against the scalar tool"""
+        events = [
+            {"event_type": "typhoon", "historical_frequency": 0.15, "confidence_level": 0.9},
+            {"event_type": "earthquake", "historical_frequency": 0.9, "confidence_level": 0.95},
+            {"event_type": "unknown", "historical_frequency": 0.2, "confidence_level": 0.85}
+        ]
+
+        result = calculate_loss_ratios_np(
+            [e["historical_frequency"] for e in events],
+            [e["event_type"] for e in events],
+            [e["confidence_level"] for e in events]
+        )
+
+        expected = [await calculate_loss_ratio.ainvoke({"event_data": e}) for e in events]
+        assert result.tolist() == expected
+
+    def test_clipped_to_bounds(self):
+        """Test ratios are clipped to [0.0, 0.95]"""
+        result = calculate_loss_ratios_np([2.0, -0.5], ["earthquake", "typhoon"], [1.0, 1.0])
+        assert result.tolist() == [0.95, 0.0]
@@ -0,0 +1,252 @@
+"""Tests for portfolio management"""
+import json
+import random
+import sys
+from collections import defaultdict
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pytest
+
+# agents.risk.calculator imports data collectors that agents.data does not provide, which breaks
+# importing the agents.risk package; the portfolio only needs its names, so stand in for it if needed
+try:
+    import agents.risk.calculator
+except ImportError:
+    sys.modules['agents.risk.calculator'] = mock.MagicMock()
+
+from agents.risk.models import RiskLevel
+from agents.risk.portfolio import (
+    AssetClass, InsurancePolicy, PolicyStatus, PortfolioManager, RiskDiversificationSystem
+)
+
+
+def make_policy(policy_id: str, **overrides) -> InsurancePolicy:
+    """Active policy with sensible defaults"""
+    values = dict(
+        policy_id=policy_id,
+        contract_id=f"contract_{policy_id}",
+        policy_holder="holder",
+        asset_class=AssetClass.WEATHER,
+        coverage_amount=100000.0,
+        premium_amount=5000.0,
+        premium_rate=0.05,
+        risk_score=0.3,
+        risk_level=RiskLevel.MEDIUM,
+        trigger_conditions={},
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2025, 1, 1),
+        status=PolicyStatus.ACTIVE
+    )
+    values.update(overrides)
+    return InsurancePolicy(**values)
+
+
+@pytest.fixture
+def manager():
+    """Portfolio manager with the admission constraints switched off; they are not under test here"""
+    manager = PortfolioManager(None)
+    manager._check_portfolio_constraints = lambda policy: True
+    return manager
+
+
+class TestPolicyLocation:
+    """Test location handling for geographic concentration"""
+
+    @pytest.mark.asyncio
+    async def test_metadata_location_update_moves_policy(self, manager):
+        """Test updating metadata['location'] re-derives location"""
+        await manager.add_policy(make_policy("p1", metadata={'location': 'Tokyo'}))
+        await manager.add_policy(make_policy("p2", metadata={'location': 'Osaka'}))
+
+        assert await manager.update_policy("p1", {'metadata': {'location': 'Osaka', 'note': 'moved'}})
+
+        assert manager.policies["p1"].location == 'Osaka'
+        concentration = await manager.analyze_concentration_risk()
+        assert concentration['geographic_concentration'] == pytest.approx({'Osaka': 1.0})
+
+    @pytest.mark.asyncio
+    async def test_explicit_location_wins_over_metadata(self, manager):
+        """Test an explicit location in the same update takes precedence"""
+        await manager.add_policy(make_policy("p1", metadata={'location': 'Tokyo'}))
+
+        assert await manager.update_policy("p1", {'metadata': {'location': 'Osaka'}, 'location': 'Kyoto'})
+
+        concentration = await manager.analyze_concentration_risk()
+        assert concentration['geographic_concentration'] == pytest.approx({'Kyoto': 1.0})
+
+
+class TestReportPayloads:
+    """Test public report payloads hold plain dicts"""
+
+    @pytest.mark.asyncio
+    async def test_diversification_report_violations_are_dicts(self, manager):
+        """Test rule violations are reported as JSON-serializable dicts"""
+        await manager.add_policy(make_policy("p1"))
+        system = RiskDiversificationSystem(manager)
+        await system.add_diversification_rule({'type': 'asset_concentration', 'max_concentration': 0.3})
+
+        report = await system.generate_diversification_report()
+
+        violation = report['rule_violations'][0]
+        assert violation['asset_class'] == AssetClass.WEATHER.value
+        assert violation['violation_severity'] == 'high'
+        json.dumps(report['rule_violations'])
+
+    @pytest.mark.asyncio
+    async def test_stress_impact_analysis_is_dict(self, manager):
+        """Test stress impact analysis is reported as a dict"""
+        await manager.add_policy(make_policy("p1"))
+        await manager.add_policy(make_policy("p2", asset_class=AssetClass.FLIGHT, risk_score=0.6))
+
+        results = await manager.stress_test_portfolio([{'name': 'shock', 'stress_multiplier': 2.0}])
+
+        impact = results['stress_test_results']['shock']['impact_analysis']
+        assert set(impact) == {'var_impact', 'expected_shortfall_impact', 'diversification_impact',
+                               'overall_impact_score'}
+        assert impact['var_impact'] == pytest.approx(1.0)
+        json.dumps(impact)
+
+
+class TestUpdatePolicy:
+    """Test update_policy keeps the running totals consistent"""
+
+    @pytest.mark.asyncio
+    async def test_failed_update_restores_policy_and_totals(self, manager):
+        """Test an invalid update is rolled back rather than dropping the policy from the totals"""
+        await manager.add_policy(make_policy("p1"))
+        await manager.add_policy(make_policy("p2", asset_class=AssetClass.FLIGHT, coverage_amount=50000.0))
+        before = await manager.get_portfolio_metrics()
+
+        # A raw string is not an AssetClass, so re-adding the policy's contribution fails
+        assert not await manager.update_policy("p1", {'asset_class': 'weather', 'coverage_amount': 1.0})
+
+        policy = manager.policies["p1"]
+        assert policy.asset_class is AssetClass.WEATHER
+        assert policy.coverage_amount == 100000.0
+        assert manager._agg['active_count'] == 2
+        assert manager._agg['total_coverage'] == pytest.approx(150000.0)
+        assert len(manager._agg['sorted_losses']) == 2
+        assert set(manager._by_asset[AssetClass.WEATHER]) == {"p1"}
+        assert 'weather' not in manager._by_asset
+
+        after = await manager.get_portfolio_metrics()
+        assert after.total_coverage == before.total_coverage
+        assert after.var_95 == before.var_95
+
+        # Removing afterwards subtracts the policy exactly once
+        assert await manager.remove_policy("p1")
+        assert manager._agg['active_count'] == 1
+        assert manager._agg['total_coverage'] == pytest.approx(50000.0)
+
+
+def _shares(policies, key):
+    """Coverage share per key over active policies, computed from scratch"""
+    exposure = defaultdict(float)
+    for policy in policies:
+        exposure[key(policy)] += policy.coverage_amount
+    total = sum(exposure.values())
+    return {name: value / total for name, value in exposure.items()}
+
+
+def _random_update(rng: random.Random) -> dict:
+    """Random change to one or two metrics-affecting fields"""
+    choices = {
+        'coverage_amount': lambda: round(rng.uniform(1e4, 1e6), 2),
+        'risk_score': lambda: round(rng.random(), 3),
+        'premium_amount': lambda: round(rng.uniform(1e2, 1e4), 2),
+        'asset_class': lambda: rng.choice(list(AssetClass)),
+        'risk_level': lambda: rng.choice(list(RiskLevel)),
+        'status': lambda: rng.choice((PolicyStatus.ACTIVE, PolicyStatus.ACTIVE, PolicyStatus.EXPIRED)),
+        'location': lambda: rng.choice(('Tokyo', 'Osaka', 'Kyoto')),
+        'start_date': lambda: datetime(2024, rng.randint(1, 12), 1)
+    }
+    return {key: choices[key]() for key in rng.sample(sorted(choices), rng.randint(1, 2))}
+
+
+class TestIncrementalAggregates:
+    """Test running totals, sorted losses and the asset index against a from-scratch computation"""
+
+    async def _assert_matches_scratch(self, manager):
+        active = [p for p in manager.policies.values() if p.status == PolicyStatus.ACTIVE]
+        metrics = await manager.get_portfolio_metrics()
+        concentration = await manager.analyze_concentration_risk()
+
+        # Index of policy ids per asset class covers every policy, active or not
+        by_asset = defaultdict(set)
+        for policy in manager.policies.values():
+            by_asset[policy.asset_class].add(policy.policy_id)
+        assert {ac: set(ids) for ac, ids in manager._by_asset.items() if ids} == dict(by_asset)
+
+        if not active:
+            return
+
+        losses = np.array([p.coverage_amount * p.risk_score for p in active], dtype=np.float64)
+        if len(losses) <= 1:
+            var_95 = expected_shortfall = losses.sum()
+        else:
+            var_95 = np.percentile(losses, 95)
+            expected_shortfall = losses[losses >= var_95].mean()
+
+        assert metrics.total_policies == len(active)
+        assert metrics.total_coverage == pytest.approx(sum(p.coverage_amount for p in active))
+        assert metrics.total_premium == pytest.approx(sum(p.premium_amount for p in active))
+        assert metrics.average_risk_score == pytest.approx(np.mean([p.risk_score for p in active]))
+        assert metrics.var_95 == pytest.approx(var_95, rel=1e-12)
+        assert metrics.expected_shortfall == pytest.approx(expected_shortfall, rel=1e-12)
+
+        risk_distribution = defaultdict(int)
+        for policy in active:
+            risk_distribution[policy.risk_level.value] += 1
+        assert metrics.risk_distribution == dict(risk_distribution)
+
+        asset_shares = _shares(active, lambda p: p.asset_class.value)
+        assert metrics.asset_allocation == pytest.approx(asset_shares)
+        # Concentration shares are summed from the float32 coverage column
+        assert concentration['asset_concentration'] == pytest.approx(asset_shares, rel=1e-5)
+        assert concentration['geographic_concentration'] == pytest.approx(_shares(active, lambda p: p.location), rel=1e-5)
+        assert concentration['temporal_concentration'] == pytest.approx(
+            _shares(active, lambda p: p.start_date.strftime('%Y-%m')), rel=1e-5)
+        assert concentration['risk_concentration'] == pytest.approx(_shares(active, lambda p: p.risk_level.value), rel=1e-5)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    async def test_random_add_remove_update_sequence(self, manager, seed):
+        """Test a randomised add/remove/update sequence matches a from-scratch computation"""
+        rng = random.Random(seed)
+        next_id = 0
+
+        for step in range(300):
+            ids = sorted(manager.policies)
+            action = rng.random()
+            if action < 0.5 or len(ids) < 3:
+                policy = make_policy(
+                    f"p{next_id}",
+                    asset_class=rng.choice(list(AssetClass)),
+                    coverage_amount=round(rng.uniform(1e4, 1e6), 2),
+                    premium_amount=round(rng.uniform(1e2, 1e4), 2),
+                    # Repeated risk scores produce tied losses
+                    risk_score=rng.choice((0.1, 0.25, 0.5, round(rng.random(), 3))),
+                    risk_level=rng.choice(list(RiskLevel)),
+                    status=rng.choice((PolicyStatus.ACTIVE, PolicyStatus.ACTIVE, PolicyStatus.PENDING)),
+                    start_date=datetime(2024, rng.randint(1, 12), 1),
+                    metadata={'location': rng.choice(('Tokyo', 'Osaka', 'Kyoto'))}
+                )
+                next_id += 1
+                assert await manager.add_policy(policy)
+            elif action < 0.7:
+                assert await manager.remove_policy(rng.choice(ids))
+            else:
+                assert await manager.update_policy(rng.choice(ids), _random_update(rng))
+
+            if step % 25 == 0:
+                await self._assert_matches_scratch(manager)
+
+        await self._assert_matches_scratch(manager)
+
+        # Emptying the book resets the running totals
+        for policy_id in list(manager.policies):
+            assert await manager.remove_policy(policy_id)
+        assert manager._agg['active_count'] == 0
+        assert len(manager._agg['sorted_losses']) == 0